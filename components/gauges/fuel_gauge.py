@@ -2,57 +2,51 @@ import pygame
 import math
 from core.component import Component
 from core.constants import *
+from core.fonts import get_font
+from core.text_cache import render_text
 
 from components.platform.data_source import DataSource
+from components.platform.signals import FUEL_SIGNAL
 
 class FuelGauge(Component):
-    def __init__(self, region, port=FUEL_GAUGE_PORT):
+    def __init__(self, region, port=FUEL_GAUGE_PORT, data_source=None):
         """Initialize the fuel gauge component.
         
         Args:
             region (tuple): The (x, y, width, height) region for this component
             port (int): The port number for the data source connection
+            data_source (DataSource): Shared data source to subscribe to
+                instead of opening a connection on `port`
         """
         super().__init__(region, "Fuel")
         self.fuel_level = 100.0  # Percentage
         self.tank_capacity = 60.0  # Liters
         self.radius = min(self.width, self.height) // 2 - 40
+        self.fuel_label = None  # Rendered with the face
         
         # Setup data source
-        self.data_source = DataSource(port=port)
-        self.data_source.set_data_callback(self._process_data)
+        self.owns_data_source = data_source is None
+        self.data_source = DataSource(port=port) if data_source is None else data_source
+        self.subscribe(FUEL_SIGNAL, self._process_data)
     
     def _process_data(self, data):
         """Process received fuel data.
         
         Args:
-            data (bytes): The received fuel data
+            data (float): The received fuel level
         """
         try:
-            self.fuel_level = float(data.decode())
+            self.fuel_level = float(data)
         except Exception as e:
             print(f"Fuel data processing error: {e}")
     
-    def connect(self):
-        """Connect to the data source and start receiving data."""
-        self.data_source.start()
-    
-    def disconnect(self):
-        """Disconnect from the data source."""
-        self.data_source.stop()
-    
-    def update(self):
-        """Update the component state (called each frame)."""
-        # Now handled by the data source
-        pass
-    
-    def draw(self, surface):
-        """Draw the fuel gauge on the given surface.
+    def draw_face(self, surface):
+        """Draw the static dial: background, ticks, labels and low-fuel arc.
         
         Args:
-            surface (pygame.Surface): The surface to draw on
+            surface (pygame.Surface): The face surface to draw on
         """
-        super().draw(surface)
+        super().draw_face(surface)
         
         # Draw gauge background
         pygame.draw.circle(surface, CHARCOAL_1, 
@@ -60,7 +54,7 @@ class FuelGauge(Component):
                           self.radius)
         
         # Draw ticks and labels
-        font_small = pygame.font.SysFont('Arial', 14)
+        font_small = get_font(14)
         # Fuel gauge only shows 0 to 1 (empty to full) over 3/4 of a circle
         for i in range(0, 101, 10):
             # Map 0-100 to the 3/4 circle from bottom left to bottom right
@@ -86,7 +80,7 @@ class FuelGauge(Component):
                 else:
                     label_text = "F"
                     
-                label = font_small.render(label_text, True, LIGHT_GREY_2)
+                label = render_text(font_small, label_text, LIGHT_GREY_2)
                 label_rect = label.get_rect(center=(int(label_x), int(label_y)))
                 surface.blit(label, label_rect)
         
@@ -112,6 +106,17 @@ class FuelGauge(Component):
         if len(arc_points) >= 3:
             pygame.draw.polygon(surface, (255, 0, 0, 100), arc_points)
         
+        # The fuel symbol is drawn over the needle, see draw()
+        self.fuel_label = render_text(font_small, "FUEL", LIGHT_GREY_2)
+    
+    def draw(self, surface):
+        """Draw the fuel gauge on the given surface.
+        
+        Args:
+            surface (pygame.Surface): The surface to draw on
+        """
+        surface.blit(self.get_face(surface.get_size()), (0, 0))
+        
         # Draw needle
         angle = math.pi * 1.25 - (self.fuel_level / 100) * math.pi * 1.5
         needle_x = self.center_x + (self.radius - 20) * math.cos(angle)
@@ -134,14 +139,14 @@ class FuelGauge(Component):
                           10)
         
         # Draw fuel level text
-        font = pygame.font.SysFont('Arial', 24, bold=True)
+        font = get_font(24, bold=True)
         
         # Calculate liters remaining
         liters = (self.fuel_level / 100) * self.tank_capacity
         
         # Show percentage and liters
-        text = font.render(f"{int(self.fuel_level)}% ({int(liters)}L)", True, 
-                          (255, 0, 0) if self.fuel_level < 15 else WHITE)
+        text = render_text(font, f"{int(self.fuel_level)}% ({int(liters)}L)",
+                           (255, 0, 0) if self.fuel_level < 15 else WHITE)
         text_rect = text.get_rect(center=(self.center_x, self.center_y + 50))
         surface.blit(text, text_rect)
         
@@ -160,6 +165,5 @@ class FuelGauge(Component):
                         (fuel_icon_x + 10, fuel_icon_y - 5, 20, 25))
         
         # Fuel label
-        label = font_small.render("FUEL", True, LIGHT_GREY_2)
-        label_rect = label.get_rect(center=(self.center_x + 25, self.center_y + 85))
-        surface.blit(label, label_rect)
\ No newline at end of file
+        label_rect = self.fuel_label.get_rect(center=(self.center_x + 25, self.center_y + 85))
+        surface.blit(self.fuel_label, label_rect)
\ No newline at end of file
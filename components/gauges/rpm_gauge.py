@@ -2,16 +2,21 @@ import pygame
 import math
 from core.component import Component
 from core.constants import *
+from core.fonts import get_font
+from core.text_cache import render_text
 from components.platform.data_source import DataSource
+from components.platform.signals import RPM_SIGNAL
 from components.platform.emul.rpm_emulator import RPMEmulator
 
 class RPMGauge(Component):
-    def __init__(self, region, port=RPM_PORT):
+    def __init__(self, region, port=RPM_PORT, data_source=None):
         """Initialize the RPM gauge component.
         
         Args:
             region (tuple): The (x, y, width, height) region for this component
             port (int): The port number for the data source connection
+            data_source (DataSource): Shared data source to subscribe to
+                instead of opening a connection on `port`
         """
         super().__init__(region, "RPM")
         self.rpm = 0
@@ -19,8 +24,9 @@ class RPMGauge(Component):
         self.radius = min(self.width, self.height) // 2 - 40
         
         # Setup data source
-        self.data_source = DataSource(port=port)
-        self.data_source.set_data_callback(self._process_data)
+        self.owns_data_source = data_source is None
+        self.data_source = DataSource(port=port) if data_source is None else data_source
+        self.subscribe(RPM_SIGNAL, self._process_data)
         
         # For simulation
         self.simulating = False
@@ -38,38 +44,25 @@ class RPMGauge(Component):
         """Process received RPM data.
         
         Args:
-            data (bytes): The received RPM data
+            data (int): The received RPM value
         """
         try:
-            self.rpm = int(data.decode())
+            self.rpm = int(data)
         except Exception as e:
             print(f"RPM data processing error: {e}")
     
-    def connect(self):
-        """Connect to the data source and start receiving data."""
-        self.data_source.start()
-    
-    def disconnect(self):
-        """Disconnect from the data source."""
-        self.data_source.stop()
-    
-    def update(self):
-        """Update the component state (called each frame)."""
-        # Now handled by the data source
-        pass
-    
     def cleanup(self):
         self.simulating = False
         self.disconnect()
         self.rpm_emulator.stop()
 
-    def draw(self, surface):
-        """Draw the RPM gauge on the given surface.
+    def draw_face(self, surface):
+        """Draw the static dial: background, ticks, labels and redline.
         
         Args:
-            surface (pygame.Surface): The surface to draw on
+            surface (pygame.Surface): The face surface to draw on
         """
-        super().draw(surface)
+        super().draw_face(surface)
         
         # Draw gauge background
         pygame.draw.circle(surface, CHARCOAL_1, 
@@ -77,7 +70,7 @@ class RPMGauge(Component):
                           self.radius)
         
         # Draw ticks and labels
-        font_small = pygame.font.SysFont('Arial', 14)
+        font_small = get_font(14)
         for i in range(0, self.max_rpm + 1, 1000):
             angle = math.pi * 0.75 + (i / self.max_rpm) * math.pi * 1.5
             start_x = self.center_x + (self.radius - 15) * math.cos(angle)
@@ -93,7 +86,7 @@ class RPMGauge(Component):
             if i % 2000 == 0:
                 label_x = self.center_x + (self.radius - 35) * math.cos(angle)
                 label_y = self.center_y + (self.radius - 35) * math.sin(angle)
-                label = font_small.render(f"{i//1000}", True, LIGHT_GREY_2)
+                label = render_text(font_small, f"{i//1000}", LIGHT_GREY_2)
                 surface.blit(label, (int(label_x - 10), int(label_y - 10)))
         
         # Draw redline area (7000+ RPM)
@@ -118,6 +111,19 @@ class RPMGauge(Component):
         if len(arc_points) >= 3:
             pygame.draw.polygon(surface, (200, 0, 0, 100), arc_points)
         
+        # Draw "RPM x1000" label
+        label = render_text(font_small, "RPM x1000", LIGHT_GREY_2)
+        label_rect = label.get_rect(center=(self.center_x, self.y + self.height - 30))
+        surface.blit(label, label_rect)
+    
+    def draw(self, surface):
+        """Draw the RPM gauge on the given surface.
+        
+        Args:
+            surface (pygame.Surface): The surface to draw on
+        """
+        surface.blit(self.get_face(surface.get_size()), (0, 0))
+        
         # Draw needle
         angle = math.pi * 0.75 + (self.rpm / self.max_rpm) * math.pi * 1.5
         needle_x = self.center_x + (self.radius - 20) * math.cos(angle)
@@ -142,12 +148,7 @@ class RPMGauge(Component):
                           10)
         
         # Draw RPM text
-        font = pygame.font.SysFont('Arial', 24, bold=True)
-        text = font.render(f"{self.rpm} RPM", True, WHITE)
+        font = get_font(24, bold=True)
+        text = render_text(font, f"{self.rpm} RPM", WHITE)
         text_rect = text.get_rect(center=(self.center_x, self.center_y + 50))
-        surface.blit(text, text_rect)
-        
-        # Draw "RPM x1000" label
-        label = font_small.render("RPM x1000", True, LIGHT_GREY_2)
-        label_rect = label.get_rect(center=(self.center_x, self.y + self.height - 30))
-        surface.blit(label, label_rect)
\ No newline at end of file
+        surface.blit(text, text_rect)
\ No newline at end of file
@@ -2,15 +2,20 @@ import pygame
 import math
 from core.component import Component
 from core.constants import *
+from core.fonts import get_font
+from core.text_cache import render_text
 from components.platform.data_source import DataSource
+from components.platform.signals import SPEED_SIGNAL
 
 class SpeedGauge(Component):
-    def __init__(self, region, port=SPEED_GAUGE_PORT):
+    def __init__(self, region, port=SPEED_GAUGE_PORT, data_source=None):
         """Initialize the speed gauge component.
         
         Args:
             region (tuple): The (x, y, width, height) region for this component
             port (int): The port number for the data source connection
+            data_source (DataSource): Shared data source to subscribe to
+                instead of opening a connection on `port`
         """
         super().__init__(region, "Speed")
         self.speed = 0
@@ -18,40 +23,28 @@ class SpeedGauge(Component):
         self.radius = min(self.width, self.height) // 2 - 40
         
         # Setup data source
-        self.data_source = DataSource(port=port)
-        self.data_source.set_data_callback(self._process_data)
+        self.owns_data_source = data_source is None
+        self.data_source = DataSource(port=port) if data_source is None else data_source
+        self.subscribe(SPEED_SIGNAL, self._process_data)
     
     def _process_data(self, data):
         """Process received speed data.
         
         Args:
-            data (bytes): The received speed data
+            data (float): The received speed value
         """
         try:
-            self.speed = float(data.decode())
+            self.speed = float(data)
         except Exception as e:
             print(f"Speed data processing error: {e}")
     
-    def connect(self):
-        """Connect to the data source and start receiving data."""
-        self.data_source.start()
-    
-    def disconnect(self):
-        """Disconnect from the data source."""
-        self.data_source.stop()
-    
-    def update(self):
-        """Update the component state (called each frame)."""
-        # Now handled by the data source
-        pass
-    
-    def draw(self, surface):
-        """Draw the speed gauge on the given surface.
+    def draw_face(self, surface):
+        """Draw the static dial: background, ticks, labels and high-speed arc.
         
         Args:
-            surface (pygame.Surface): The surface to draw on
+            surface (pygame.Surface): The face surface to draw on
         """
-        super().draw(surface)
+        super().draw_face(surface)
         
         # Draw gauge background
         pygame.draw.circle(surface, CHARCOAL_1, 
@@ -59,7 +52,7 @@ class SpeedGauge(Component):
                           self.radius)
         
         # Draw ticks and labels
-        font_small = pygame.font.SysFont('Arial', 14)
+        font_small = get_font(14)
         for i in range(0, self.max_speed + 1, 20):
             angle = math.pi * 0.75 + (i / self.max_speed) * math.pi * 1.5
             start_x = self.center_x + (self.radius - 15) * math.cos(angle)
@@ -75,7 +68,7 @@ class SpeedGauge(Component):
             if i % 40 == 0:
                 label_x = self.center_x + (self.radius - 35) * math.cos(angle)
                 label_y = self.center_y + (self.radius - 35) * math.sin(angle)
-                label = font_small.render(str(i), True, LIGHT_GREY_2)
+                label = render_text(font_small, str(i), LIGHT_GREY_2)
                 surface.blit(label, (int(label_x - 10), int(label_y - 10)))
         
         # Draw high-speed area (180+ km/h)
@@ -100,6 +93,19 @@ class SpeedGauge(Component):
         if len(arc_points) >= 3:
             pygame.draw.polygon(surface, (255, 165, 0, 100), arc_points)
         
+        # Draw "SPEED" label
+        label = render_text(font_small, "SPEED", LIGHT_GREY_2)
+        label_rect = label.get_rect(center=(self.center_x, self.y + self.height - 30))
+        surface.blit(label, label_rect)
+    
+    def draw(self, surface):
+        """Draw the speed gauge on the given surface.
+        
+        Args:
+            surface (pygame.Surface): The surface to draw on
+        """
+        surface.blit(self.get_face(surface.get_size()), (0, 0))
+        
         # Draw needle
         angle = math.pi * 0.75 + (self.speed / self.max_speed) * math.pi * 1.5
         needle_x = self.center_x + (self.radius - 20) * math.cos(angle)
@@ -124,12 +130,7 @@ class SpeedGauge(Component):
                           10)
         
         # Draw speed text
-        font = pygame.font.SysFont('Arial', 24, bold=True)
-        text = font.render(f"{int(self.speed)} km/h", True, WHITE)
+        font = get_font(24, bold=True)
+        text = render_text(font, f"{int(self.speed)} km/h", WHITE)
         text_rect = text.get_rect(center=(self.center_x, self.center_y + 50))
-        surface.blit(text, text_rect)
-        
-        # Draw "SPEED" label
-        label = font_small.render("SPEED", True, LIGHT_GREY_2)
-        label_rect = label.get_rect(center=(self.center_x, self.y + self.height - 30))
-        surface.blit(label, label_rect)
\ No newline at end of file
+        surface.blit(text, text_rect)
\ No newline at end of file
@@ -1,18 +1,26 @@
 import pygame
 import math
-import json
 from datetime import datetime
 from core.component import Component
 from components.platform.data_source import DataSource
+from components.platform.signals import CLOCK_SIGNAL
 from core.constants import *
+from core.fonts import get_font
+from core.text_cache import render_text
 
 class ClockWidget(Component):
-    def __init__(self, region, port=CLOCK_PORT):
+    # The time changes once a second
+    min_refresh_rate = 1
+    max_refresh_rate = 2
+    
+    def __init__(self, region, port=CLOCK_PORT, data_source=None):
         """Initialize the clock widget component.
         
         Args:
             region (tuple): The (x, y, width, height) region for this component
             port (int): The port number for the data source connection
+            data_source (DataSource): Shared data source to subscribe to
+                instead of opening a connection on `port`
         """
         super().__init__(region, "Clock")
         
@@ -30,17 +38,18 @@ class ClockWidget(Component):
         self.radius = min(self.width, self.height) // 2 - 40
         
         # Setup data source
-        self.data_source = DataSource(port=port)
-        self.data_source.set_data_callback(self._process_data)
+        self.owns_data_source = data_source is None
+        self.data_source = DataSource(port=port) if data_source is None else data_source
+        self.subscribe(CLOCK_SIGNAL, self._process_data)
     
     def _process_data(self, data):
         """Process received clock data.
         
         Args:
-            data (bytes): The received clock data
+            data (dict): The received clock data
         """
         try:
-            clock_data = json.loads(data.decode())
+            clock_data = data
             self.time_str = clock_data.get("time", "00:00")
             self.date_str = clock_data.get("date", "")
             self.hour = clock_data.get("hour", 0)
@@ -49,22 +58,10 @@ class ClockWidget(Component):
         except Exception as e:
             print(f"Clock data processing error: {e}")
     
-    def connect(self):
-        """Connect to the data source and start receiving data."""
-        self.data_source.start()
-    
-    def disconnect(self):
-        """Disconnect from the data source."""
-        self.data_source.stop()
-    
-    def update(self):
-        """Update the component state (called each frame)."""
-        # Now handled by the data source
-        pass
-    
     def toggle_analog(self):
         """Toggle the analog clock display."""
         self.show_analog = not self.show_analog
+        self.mark_dirty()
 
     def send_key(self, key):
         print(f"Received key:{key}")
@@ -74,10 +71,12 @@ class ClockWidget(Component):
     def toggle_digital(self):
         """Toggle the digital clock display."""
         self.show_digital = not self.show_digital
+        self.mark_dirty()
     
     def toggle_date(self):
         """Toggle the date display."""
         self.show_date = not self.show_date
+        self.mark_dirty()
     
     def draw(self, surface):
         """Draw the clock widget on the given surface.
@@ -179,7 +178,7 @@ class ClockWidget(Component):
         Args:
             surface (pygame.Surface): The surface to draw on
         """
-        font = pygame.font.SysFont('Arial', 26, bold=True)
+        font = get_font(26, bold=True)
         
         # Position depends on whether we're showing analog clock
         if self.show_analog:
@@ -188,7 +187,7 @@ class ClockWidget(Component):
             text_y = self.center_y - 15
             
         # Draw digital time
-        text = font.render(self.time_str, True, LIGHT_BLUE_GRAY)
+        text = render_text(font, self.time_str, LIGHT_BLUE_GRAY)
         text_rect = text.get_rect(center=(self.center_x, text_y))
         surface.blit(text, text_rect)
     
@@ -198,7 +197,7 @@ class ClockWidget(Component):
         Args:
             surface (pygame.Surface): The surface to draw on
         """
-        font = pygame.font.SysFont('Arial', 18)
+        font = get_font(18)
         
         # Position depends on what else is visible
         if self.show_analog and self.show_digital:
@@ -209,6 +208,6 @@ class ClockWidget(Component):
             text_y = self.center_y + 50
             
         # Draw date text
-        text = font.render(self.date_str, True, (200, 200, 210))
+        text = render_text(font, self.date_str, (200, 200, 210))
         text_rect = text.get_rect(center=(self.center_x, text_y))
         surface.blit(text, text_rect)
\ No newline at end of file
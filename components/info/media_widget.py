@@ -1,69 +1,79 @@
 import pygame
-import json
 from core.component import Component
 from core.constants import *
+from core.fonts import get_font
+from core.text_cache import render_text
 from components.platform.data_source import DataSource
+from components.platform.patch import PATCH, SNAPSHOT, PatchReceiver, is_snapshot, split_path
+from components.platform.signals import MEDIA_SIGNAL
 
 class MediaInfoWidget(Component):
-    def __init__(self, region, port=MEDIA_PORT):
+    def __init__(self, region, port=MEDIA_PORT, data_source=None):
         """Initialize the media info widget component.
         
         Args:
             region (tuple): The (x, y, width, height) region for this component
             port (int): The port number for the data source connection
+            data_source (DataSource): Shared data source to subscribe to
+                instead of opening a connection on `port`
         """
         super().__init__(region, "Media")
         
-        # Initialize media data
-        self.title = "No track"
-        self.artist = "No artist"
-        self.album = "No album"
-        self.duration = 0
-        self.position = 0
-        self.progress = 0
-        self.playing = False
-        self.repeat_mode = "off"
-        self.shuffle_mode = False
-        self.volume = 70
+        # Initialize media data: one attribute per field of the media
+        # document, with its value when the field is missing
+        self.field_defaults = {
+            "title": "No track",
+            "artist": "No artist",
+            "album": "No album",
+            "duration": 0,
+            "position": 0,
+            "progress": 0,
+            "playing": False,
+            "repeat_mode": "off",
+            "shuffle_mode": False,
+            "volume": 70
+        }
+        for field, value in self.field_defaults.items():
+            setattr(self, field, value)
+        self.receiver = PatchReceiver()
         
         # Setup data source
-        self.data_source = DataSource(port=port)
-        self.data_source.set_data_callback(self._process_data)
+        self.owns_data_source = data_source is None
+        self.data_source = DataSource(port=port) if data_source is None else data_source
+        self.subscribe(MEDIA_SIGNAL, self._process_data, restart=is_snapshot)
     
     def _process_data(self, data):
-        """Process received media data.
+        """Process a received media snapshot or patch.
+        
+        A snapshot sets every field; a patch only the fields it changes.
         
         Args:
-            data (bytes): The received media data
+            data (dict): The received snapshot or patch message
         """
         try:
-            media_data = json.loads(data.decode())
-            self.title = media_data.get("title", "No track")
-            self.artist = media_data.get("artist", "No artist")
-            self.album = media_data.get("album", "No album")
-            self.duration = media_data.get("duration", 0)
-            self.position = media_data.get("position", 0)
-            self.progress = media_data.get("progress", 0)
-            self.playing = media_data.get("playing", False)
-            self.repeat_mode = media_data.get("repeat_mode", "off")
-            self.shuffle_mode = media_data.get("shuffle_mode", False)
-            self.volume = media_data.get("volume", 70)
+            kind = self.receiver.accept(data)
+            if kind == SNAPSHOT:
+                fields = dict(self.field_defaults)
+                fields.update(data["state"])
+            elif kind == PATCH:
+                fields = {}
+                for op in data["patch"]:
+                    keys = split_path(op["path"])
+                    if len(keys) != 1:
+                        continue
+                    if op["op"] == "remove":
+                        fields[keys[0]] = self.field_defaults.get(keys[0])
+                    else:
+                        fields[keys[0]] = op["value"]
+            else:
+                return  # Out of sync until the next snapshot
+            
+            for field, value in fields.items():
+                if field in self.field_defaults:
+                    setattr(self, field, value)
         except Exception as e:
             print(f"Media data processing error: {e}")
     
-    def connect(self):
-        """Connect to the data source and start receiving data."""
-        self.data_source.start()
-    
-    def disconnect(self):
-        """Disconnect from the data source."""
-        self.data_source.stop()
-    
-    def update(self):
-        """Update the component state (called each frame)."""
-        # Now handled by the data source
-        pass
-    
     def draw(self, surface):
         """Draw the media widget on the given surface.
         
@@ -92,19 +102,19 @@ class MediaInfoWidget(Component):
                            (note_x + 8, note_y + 17, 14, 10))
         
         # Media title
-        title_font = pygame.font.SysFont('Arial', 22, bold=True)
-        title_text = title_font.render(self._truncate_text(self.title, 18), 
-                                     True, LIGHT_BLUE_GRAY)
+        title_font = get_font(22, bold=True)
+        title_text = render_text(title_font, self._truncate_text(self.title, 18), 
+                                     LIGHT_BLUE_GRAY)
         surface.blit(title_text, (70, 25))
         
         # Artist and album
-        info_font = pygame.font.SysFont('Arial', 16)
-        artist_text = info_font.render(self._truncate_text(self.artist, 22), 
-                                      True, (200, 200, 210))
+        info_font = get_font(16)
+        artist_text = render_text(info_font, self._truncate_text(self.artist, 22), 
+                                      (200, 200, 210))
         surface.blit(artist_text, (70, 50))
         
-        album_text = info_font.render(self._truncate_text(f"Album: {self.album}", 25), 
-                                     True, (180, 180, 190))
+        album_text = render_text(info_font, self._truncate_text(f"Album: {self.album}", 25), 
+                                     (180, 180, 190))
         surface.blit(album_text, (25, 80))
         
         # Progress bar
@@ -125,11 +135,11 @@ class MediaInfoWidget(Component):
             pygame.draw.rect(surface, fill_color, progress_fill_rect, border_radius=3)
         
         # Time display
-        time_font = pygame.font.SysFont('Arial', 14)
+        time_font = get_font(14)
         position_str = self._format_time(self.position)
         duration_str = self._format_time(self.duration)
-        time_text = time_font.render(f"{position_str} / {duration_str}", 
-                                   True, LIGHT_GREY_3)
+        time_text = render_text(time_font, f"{position_str} / {duration_str}", 
+                                   LIGHT_GREY_3)
         time_rect = time_text.get_rect(center=(self.center_x, 135))
         surface.blit(time_text, time_rect)
         
@@ -182,11 +192,11 @@ class MediaInfoWidget(Component):
         
         # Shuffle and repeat indicators
         indicator_y = 190
-        indicator_font = pygame.font.SysFont('Arial', 14)
+        indicator_font = get_font(14)
         
         # Shuffle
         shuffle_color = (0, 255, 0) if self.shuffle_mode else (150, 150, 160)
-        shuffle_text = indicator_font.render("SHUFFLE", True, shuffle_color)
+        shuffle_text = render_text(indicator_font, "SHUFFLE", shuffle_color)
         surface.blit(shuffle_text, (self.center_x - 70, indicator_y))
         
         # Repeat
@@ -200,7 +210,7 @@ class MediaInfoWidget(Component):
             repeat_color = (0, 255, 0)
             repeat_text = "REPEAT ALL"
             
-        repeat_label = indicator_font.render(repeat_text, True, repeat_color)
+        repeat_label = render_text(indicator_font, repeat_text, repeat_color)
         surface.blit(repeat_label, (self.center_x + 10, indicator_y))
         
         # Volume indicator
@@ -228,8 +238,8 @@ class MediaInfoWidget(Component):
         pygame.draw.rect(surface, (0, 180, 0), volume_fill_rect, border_radius=2)
         
         # Volume label
-        volume_label = indicator_font.render(f"VOL: {self.volume}%", 
-                                          True, LIGHT_GREY_3)
+        volume_label = render_text(indicator_font, f"VOL: {self.volume}%", 
+                                          LIGHT_GREY_3)
         volume_label_rect = volume_label.get_rect(
             center=(self.center_x, volume_y + 20)
         )
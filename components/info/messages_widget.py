@@ -1,25 +1,36 @@
+import bisect
 import pygame
-import json
 import time
 from core.component import Component
 from core.constants import *
+from core.fonts import get_font
+from core.text_cache import render_text
 from components.platform.data_source import DataSource
+from components.platform.patch import PATCH, SNAPSHOT, PatchReceiver, is_snapshot, split_path
+from components.platform.signals import MESSAGES_SIGNAL
 
 class MessagesWidget(Component):
-    def __init__(self, region, port=MESSAGES_PORT):
+    def __init__(self, region, port=MESSAGES_PORT, data_source=None):
         """Initialize the messages widget component.
         
         Args:
             region (tuple): The (x, y, width, height) region for this component
             port (int): The port number for the data source connection
+            data_source (DataSource): Shared data source to subscribe to
+                instead of opening a connection on `port`
         """
         super().__init__(region, "Messages")
         
-        # Initialize messages data
-        self.messages = []
+        # Initialize messages data: messages by id plus their sort keys,
+        # kept in display order
+        self.messages_by_id = {}
+        self.ordered_keys = []
+        self._order_keys = {}  # message id -> sort key
         self.count = {"total": 0, "info": 0, "warning": 0, "critical": 0}
-        self.max_visible_messages = 5
+        self.max_visible_messages = 5  # Rows per page
+        self.scroll_offset = 0  # Index of the first visible message
         self.last_update_time = 0
+        self.receiver = PatchReceiver()
         
         # Message styling
         self.category_colors = {
@@ -27,37 +38,143 @@ class MessagesWidget(Component):
             "warning": (255, 180, 50),    # Orange
             "critical": (255, 50, 50)     # Red
         }
+        self.category_ranks = {"critical": 0, "warning": 1, "info": 2}
+        self.message_height = 45
+        self.message_spacing = 5
+        
+        # Fonts and rendered surfaces reused across frames
+        self.header_font = get_font(22, bold=True)
+        self.count_font = get_font(14)
+        self.message_font = get_font(16)
+        self.timestamp_font = get_font(12)
+        self.no_messages_font = get_font(18)
+        self._row_cache = {}  # message id -> row surface without timestamp
         
         # Setup data source
-        self.data_source = DataSource(port=port)
-        self.data_source.set_data_callback(self._process_data)
+        self.owns_data_source = data_source is None
+        self.data_source = DataSource(port=port) if data_source is None else data_source
+        self.subscribe(MESSAGES_SIGNAL, self._process_data, restart=is_snapshot)
     
     def _process_data(self, data):
-        """Process received messages data.
+        """Process a received messages snapshot or patch.
+        
+        The ordered index is updated incrementally: only messages that
+        appeared, changed or went away since the last update are touched.
+        A patch lists them directly; a snapshot is compared with the
+        messages already indexed.
         
         Args:
-            data (bytes): The received messages data
+            data (dict): The received snapshot or patch message
         """
         try:
-            messages_data = json.loads(data.decode())
-            self.messages = messages_data.get("messages", [])
-            self.count = messages_data.get("count", {"total": 0, "info": 0, "warning": 0, "critical": 0})
-            self.last_update_time = messages_data.get("timestamp", time.time())
+            kind = self.receiver.accept(data)
+            if kind == SNAPSHOT:
+                self._apply_snapshot(data["state"])
+            elif kind == PATCH:
+                for op in data["patch"]:
+                    self._apply_op(op)
+            else:
+                return  # Out of sync until the next snapshot
+            self._clamp_scroll()
         except Exception as e:
             print(f"Messages data processing error: {e}")
     
-    def connect(self):
-        """Connect to the data source and start receiving data."""
-        self.data_source.start()
+    def _apply_snapshot(self, state):
+        """Bring the index in line with a full messages document."""
+        seen = set()
+        for message in state.get("messages", {}).values():
+            message_id = message["id"]
+            seen.add(message_id)
+            current = self.messages_by_id.get(message_id)
+            if current is None:
+                self._insert_message(message)
+            elif current != message:
+                # Acknowledged or dismissed; the position is unchanged
+                self._remove_message(message_id)
+                self._insert_message(message)
+        for message_id in [i for i in self.messages_by_id if i not in seen]:
+            self._remove_message(message_id)
+        
+        self.count = state.get("count", {"total": 0, "info": 0, "warning": 0, "critical": 0})
+        self.last_update_time = state.get("timestamp", time.time())
     
-    def disconnect(self):
-        """Disconnect from the data source."""
-        self.data_source.stop()
+    def _apply_op(self, op):
+        """Apply one patch op of the messages document."""
+        keys = split_path(op["path"])
+        if keys[0] == "messages" and len(keys) > 1:
+            message_id = int(keys[1])
+            if len(keys) == 2:
+                # Whole message added, replaced or removed
+                if message_id in self.messages_by_id:
+                    self._remove_message(message_id)
+                if op["op"] != "remove":
+                    self._insert_message(op["value"])
+            elif message_id in self.messages_by_id:
+                # A field changed (acknowledged, dismissed, ...)
+                message = dict(self.messages_by_id[message_id])
+                if op["op"] == "remove":
+                    message.pop(keys[2], None)
+                else:
+                    message[keys[2]] = op["value"]
+                self._remove_message(message_id)
+                self._insert_message(message)
+        elif keys[0] == "count":
+            if len(keys) == 1:
+                self.count = op["value"]
+            else:
+                self.count[keys[1]] = op.get("value", 0)
+        elif keys == ["timestamp"]:
+            self.last_update_time = op["value"]
     
-    def update(self):
-        """Update the component state (called each frame)."""
-        # Now handled by the data source
-        pass
+    def _insert_message(self, message):
+        """Add a message to the priority-ordered index."""
+        # Critical first, then warning, then info, newest first within each
+        key = (
+            self.category_ranks.get(message["category"], 3),
+            -message["timestamp"],
+            message["id"]
+        )
+        self.messages_by_id[message["id"]] = message
+        self._order_keys[message["id"]] = key
+        bisect.insort(self.ordered_keys, key)
+    
+    def _remove_message(self, message_id):
+        """Drop a message from the index and its cached row."""
+        del self.messages_by_id[message_id]
+        key = self._order_keys.pop(message_id)
+        index = bisect.bisect_left(self.ordered_keys, key)
+        del self.ordered_keys[index]
+        self._row_cache.pop(message_id, None)
+    
+    def _clamp_scroll(self):
+        """Keep the scroll position within the message list."""
+        last_page = max(0, len(self.ordered_keys) - self.max_visible_messages)
+        self.scroll_offset = max(0, min(self.scroll_offset, last_page))
+    
+    def send_key(self, key):
+        """Scroll the message list.
+        
+        Args:
+            key (int): Up/Down scroll by one message, Page Up/Page Down by
+                a page, Home/End jump to the start/end
+        """
+        page = self.max_visible_messages
+        scroll_offset = self.scroll_offset
+        if key == pygame.K_UP:
+            self.scroll_offset -= 1
+        elif key == pygame.K_DOWN:
+            self.scroll_offset += 1
+        elif key == pygame.K_PAGEUP:
+            self.scroll_offset -= page
+        elif key == pygame.K_PAGEDOWN:
+            self.scroll_offset += page
+        elif key == pygame.K_HOME:
+            self.scroll_offset = 0
+        elif key == pygame.K_END:
+            self.scroll_offset = len(self.ordered_keys)
+        self._clamp_scroll()
+        if self.scroll_offset != scroll_offset:
+            self.mark_dirty()
     
     def acknowledge_message(self, message_id):
         """Acknowledge a message.
@@ -90,17 +207,15 @@ class MessagesWidget(Component):
         pygame.draw.rect(surface, CHARCOAL_1, background_rect, border_radius=10)
         
         # Header
-        header_font = pygame.font.SysFont('Arial', 22, bold=True)
-        header_text = header_font.render("Notifications", True, LIGHT_BLUE_GRAY)
+        header_text = render_text(self.header_font, "Notifications", LIGHT_BLUE_GRAY)
         surface.blit(header_text, (25, 20))
         
         # Count indicators
         count_y = 22
-        count_font = pygame.font.SysFont('Arial', 14)
         
         # Total count
-        total_count_text = count_font.render(f"Total: {self.count['total']}", 
-                                           True, VERY_LIGHT_GREY_2)
+        total_count_text = render_text(self.count_font, f"Total: {self.count['total']}",
+                                             VERY_LIGHT_GREY_2)
         surface.blit(total_count_text, (self.width - 100, count_y))
         
         # Category counts
@@ -112,9 +227,9 @@ class MessagesWidget(Component):
             else:
                 count_color = (150, 150, 160)
                 
-            category_count_text = count_font.render(
+            category_count_text = render_text(
+                self.count_font,
                 f"{category.capitalize()}: {count}", 
-                True, 
                 count_color
             )
             surface.blit(category_count_text, 
@@ -125,12 +240,11 @@ class MessagesWidget(Component):
         pygame.draw.rect(surface, (30, 30, 40), messages_area_rect, border_radius=5)
         
         # Message list
-        if not self.messages:
+        if not self.ordered_keys:
             # No messages
-            no_messages_font = pygame.font.SysFont('Arial', 18)
-            no_messages_text = no_messages_font.render(
+            no_messages_text = render_text(
+                self.no_messages_font,
                 "No notifications", 
-                True, 
                 (150, 150, 160)
             )
             no_messages_rect = no_messages_text.get_rect(
@@ -142,120 +256,125 @@ class MessagesWidget(Component):
             self._draw_messages(surface, messages_area_rect)
     
     def _draw_messages(self, surface, container_rect):
-        """Draw the list of messages.
+        """Draw the visible page of the message list.
+        
+        Only the rows in view are drawn, from cached row surfaces; a row is
+        rendered again only when its message changes.
         
         Args:
             surface (pygame.Surface): The surface to draw on
             container_rect (pygame.Rect): The container rectangle
         """
-        # Sort messages: critical first, then warning, then info, newest first within each category
-        sorted_messages = sorted(
-            self.messages, 
-            key=lambda m: (
-                0 if m["category"] == "critical" else 
-                1 if m["category"] == "warning" else 2,
-                -m["timestamp"]  # Negative for descending order
-            )
-        )
-        
-        # Limit to max visible
-        visible_messages = sorted_messages[:self.max_visible_messages]
-        
-        # Message styling
-        message_font = pygame.font.SysFont('Arial', 16)
-        timestamp_font = pygame.font.SysFont('Arial', 12)
-        message_height = 45
-        message_spacing = 5
+        total = len(self.ordered_keys)
+        first = self.scroll_offset
+        visible_keys = self.ordered_keys[first:first + self.max_visible_messages]
         message_width = container_rect.width - 10
+        row_pitch = self.message_height + self.message_spacing
         
-        # Draw each message
-        for i, message in enumerate(visible_messages):
-            # Message background
-            y_pos = container_rect.y + 5 + i * (message_height + message_spacing)
-            message_rect = pygame.Rect(
-                container_rect.x + 5, 
-                y_pos, 
-                message_width, 
-                message_height
-            )
+        # Draw each visible message
+        for i, key in enumerate(visible_keys):
+            message_id = key[2]
+            row = self._row_cache.get(message_id)
+            if row is None:
+                row = self._render_row(self.messages_by_id[message_id], message_width)
+                self._row_cache[message_id] = row
             
-            # Background color based on category and acknowledgement
-            if message["acknowledged"]:
-                # Dimmed if acknowledged
-                bg_color = (50, 50, 60)
-            else:
-                # Category-based color
-                category = message["category"]
-                r, g, b = self.category_colors.get(category, DARK_BLUE_GRAY)
-                bg_color = (int(r * 0.3), int(g * 0.3), int(b * 0.3))
-            
-            pygame.draw.rect(surface, bg_color, message_rect, border_radius=3)
-            
-            # Category indicator
-            indicator_width = 5
-            indicator_rect = pygame.Rect(
-                message_rect.x, 
-                message_rect.y, 
-                indicator_width, 
-                message_rect.height
-            )
-            pygame.draw.rect(
-                surface, 
-                self.category_colors.get(message["category"], DARK_BLUE_GRAY),
-                indicator_rect, 
-                border_radius=3
-            )
-            
-            # Message content
-            content_text = message_font.render(
-                self._truncate_text(message["content"], 40), 
-                True, 
-                VERY_LIGHT_GREY_2
-            )
-            surface.blit(content_text, (message_rect.x + 10, message_rect.y + 5))
+            x_pos = container_rect.x + 5
+            y_pos = container_rect.y + 5 + i * row_pitch
+            surface.blit(row, (x_pos, y_pos))
             
-            # Timestamp
-            timestamp = message["timestamp"]
-            current_time = time.time()
-            time_diff = current_time - timestamp
-            
-            if time_diff < 60:
-                # Less than a minute
-                time_str = "Just now"
-            elif time_diff < 3600:
-                # Less than an hour
-                minutes = int(time_diff / 60)
-                time_str = f"{minutes}m ago"
-            else:
-                # More than an hour
-                hours = int(time_diff / 3600)
-                time_str = f"{hours}h ago"
-                
-            timestamp_text = timestamp_font.render(
-                time_str, 
-                True, 
+            # Timestamp, relative to the time of the latest update
+            time_diff = self.last_update_time - self.messages_by_id[message_id]["timestamp"]
+            timestamp_text = render_text(
+                self.timestamp_font,
+                self._format_age(time_diff), 
                 (180, 180, 190)
             )
-            surface.blit(
-                timestamp_text, 
-                (message_rect.x + 10, message_rect.y + 25)
-            )
+            surface.blit(timestamp_text, (x_pos + 10, y_pos + 25))
         
-        # Indicate if there are more messages
-        if len(sorted_messages) > self.max_visible_messages:
-            more_font = pygame.font.SysFont('Arial', 14)
-            more_text = more_font.render(
-                f"+{len(sorted_messages) - self.max_visible_messages} more notifications", 
-                True, 
+        # Position and scrollbar if not everything fits
+        if total > self.max_visible_messages:
+            last = first + len(visible_keys)
+            position_text = render_text(
+                self.count_font,
+                f"{first + 1}-{last} of {total}", 
                 (180, 180, 190)
             )
-            more_rect = more_text.get_rect(
-                center=(
-                    container_rect.x + container_rect.width // 2,
-                    container_rect.y + container_rect.height - 20
-                )
-            )
-            surface.blit(more_text, more_rect)
+            surface.blit(position_text, (self.width - 100, 45))
+            
+            track_height = container_rect.height - 10
+            thumb_height = max(10, track_height * self.max_visible_messages // total)
+            thumb_y = (container_rect.y + 5
+                       + (track_height - thumb_height) * first
+                       // max(1, total - self.max_visible_messages))
+            thumb_rect = pygame.Rect(container_rect.right - 4, thumb_y, 3, thumb_height)
+            pygame.draw.rect(surface, (120, 120, 130), thumb_rect)
+    
+    def _render_row(self, message, width):
+        """Render the static part of a message row.
+        
+        Args:
+            message (dict): The message to render
+            width (int): Row width in pixels
+            
+        Returns:
+            pygame.Surface: The row, with background, category indicator
+            and content
+        """
+        row = pygame.Surface((width, self.message_height), pygame.SRCALPHA)
+        message_rect = row.get_rect()
+        
+        # Background color based on category and acknowledgement
+        if message["acknowledged"]:
+            # Dimmed if acknowledged
+            bg_color = (50, 50, 60)
+        else:
+            # Category-based color
+            category = message["category"]
+            r, g, b = self.category_colors.get(category, DARK_BLUE_GRAY)
+            bg_color = (int(r * 0.3), int(g * 0.3), int(b * 0.3))
+        
+        pygame.draw.rect(row, bg_color, message_rect, border_radius=3)
+        
+        # Category indicator
+        indicator_width = 5
+        indicator_rect = pygame.Rect(0, 0, indicator_width, message_rect.height)
+        pygame.draw.rect(
+            row, 
+            self.category_colors.get(message["category"], DARK_BLUE_GRAY),
+            indicator_rect, 
+            border_radius=3
+        )
+        
+        # Message content
+        content_text = self.message_font.render(
+            self._truncate_text(message["content"], 40), 
+            True, 
+            VERY_LIGHT_GREY_2
+        )
+        row.blit(content_text, (10, 5))
+        return row
+    
+    def _format_age(self, time_diff):
+        """Format the age of a message for display.
+        
+        Args:
+            time_diff (float): Age in seconds
+            
+        Returns:
+            str: E.g. "Just now", "5m ago" or "2h ago"
+        """
+        if time_diff < 60:
+            # Less than a minute
+            return "Just now"
+        elif time_diff < 3600:
+            # Less than an hour
+            minutes = int(time_diff / 60)
+            return f"{minutes}m ago"
+        else:
+            # More than an hour
+            hours = int(time_diff / 3600)
+            return f"{hours}h ago"
     
     def _truncate_text(self, text, max_chars):
         """Truncate text to maximum character length.
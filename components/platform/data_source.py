@@ -1,29 +1,60 @@
-import socket
+import itertools
 import threading
 import time
+from components.platform.data_source_hub import DataSourceHub
+from components.platform.framing import FrameDecoder, FramingError
+from components.platform.signal_board import SignalBoard
+from components.platform.signals import SIGNALS, STAMP_SIGNAL, SignalError, decode_sample
+from components.platform.trace import TraceError, TraceReader
+from core.constants import *
 
 class DataSource:
     """Base class for data sources that connect to emulators or real hardware.
     
     This class handles the socket connection to a data provider and
-    parses the incoming data for component use.
+    decodes the incoming samples for component use. One connection can
+    carry many signals (see SignalBus); components subscribe to the
+    signal ids they need and only those samples are decoded.
+    
+    Connections are serviced by a DataSourceHub, which multiplexes every
+    data source in the process on a single background thread; callbacks
+    run on that thread. An exception raised by a callback is printed and
+    the sample is still handed to the other callbacks.
+    
+    The generation stamp heading each batch of samples (STAMP_SIGNAL) is
+    not dispatched; it is passed on with every sample of the batch to the
+    latency tracker, if one is set.
     """
-    def __init__(self, host='localhost', port=None, reconnect_interval=1.0):
+    def __init__(self, host='localhost', port=None, reconnect_interval=1.0,
+                 recv_buffer_size=65536, hub=None):
         """Initialize the data source.
         
         Args:
             host (str): The hostname to connect to
             port (int): The port number to connect to
             reconnect_interval (float): Time to wait between reconnection attempts
+            recv_buffer_size (int): Size of the reusable socket receive buffer
+            hub (DataSourceHub): Hub servicing the connection; defaults to
+                the process-wide hub
         """
         self.host = host
         self.port = port
         self.reconnect_interval = reconnect_interval
+        self.hub = hub
         self.socket = None
+        self.connecting = False
         self.connected = False
         self.running = False
-        self.thread = None
         self.data_callback = None
+        self.recorder = None
+        self.latency = None
+        self.stamp = 0  # Generation time of the current batch; 0 if unknown
+        self.subscribers = {}  # signal id -> list of callbacks
+        
+        # Reusable receive buffer and frame reassembly state
+        self._recv_buffer = bytearray(recv_buffer_size)
+        self._recv_view = memoryview(self._recv_buffer)
+        self._decoder = FrameDecoder()
     
     def set_port(self, port):
         """Set the port to connect to.
@@ -37,87 +68,399 @@ class DataSource:
         """Set the callback function to handle received data.
         
         Args:
-            callback (callable): Function that takes a data parameter
+            callback (callable): Function that takes the decoded sample value
         """
         self.data_callback = callback
     
-    def connect(self):
-        """Connect to the data source."""
+    def set_recorder(self, recorder):
+        """Record every received sample, subscribed to or not.
+        
+        Args:
+            recorder (TraceRecorder): The recorder to feed, or None to stop
+        """
+        self.recorder = recorder
+    
+    def set_latency_tracker(self, tracker):
+        """Report the generation stamp of every dispatched sample.
+        
+        Args:
+            tracker (LatencyTracker): The tracker to feed, or None to stop
+        """
+        self.latency = tracker
+    
+    def subscribe(self, signal, callback):
+        """Register a callback for samples of one signal.
+        
+        Args:
+            signal (Signal): The signal to receive
+            callback (callable): Function that takes the decoded sample value
+        """
+        self.subscribers.setdefault(signal.id, []).append(callback)
+    
+    def unsubscribe(self, signal, callback):
+        """Remove a callback registered with subscribe().
+        
+        Args:
+            signal (Signal): The signal the callback was registered for
+            callback (callable): The callback to remove
+        """
+        callbacks = self.subscribers.get(signal.id, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+    
+    def start(self):
+        """Start receiving data; the hub connects and reconnects as needed."""
+        if self.running:
+            return
+        
         if self.port is None:
             raise ValueError("Port must be set before connecting")
         
+        self.running = True
+        if self.hub is None:
+            self.hub = DataSourceHub.default()
+        self.hub.add(self)
+    
+    def stop(self):
+        """Stop receiving data and disconnect."""
+        if not self.running:
+            return
+        
+        self.running = False
+        self.hub.remove(self)
+    
+    def _on_connected(self):
+        """Called by the hub once a connection is established."""
+        self._decoder.reset()
+        self.stamp = 0
+        self.connected = True
+        print(f"Connected to data source at {self.host}:{self.port}")
+    
+    def _on_data(self, received):
+        """Called by the hub after `received` bytes were read into the buffer.
+        
+        Args:
+            received (int): Number of bytes at the start of the receive buffer
+            
+        Returns:
+            bool: False if the stream is corrupt and must be reconnected
+        """
         try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.settimeout(1.0)  # Timeout for connection attempts
-            self.socket.connect((self.host, self.port))
-            self.connected = True
-            print(f"Connected to data source at {self.host}:{self.port}")
-            return True
-        except socket.error as e:
-            print(f"Failed to connect to data source: {e}")
-            self.connected = False
+            payloads = self._decoder.feed(self._recv_view[:received])
+        except FramingError as e:
+            print(f"Framing error: {e}, reconnecting")
             return False
+        
+        # Process every complete frame in the received chunk
+        for payload in payloads:
+            self._process_data(payload)
+        return True
     
-    def disconnect(self):
-        """Disconnect from the data source."""
-        if self.socket:
-            self.socket.close()
+    def _process_data(self, data):
+        """Decode one received sample and dispatch it to its subscribers.
+        
+        Args:
+            data (bytes): The payload of one received frame
+        """
+        if data and data[0] == STAMP_SIGNAL.id:
+            try:
+                self.stamp = STAMP_SIGNAL.decode(data)
+            except SignalError:
+                self.stamp = 0
+            return
+        
+        if self.recorder:
+            self.recorder.record(data)
+        
+        callbacks = self.subscribers.get(data[0]) if data else None
+        if not callbacks and not self.data_callback:
+            # Nobody listens to this signal, skip decoding
+            return
+        
+        try:
+            signal, value = decode_sample(data)
+        except (SignalError, ValueError) as e:
+            print(f"Sample decoding error: {e}")
+            return
+        
+        self._dispatch(signal, value, self.stamp)
+    
+    def _dispatch(self, signal, value, stamp=0):
+        """Hand a decoded sample to its subscribers.
+        
+        Args:
+            signal (Signal): The signal the sample belongs to
+            value: The decoded sample value
+            stamp (int): Generation time of the sample (see STAMP_SIGNAL);
+                0 if unknown
+        """
+        try:
+            if stamp and self.latency is not None:
+                self.latency.received(signal, stamp)
+        except Exception as e:
+            print(f"Latency tracker error: {e}")
+        callbacks = self.subscribers.get(signal.id)
+        if callbacks:
+            for callback in callbacks:
+                try:
+                    callback(value)
+                except Exception as e:
+                    print(f"Data callback error for {signal.name}: {e}")
+        if self.data_callback:
+            try:
+                self.data_callback(value)
+            except Exception as e:
+                print(f"Data callback error for {signal.name}: {e}")
+
+
+class BoardDataSource(DataSource):
+    """Data source that reads a shared-memory SignalBoard instead of a socket.
+    
+    An alternative transport for emulators running on the same host: the
+    hub polls the board slots of subscribed signals, and a sample is only
+    decoded and dispatched when its slot sequence has changed. Reading a
+    slot involves no syscall and scalar values are unpacked in place.
+    """
+    def __init__(self, board_name=SIGNAL_BOARD_NAME, poll_interval=0.005,
+                 reconnect_interval=1.0, hub=None):
+        """Initialize the board data source.
+        
+        Args:
+            board_name (str): Name of the shared memory board to attach to
+            poll_interval (float): Time between board polls in seconds
+            reconnect_interval (float): Time to wait between attach attempts
+            hub (DataSourceHub): Hub running the polls; defaults to the
+                process-wide hub
+        """
+        super().__init__(port=None, reconnect_interval=reconnect_interval,
+                         recv_buffer_size=0, hub=hub)
+        self.board_name = board_name
+        self.poll_interval = poll_interval
+        self.board = None
+        self.last_sequences = {}  # signal id -> sequence last dispatched
+        self._next_attach = 0.0
+    
+    def start(self):
+        """Start polling the board; attaching is retried until it exists."""
+        if self.running:
+            return
+        
+        self.running = True
+        if self.hub is None:
+            self.hub = DataSourceHub.default()
+        self.hub.add_poller(self.poll, self.poll_interval)
+    
+    def stop(self):
+        """Stop polling and detach from the board."""
+        if not self.running:
+            return
+        
+        self.running = False
+        self.hub.remove_poller(self.poll)
+        if self.board:
+            self.board.close()
+            self.board = None
         self.connected = False
     
+    def poll(self):
+        """Dispatch every subscribed signal whose board slot has changed."""
+        if self.board is None and not self._attach():
+            return
+        
+        board = self.board
+        if self.data_callback:
+            signal_ids = board.slots.keys()
+        else:
+            signal_ids = [i for i, callbacks in self.subscribers.items() if callbacks]
+        
+        for signal_id in signal_ids:
+            if signal_id not in board.slots:
+                continue
+            sequence = board.sequence(signal_id)
+            if sequence == self.last_sequences.get(signal_id, 0):
+                continue
+            signal = SIGNALS[signal_id]
+            sequence, value, stamp = board.read(signal)
+            if value is not None:
+                self.last_sequences[signal_id] = sequence
+                if self.recorder:
+                    self.recorder.record(signal.encode(value))
+                self._dispatch(signal, value, stamp)
+    
+    def _attach(self):
+        """Try to attach to the board, at most once per reconnect interval."""
+        now = time.monotonic()
+        if now < self._next_attach:
+            return False
+        try:
+            self.board = SignalBoard(self.board_name)
+        except (FileNotFoundError, SignalError) as e:
+            print(f"Failed to attach to signal board: {e}")
+            self._next_attach = now + self.reconnect_interval
+            return False
+        
+        self.last_sequences = {}
+        self.connected = True
+        print(f"Attached to signal board {self.board_name}")
+        return True
+
+
+class ReplayDataSource(DataSource):
+    """Data source that plays back a recorded trace (see TraceRecorder).
+    
+    The trace is memory-mapped and decoded block by block, so recordings
+    of any size replay without being loaded into memory. Like the board
+    source it needs no socket: the hub polls it, and each poll dispatches
+    every sample whose recorded time has been reached at the current
+    playback speed. Playback can be sped up or slowed down and moved to
+    any point of the trace while running; after a seek (or a loop back to
+    the start) the last snapshot of every patched signal and the patches
+    since are dispatched first, so receivers can apply what follows.
+    """
+    MIN_SPEED = 0.1
+    MAX_SPEED = 100.0
+    
+    def __init__(self, path, speed=1.0, loop=False, poll_interval=0.005, hub=None):
+        """Initialize the replay data source.
+        
+        Args:
+            path (str): The trace file to play
+            speed (float): Playback speed, MIN_SPEED to MAX_SPEED
+            loop (bool): True to restart at the end of the trace
+            poll_interval (float): Time between polls in seconds
+            hub (DataSourceHub): Hub running the polls; defaults to the
+                process-wide hub
+        """
+        super().__init__(port=None, recv_buffer_size=0, hub=hub)
+        self.path = path
+        self.loop = loop
+        self.poll_interval = poll_interval
+        self.reader = None
+        self.finished = False
+        self.speed = self._clamp_speed(speed)
+        
+        # Playback position: trace time `_base_time` (microseconds) was
+        # reached at monotonic time `_base_clock`
+        self._base_time = None
+        self._base_clock = 0.0
+        self._seek_time = None  # Pending seek, applied by the next poll
+        self._records = None
+        self._next_record = None
+        self._lock = threading.Lock()
+    
     def start(self):
-        """Start the data reception thread."""
+        """Open the trace and start playing it from the beginning."""
         if self.running:
             return
         
+        self.reader = TraceReader(self.path)
+        if self.reader.start_time is None:
+            print(f"Trace {self.path} is empty")
         self.running = True
-        self.thread = threading.Thread(target=self._receive_data_loop)
-        self.thread.daemon = True
-        self.thread.start()
+        self.finished = False
+        self.seek(0)
+        if self.hub is None:
+            self.hub = DataSourceHub.default()
+        self.hub.add_poller(self.poll, self.poll_interval)
+        self.connected = True
+        print(f"Replaying trace {self.path} at {self.speed:g}x")
     
     def stop(self):
-        """Stop the data reception thread and disconnect."""
+        """Stop playback and close the trace."""
+        if not self.running:
+            return
+        
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=1.0)
-        self.disconnect()
-    
-    def _receive_data_loop(self):
-        """Main thread function that receives and processes data."""
-        while self.running:
-            # Try to connect if not connected
-            if not self.connected:
-                if self.connect():
-                    # Successfully connected
-                    pass
-                else:
-                    # Failed to connect, wait and try again
-                    time.sleep(self.reconnect_interval)
-                    continue
-            
-            # Receive data
-            try:
-                data = self.socket.recv(1024)
-                if not data:
-                    # Connection closed
-                    print("Connection closed by server")
-                    self.connected = False
-                    continue
-                
-                # Process the data
-                self._process_data(data)
-            except socket.timeout:
-                # No data available, continue
-                pass
-            except socket.error as e:
-                print(f"Socket error: {e}")
-                self.connected = False
-                time.sleep(self.reconnect_interval)
+        self.hub.remove_poller(self.poll)
+        self._records = None
+        self._next_record = None
+        self.reader.close()
+        self.reader = None
+        self.connected = False
     
-    def _process_data(self, data):
-        """Process received data and call callback if set.
+    def seek(self, seconds):
+        """Continue playback from a point of the trace.
         
         Args:
-            data (bytes): The received data
+            seconds (float): Offset from the start of the trace in seconds
         """
-        if self.data_callback:
-            self.data_callback(data)
\ No newline at end of file
+        if self.reader is None or self.reader.start_time is None:
+            return
+        target = self.reader.start_time + int(max(0.0, seconds) * 1000000)
+        with self._lock:
+            self._seek_time = min(target, self.reader.end_time)
+            self._base_time = self._seek_time
+            self._base_clock = time.monotonic()
+    
+    def set_speed(self, speed):
+        """Change the playback speed without jumping.
+        
+        Args:
+            speed (float): New speed, clamped to MIN_SPEED..MAX_SPEED
+        """
+        with self._lock:
+            if self._base_time is not None:
+                now = time.monotonic()
+                self._base_time = self._position(now)
+                self._base_clock = now
+            self.speed = self._clamp_speed(speed)
+    
+    def position(self):
+        """Get the playback position in seconds from the start of the trace."""
+        with self._lock:
+            if self._base_time is None:
+                return 0.0
+            position = min(self._position(time.monotonic()), self.reader.end_time)
+            return (position - self.reader.start_time) / 1000000
+    
+    def _position(self, now):
+        """Trace time in microseconds reached at monotonic time `now`."""
+        return self._base_time + int((now - self._base_clock) * self.speed * 1000000)
+    
+    def _clamp_speed(self, speed):
+        """Limit a playback speed to the supported range."""
+        return min(self.MAX_SPEED, max(self.MIN_SPEED, speed))
+    
+    def poll(self):
+        """Dispatch every sample whose playback time has come."""
+        with self._lock:
+            if self._base_time is None:
+                return
+            seek_time, self._seek_time = self._seek_time, None
+            position = self._position(time.monotonic())
+        
+        if seek_time is not None:
+            try:
+                self._records = itertools.chain(self.reader.document_records(seek_time),
+                                                self.reader.records(seek_time))
+            except (TraceError, SignalError, ValueError) as e:
+                print(f"Trace seek error: {e}")
+                return
+            self._next_record = None
+            self.finished = False
+        if self.finished:
+            return
+        
+        try:
+            while True:
+                if self._next_record is None:
+                    self._next_record = next(self._records, None)
+                    if self._next_record is None:
+                        self._end_of_trace()
+                        return
+                timestamp, payload = self._next_record
+                if timestamp > position:
+                    return
+                self._next_record = None
+                self._process_data(payload)
+        except (TraceError, SignalError, ValueError) as e:
+            print(f"Trace replay error: {e}")
+            self._end_of_trace()
+    
+    def _end_of_trace(self):
+        """Restart or finish playback once every sample was dispatched."""
+        if self.loop:
+            self.seek(0)
+        else:
+            self.finished = True
+            print(f"Replay of {self.path} finished")
@@ -0,0 +1,301 @@
+import collections
+import errno
+import os
+import selectors
+import socket
+import threading
+import time
+
+class DataSourceHub:
+    """Event loop that services every DataSource connection from one thread.
+
+    Connections are non-blocking and multiplexed with a selector, so any
+    number of data sources costs a single background thread instead of one
+    polling thread per source. The hub also drives connection retries:
+    a source that fails to connect or loses its connection is retried
+    after its reconnect_interval. Sources without sockets (e.g. the shared
+    memory board) register pollers that the hub calls periodically.
+
+    An exception raised while servicing one source (or running a queued
+    command or poller) is printed and never ends the hub thread; a source
+    whose connection handling fails is dropped and reconnected.
+    """
+    _default = None
+    _default_lock = threading.Lock()
+
+    @classmethod
+    def default(cls):
+        """Get the process-wide hub used by data sources unless told otherwise.
+
+        Returns:
+            DataSourceHub: The shared hub
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def __init__(self):
+        """Initialize the hub; the thread starts with the first data source."""
+        self.selector = selectors.DefaultSelector()
+        self.sources = set()
+        self.retries = {}  # source -> monotonic time of next connect attempt
+        self.pollers = {}  # poller -> [interval, monotonic time of next poll]
+        self.running = False
+        self.thread = None
+        self.lock = threading.Lock()
+        self.commands = collections.deque()  # Callables run on the hub thread
+
+        # Self-pipe used to wake the selector when commands are queued
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+        self._wake_send.setblocking(False)
+        self.selector.register(self._wake_recv, selectors.EVENT_READ, None)
+
+    def add(self, source):
+        """Start servicing a data source.
+
+        Args:
+            source (DataSource): The data source to connect and read
+        """
+        self._ensure_running()
+        self._call(lambda: self._add(source))
+
+    def remove(self, source):
+        """Stop servicing a data source and close its connection.
+
+        Blocks until the hub has released the socket (or a short timeout
+        expires) unless called from the hub thread itself.
+
+        Args:
+            source (DataSource): The data source to drop
+        """
+        done = threading.Event()
+
+        def remove_source():
+            self._remove(source)
+            done.set()
+
+        if threading.current_thread() is self.thread or not self.running:
+            remove_source()
+            return
+        self._call(remove_source)
+        done.wait(timeout=1.0)
+
+    def add_poller(self, poller, interval):
+        """Call `poller` on the hub thread every `interval` seconds.
+
+        Args:
+            poller (callable): Called with no arguments
+            interval (float): Time between calls in seconds
+        """
+        self._ensure_running()
+        self._call(lambda: self.pollers.setdefault(poller, [interval, time.monotonic()]))
+
+    def remove_poller(self, poller):
+        """Stop calling a poller, waiting until it is no longer running.
+
+        Args:
+            poller (callable): A poller registered with add_poller()
+        """
+        done = threading.Event()
+
+        def remove():
+            self.pollers.pop(poller, None)
+            done.set()
+
+        if threading.current_thread() is self.thread or not self.running:
+            remove()
+            return
+        self._call(remove)
+        done.wait(timeout=1.0)
+
+    def stop(self):
+        """Stop the hub thread, closing every connection it owns."""
+        if not self.running:
+            return
+        self._call(self._shutdown)
+        if threading.current_thread() is not self.thread:
+            self.thread.join(timeout=1.0)
+
+    def _ensure_running(self):
+        """Start the hub thread if it is not running yet."""
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name="DataSourceHub")
+            self.thread.daemon = True
+            self.thread.start()
+
+    def _call(self, command):
+        """Queue a command for the hub thread and wake it up."""
+        self.commands.append(command)
+        try:
+            self._wake_send.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass  # Wake byte already pending or hub shutting down
+
+    def _run(self):
+        """Hub thread: wait for socket events, commands and retry deadlines."""
+        while self.running:
+            deadlines = list(self.retries.values())
+            deadlines.extend(due for interval, due in self.pollers.values())
+            timeout = None
+            if deadlines:
+                timeout = max(0.0, min(deadlines) - time.monotonic())
+
+            for key, mask in self.selector.select(timeout):
+                source = key.data
+                if source is None:
+                    self._drain_wakeups()
+                elif source.connecting:
+                    self._finish_connect(source)
+                else:
+                    self._read(source)
+
+            while self.commands:
+                command = self.commands.popleft()
+                try:
+                    command()
+                except Exception as e:
+                    print(f"Data source hub command error: {e}")
+
+            if self.retries:
+                now = time.monotonic()
+                for source in [s for s, due in self.retries.items() if due <= now]:
+                    del self.retries[source]
+                    self._start_connect(source)
+
+            if self.pollers:
+                self._run_pollers()
+
+    def _run_pollers(self):
+        """Call every poller that is due."""
+        now = time.monotonic()
+        for poller, schedule in list(self.pollers.items()):
+            interval, due = schedule
+            if due > now:
+                continue
+            schedule[1] = max(due + interval, now)
+            try:
+                poller()
+            except Exception as e:
+                print(f"Data source poll error: {e}")
+
+    def _drain_wakeups(self):
+        """Empty the wake-up socket."""
+        try:
+            while self._wake_recv.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _add(self, source):
+        """Begin servicing a source (hub thread)."""
+        if source in self.sources:
+            return
+        self.sources.add(source)
+        self._start_connect(source)
+
+    def _remove(self, source):
+        """Stop servicing a source (hub thread)."""
+        self.sources.discard(source)
+        self.retries.pop(source, None)
+        self._close(source)
+
+    def _shutdown(self):
+        """Close every source and leave the loop (hub thread)."""
+        for source in list(self.sources):
+            self._remove(source)
+        self.running = False
+
+    def _start_connect(self, source):
+        """Open a non-blocking connection to a source's provider."""
+        if source.port is None:
+            print("Port must be set before connecting")
+            return
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            err = sock.connect_ex((source.host, source.port))
+        except OSError as e:
+            err = e.errno
+        if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            sock.close()
+            self._connect_failed(source, _format_errno(err))
+            return
+
+        source.socket = sock
+        source.connecting = True
+        self.selector.register(sock, selectors.EVENT_WRITE, source)
+
+    def _finish_connect(self, source):
+        """Complete a pending connection once the socket becomes writable."""
+        err = source.socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if err:
+            self._close(source)
+            self._connect_failed(source, _format_errno(err))
+            return
+
+        source.connecting = False
+        try:
+            source._on_connected()
+        except Exception as e:
+            print(f"Data source connect error: {e}")
+            self._connection_lost(source)
+            return
+        self.selector.modify(source.socket, selectors.EVENT_READ, source)
+
+    def _connect_failed(self, source, reason):
+        """Report a failed connection attempt and schedule a retry."""
+        print(f"Failed to connect to data source: {reason}")
+        self.retries[source] = time.monotonic() + source.reconnect_interval
+
+    def _read(self, source):
+        """Read whatever is available on a connected source."""
+        try:
+            received = source.socket.recv_into(source._recv_buffer)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            print(f"Socket error: {e}")
+            self._connection_lost(source)
+            return
+
+        if not received:
+            print("Connection closed by server")
+            self._connection_lost(source)
+            return
+
+        try:
+            ok = source._on_data(received)
+        except Exception as e:
+            print(f"Data source error: {e}, reconnecting")
+            ok = False
+        if not ok:
+            self._connection_lost(source)
+
+    def _connection_lost(self, source):
+        """Drop a broken connection and schedule a reconnect."""
+        self._close(source)
+        if source in self.sources:
+            self.retries[source] = time.monotonic() + source.reconnect_interval
+
+    def _close(self, source):
+        """Unregister and close a source's socket."""
+        if source.socket is not None:
+            try:
+                self.selector.unregister(source.socket)
+            except (KeyError, ValueError):
+                pass
+            source.socket.close()
+            source.socket = None
+        source.connecting = False
+        source.connected = False
+
+
+def _format_errno(err):
+    """Format an errno value the way socket exceptions print it."""
+    return f"[Errno {err}] {os.strerror(err)}"
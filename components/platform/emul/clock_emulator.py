@@ -1,7 +1,6 @@
-import time
-import json
 from datetime import datetime
 from .data_emulator_base import DataEmulatorBase
+from components.platform.signals import CLOCK_SIGNAL
 from core.constants import *
 
 class ClockEmulator(DataEmulatorBase):
@@ -10,14 +9,17 @@ class ClockEmulator(DataEmulatorBase):
     Provides real-time clock data for the dashboard, with options
     for time format settings.
     """
-    def __init__(self, port=CLOCK_PORT, update_interval=0.5):
+    signal = CLOCK_SIGNAL
+    
+    def __init__(self, port=CLOCK_PORT, update_interval=0.5, **kwargs):
         """Initialize the clock data emulator.
         
         Args:
             port (int): Port number for the socket connection
             update_interval (float): Time between data updates in seconds
+            **kwargs: Further DataEmulatorBase options (e.g. bus, host)
         """
-        super().__init__(port, update_interval)
+        super().__init__(port, update_interval, **kwargs)
         self.time_format = "24h"  # can be "12h" or "24h"
         self.show_seconds = True
         self.show_date = True
@@ -60,9 +62,9 @@ class ClockEmulator(DataEmulatorBase):
         """Generate current time data.
         
         Returns:
-            str: JSON string with time information
+            dict: Time information
         """
-        now = datetime.now()
+        now = datetime.fromtimestamp(self.clock.time())
         
         # Format time based on settings
         if self.time_format == "12h":
@@ -91,8 +93,7 @@ class ClockEmulator(DataEmulatorBase):
             "hour": now.hour,
             "minute": now.minute,
             "second": now.second,
-            "timestamp": time.time()
+            "timestamp": self.clock.time()
         }
         
-        # Return as JSON string
-        return json.dumps(data)
\ No newline at end of file
+        return data
\ No newline at end of file
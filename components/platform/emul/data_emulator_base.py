@@ -1,93 +1,275 @@
-import threading
-import time
+import json
 import queue
-import socket
-import struct
+import random
+import time
+from components.platform.framing import encode_frame
+from components.platform.patch import PatchedDocument
+from components.platform.signals import STAMP_SIGNAL
+from .emulator_host import EmulatorHost
+from .signal_bus import SignalBus
 
 class DataEmulatorBase:
     """Base class for data emulation components.
     
     This class provides a common foundation for all data emulators,
-    handling socket creation, data delivery, and threading.
+    handling data delivery and scheduling. Samples are published on a
+    SignalBus: either a private one on the emulator's own port, or a bus
+    shared with other emulators. Ticks are run by an EmulatorHost, which
+    can likewise be private or shared. Samples can also (or instead) be
+    written to a shared-memory SignalBoard for readers on the same host.
+    
+    Subclasses set `signal` to the schema entry (see
+    components/platform/signals.py) describing the values they generate,
+    or override _generate_samples() to publish several signals per tick.
+    They draw random numbers from `self.random` and read the time from
+    `self.clock` (the host's clock), never from the random and time
+    modules, so that seeded runs are reproducible and can be run on
+    scaled or virtual time.
+    
+    Samples are only published when they change: a scalar must move by
+    more than its deadband and a structured value must differ outside its
+    volatile fields. An unchanged signal is republished every
+    heartbeat_interval so late subscribers and lost updates catch up.
+    
+    Emulators of patched signals (see Signal.patched) return a
+    PatchedDocument instead of a value. The bus then carries only the
+    changes made to it since the last tick. Full snapshots go to every
+    newly connected client and resync everyone every keyframe_interval,
+    which also serves as the heartbeat of an unchanged document; the signal
+    board, which only holds the latest sample, gets a snapshot on every
+    change.
+    
+    Every published batch starts with a STAMP_SIGNAL sample holding the
+    real time the tick started (and board slots carry the same stamp), so
+    that receivers can measure how old a sample is when it is shown.
     """
-    def __init__(self, port, update_interval=0.1):
+    signal = None
+    
+    # Deadbands by signal name (engineering units); scalars without one
+    # are published on any change
+    default_deadbands = {}
+    
+    # Fields of structured samples that change every tick (e.g. the time
+    # the sample was made) and do not count as a change
+    volatile_fields = ("timestamp",)
+    
+    def __init__(self, port, update_interval=0.1, bus=None, host=None, board=None,
+                 seed=None, heartbeat_interval=1.0, deadbands=None,
+                 keyframe_interval=30.0):
         """Initialize the data emulator.
         
         Args:
             port (int): The port number to use for the socket connection
             update_interval (float): Time between data updates in seconds
+            bus (SignalBus): Shared bus to publish on; when None the emulator
+                serves its own bus on `port`
+            host (EmulatorHost): Shared host to run on; when None the
+                emulator runs on a private host thread
+            board (SignalBoard): Shared-memory board to also write samples
+                to; with a board and no bus, no socket is opened at all
+            seed: Seed for the emulator's random generator; None seeds
+                from the operating system
+            heartbeat_interval (float): Longest time in seconds between
+                publications of an unchanged signal that is not patched; 0
+                publishes every tick
+            deadbands (dict): Signal name -> deadband, overriding
+                default_deadbands
+            keyframe_interval (float): Longest time in seconds between full
+                snapshots of a patched document on the bus
         """
         self.port = port
         self.update_interval = update_interval
         self.running = False
-        self.socket = None
-        self.thread = None
         self.data_queue = queue.Queue(maxsize=10)  # Buffer some values
+        self.tick_stats = None  # TickStats, set by the host when started
+        self.random = random.Random(seed)
+        
+        # Change-only publishing state
+        self.heartbeat_interval = heartbeat_interval
+        self.keyframe_interval = keyframe_interval
+        self.deadbands = dict(self.default_deadbands)
+        if deadbands:
+            self.deadbands.update(deadbands)
+        self.last_published = {}  # signal id -> (change key, clock time)
+        self.last_keyframe = {}  # patched signal id -> clock time of the last snapshot
+        self.documents = {}  # signal id -> (Signal, PatchedDocument) published
+        self.publish_stats = {"generated": 0, "published": 0}
+        
+        # A private bus is started and stopped with the emulator
+        self.board = board
+        self.owns_bus = bus is None and board is None
+        self.bus = SignalBus(port) if self.owns_bus else bus
+        
+        # Likewise for a private host
+        self.owns_host = host is None
+        self.host = EmulatorHost() if host is None else host
+        self.clock = self.host.clock
     
     def start(self):
-        """Start the data emulation thread and socket server."""
+        """Start emulating on the host and serving the socket."""
         if self.running:
             return
             
-        # Create the socket server
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.socket.bind(('localhost', self.port))
-        self.socket.listen(1)
-        self.socket.settimeout(0.1)  # Non-blocking socket
-        
-        # Start the emulation thread
+        if self.owns_bus:
+            self.bus.start()
+        if self.owns_host:
+            self.host.start()
+        
         self.running = True
-        self.thread = threading.Thread(target=self._run_emulation)
-        self.thread.daemon = True  # Thread will exit when program does
-        self.thread.start()
+        if self.bus:
+            self.bus.add_snapshot_source(self._snapshot_frames)
+        self.host.add(self)
         
-        print(f"Data emulator started on port {self.port}")
+        print(f"Data emulator {type(self).__name__} started on {self._describe_output()}")
     
     def stop(self):
-        """Stop the data emulation thread and close the socket."""
+        """Stop emulating and close the socket."""
+        if not self.running:
+            return
+        
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=1.0)
-        if self.socket:
-            self.socket.close()
-        print(f"Data emulator on port {self.port} stopped")
-    
-    def _run_emulation(self):
-        """Main thread function that generates data and handles connections."""
-        client = None
-        
-        while self.running:
-            # Accept new connections
-            if client is None:
-                try:
-                    client, addr = self.socket.accept()
-                    print(f"Client connected from {addr}")
-                    client.settimeout(0.1)  # Non-blocking client socket
-                except socket.timeout:
-                    # No connection yet, continue
-                    pass
+        self.host.remove(self)
+        if self.bus:
+            self.bus.remove_snapshot_source(self._snapshot_frames)
+        if self.owns_host:
+            self.host.stop()
+        if self.owns_bus:
+            self.bus.stop()
+        print(f"Data emulator {type(self).__name__} on {self._describe_output()} stopped")
+    
+    def _tick(self):
+        """Generate and publish one tick's samples (called by the host)."""
+        # Real time, not the emulation clock: latency is measured against
+        # the wall clock of the receiving side
+        stamp = time.time_ns() // 1000
+        try:
+            samples = [(signal, data) for signal, data in self._generate_samples()
+                       if data is not None]
+        except Exception as e:
+            print(f"{type(self).__name__} data generation error: {e}")
+            return
+        
+        # Add to queue for possible retrieval by direct connection
+        if samples and not self.data_queue.full():
+            values = [(signal, data.state if isinstance(data, PatchedDocument) else data)
+                      for signal, data in samples]
+            if len(values) == 1:
+                self.data_queue.put(values[0][1])
+            else:
+                self.data_queue.put({signal.name: data for signal, data in values})
+        
+        now = self.clock.monotonic()
+        self.publish_stats["generated"] += len(samples)
+        
+        try:
+            frames = []
+            for signal, data in samples:
+                if isinstance(data, PatchedDocument):
+                    payload = self._document_payload(signal, data, now, stamp)
+                elif self._should_publish(signal, data, now):
+                    payload = signal.encode(data)
+                    if self.board:
+                        self.board.write(signal.id, payload, stamp)
+                else:
+                    payload = None
+                if payload is not None:
+                    frames.append(encode_frame(payload))
+            self.publish_stats["published"] += len(frames)
             
-            # Generate data
-            data = self._generate_data()
-            if data is not None:
-                try:
-                    # Add to queue for possible retrieval by direct connection
-                    if not self.data_queue.full():
-                        self.data_queue.put(data)
-                    
-                    # Send over socket if client is connected
-                    if client:
-                        try:
-                            client.sendall(str(data).encode())
-                        except (socket.error, BrokenPipeError) as e:
-                            print(f"Socket error: {e}, client disconnected")
-                            client = None
-                except Exception as e:
-                    print(f"Error sending data: {e}")
+            # Publish to whoever is connected to the bus, all samples of
+            # the tick in one write
+            if frames and self.bus:
+                frames.insert(0, encode_frame(STAMP_SIGNAL.encode(stamp)))
+                self.bus.publish_batch(frames)
+        except Exception as e:
+            print(f"Error sending data: {e}")
+    
+    def _document_payload(self, signal, document, now, stamp):
+        """Take the changes of a patched document and encode them.
+        
+        Writes a snapshot to the board when the document changed.
+        
+        Args:
+            signal (Signal): The patched signal
+            document (PatchedDocument): The emulator's document
+            now (float): Current clock time
+            stamp (int): Generation time for the board (see STAMP_SIGNAL)
             
-            # Sleep until next update
-            time.sleep(self.update_interval)
+        Returns:
+            bytes: Snapshot or patch payload for the bus, or None if there
+            is nothing to send
+        """
+        self.documents[signal.id] = (signal, document)
+        ops = document.take_patch()
+        last = self.last_published.get(signal.id)
+        if last is None:
+            keyframe = True
+        elif ops:
+            keyframe = now - self.last_keyframe[signal.id] >= self.keyframe_interval
+        else:
+            # New clients get a snapshot when they connect, so an unchanged
+            # document is only resent once nothing at all was published
+            # for a keyframe interval
+            keyframe = now - last[1] >= self.keyframe_interval
+        if not ops and not keyframe:
+            return None
+        
+        snapshot = None
+        if keyframe or self.board:
+            snapshot = signal.encode(document.snapshot_message())
+        if self.board:
+            self.board.write(signal.id, snapshot, stamp)
+        self.last_published[signal.id] = (document.revision, now)
+        if keyframe:
+            self.last_keyframe[signal.id] = now
+            return snapshot
+        return signal.encode(document.patch_message(ops))
+    
+    def _snapshot_frames(self):
+        """Frames with the current state of every published document.
+        
+        Called by the bus for each new client.
+        """
+        return [encode_frame(signal.encode(document.snapshot_message()))
+                for signal, document in self.documents.values()]
+    
+    def _should_publish(self, signal, data, now):
+        """Decide whether a sample differs enough from the last one sent.
+        
+        Args:
+            signal (Signal): The signal of the sample
+            data: The generated value
+            now (float): Current clock time
+            
+        Returns:
+            bool: True to publish (and remember) the sample
+        """
+        if signal.kind in ("int", "float"):
+            key = data
+        elif isinstance(data, dict):
+            # Compare the serialized form: nested dicts may be mutated in place
+            volatile = self.volatile_fields
+            key = json.dumps({k: v for k, v in data.items() if k not in volatile})
+        else:
+            key = data
+        
+        last = self.last_published.get(signal.id)
+        if last is not None and now - last[1] < self.heartbeat_interval:
+            last_key = last[0]
+            if signal.kind in ("int", "float"):
+                if abs(key - last_key) <= self.deadbands.get(signal.name, 0):
+                    return False
+            elif key == last_key:
+                return False
+        
+        self.last_published[signal.id] = (key, now)
+        return True
+    
+    def _describe_output(self):
+        """Describe where samples go, for log messages."""
+        if self.bus:
+            return f"port {self.bus.port}"
+        return f"signal board {self.board.name}"
     
     def _generate_data(self):
         """Generate emulated data - Override in subclass.
@@ -97,6 +279,17 @@ class DataEmulatorBase:
         """
         raise NotImplementedError("Subclasses must implement _generate_data")
     
+    def _generate_samples(self):
+        """Generate the samples of one tick.
+        
+        Emulators producing several signals override this instead of
+        _generate_data, so that all their signals come from one tick.
+        
+        Returns:
+            list: (Signal, value) pairs; None values are skipped
+        """
+        return [(self.signal, self._generate_data())]
+    
     def get_latest_data(self):
         """Get the latest data value from the queue (non-blocking).
         
@@ -0,0 +1,95 @@
+import time
+
+class RealClock:
+    """Emulation clock that follows real time.
+
+    Every EmulatorHost schedules ticks on a clock and emulators read the
+    current time from it instead of calling the time module, so a run
+    can be slowed down, sped up or fully virtualized without touching the
+    emulator code.
+    """
+    def monotonic(self):
+        """Get the emulated monotonic time in seconds (for scheduling)."""
+        return time.monotonic()
+
+    def time(self):
+        """Get the emulated wall-clock time in seconds since the epoch."""
+        return time.time()
+
+    def wait_time(self, deadline):
+        """Get how long the host should sleep, in real seconds, until a deadline.
+
+        Args:
+            deadline (float): Emulated monotonic time to wait for
+
+        Returns:
+            float: Real seconds to wait (0 if the deadline has passed)
+        """
+        return max(0.0, deadline - time.monotonic())
+
+
+class ScaledClock(RealClock):
+    """Emulation clock running at a multiple of real time."""
+    def __init__(self, speed=1.0):
+        """Initialize the clock at the current time.
+
+        Args:
+            speed (float): Emulated seconds per real second, e.g. 100 to
+                drive an hour in 36 seconds
+        """
+        if speed <= 0:
+            raise ValueError(f"Clock speed must be positive: {speed}")
+        self.speed = speed
+        self._real_start = time.monotonic()
+        self._wall_start = time.time()
+
+    def monotonic(self):
+        """Get the emulated monotonic time in seconds."""
+        return (time.monotonic() - self._real_start) * self.speed
+
+    def time(self):
+        """Get the emulated wall-clock time in seconds since the epoch."""
+        return self._wall_start + self.monotonic()
+
+    def wait_time(self, deadline):
+        """Get the real seconds until an emulated deadline."""
+        return max(0.0, (deadline - self.monotonic()) / self.speed)
+
+
+class VirtualClock(RealClock):
+    """Emulation clock that only moves when the host advances it.
+
+    The host jumps straight to the next tick deadline instead of sleeping,
+    so emulation runs as fast as the emulators can generate data. Combined
+    with seeded emulators and a fixed start time, runs are reproducible.
+    """
+    def __init__(self, start_time=None):
+        """Initialize the clock.
+
+        Args:
+            start_time (float): Emulated wall-clock time at the start of the
+                run, in seconds since the epoch; defaults to now
+        """
+        self.now = 0.0
+        self._wall_start = time.time() if start_time is None else start_time
+
+    def monotonic(self):
+        """Get the emulated monotonic time in seconds."""
+        return self.now
+
+    def time(self):
+        """Get the emulated wall-clock time in seconds since the epoch."""
+        return self._wall_start + self.now
+
+    def wait_time(self, deadline):
+        """Advance the clock to a deadline; the host never has to sleep.
+
+        Args:
+            deadline (float): Emulated monotonic time to wait for
+
+        Returns:
+            float: Always 0
+        """
+        if deadline > self.now:
+            self.now = deadline
+        return 0.0
@@ -0,0 +1,356 @@
+import collections
+import heapq
+import itertools
+import math
+import selectors
+import socket
+import threading
+from .emulator_clock import RealClock
+
+class TickStats:
+    """Achieved tick rate and scheduling jitter of one emulator."""
+    def __init__(self, interval):
+        """Initialize empty statistics.
+
+        Args:
+            interval (float): The nominal update interval in seconds
+        """
+        self.interval = interval
+        self.ticks = 0
+        self.skipped = 0  # Ticks dropped after falling too far behind
+        self.first_tick = None
+        self.last_tick = None
+        self.max_lateness = 0.0
+        self._lateness_sum = 0.0
+        self._lateness_squares = 0.0
+
+    def record(self, deadline, started):
+        """Record one tick.
+
+        Args:
+            deadline (float): Clock time the tick was due
+            started (float): Clock time the tick actually started
+        """
+        lateness = started - deadline
+        self.ticks += 1
+        if self.first_tick is None:
+            self.first_tick = started
+        self.last_tick = started
+        self._lateness_sum += lateness
+        self._lateness_squares += lateness * lateness
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+
+    def achieved_rate(self):
+        """Get the measured tick rate in Hz (0 until two ticks ran)."""
+        if self.ticks < 2 or self.last_tick == self.first_tick:
+            return 0.0
+        return (self.ticks - 1) / (self.last_tick - self.first_tick)
+
+    def mean_lateness(self):
+        """Get the average delay between deadline and tick start in seconds."""
+        return self._lateness_sum / self.ticks if self.ticks else 0.0
+
+    def jitter(self):
+        """Get the standard deviation of the tick lateness in seconds."""
+        if not self.ticks:
+            return 0.0
+        mean = self.mean_lateness()
+        return math.sqrt(max(0.0, self._lateness_squares / self.ticks - mean * mean))
+
+    def as_dict(self):
+        """Summarize the statistics.
+
+        Returns:
+            dict: Nominal and achieved rate, lateness and jitter (seconds)
+        """
+        return {
+            "nominal_rate": 1.0 / self.interval if self.interval > 0 else None,
+            "achieved_rate": self.achieved_rate(),
+            "ticks": self.ticks,
+            "skipped": self.skipped,
+            "mean_lateness": self.mean_lateness(),
+            "max_lateness": self.max_lateness,
+            "jitter": self.jitter(),
+        }
+
+
+class EmulatorHost:
+    """Runs any number of data emulators on a single thread.
+
+    Emulator ticks are kept in a deadline-ordered heap and the signal bus
+    sockets the emulators publish on are multiplexed with a selector, so
+    the emulator side of the simulator uses one thread no matter how many
+    signal generators are attached. Emulators started without a host get
+    a private one.
+
+    Scheduling is drift-free: each deadline is the previous deadline plus
+    the update interval on the monotonic clock, so time spent generating
+    data does not lower the rate. An emulator that falls more than
+    `max_lag` behind (e.g. after the process was suspended) skips the
+    missed ticks instead of bursting through them. Achieved rate and
+    jitter are tracked per emulator in `emulator.tick_stats`.
+
+    All times are read from the host's clock (see emulator_clock.py), which
+    the emulators share. With a VirtualClock, run_for() fast-forwards a
+    scenario on the calling thread as fast as the emulators can go.
+    """
+    def __init__(self, max_lag=0.5, spin_threshold=0.0, clock=None):
+        """Initialize the host; call start() to run its thread.
+
+        Args:
+            max_lag (float): How far behind schedule, in seconds, an
+                emulator may fall before missed ticks are skipped
+            spin_threshold (float): Deadlines closer than this many seconds
+                are waited for by polling instead of sleeping. Selector
+                sleeps have millisecond resolution, so sub-millisecond
+                stress runs set this to about 0.001 at the cost of CPU.
+            clock (RealClock): Clock to schedule on; defaults to real time
+        """
+        self.clock = RealClock() if clock is None else clock
+        self.max_lag = max_lag
+        self.spin_threshold = spin_threshold
+        self.selector = selectors.DefaultSelector()
+        self.ticks = []  # Heap of (deadline, sequence, emulator)
+        self.sequence = itertools.count()  # Tie-breaker for equal deadlines
+        self.emulators = {}  # emulator -> sequence of its live heap entry
+        self.buses = {}  # bus -> number of attached emulators
+        self.running = False
+        self.thread = None
+        self.commands = collections.deque()  # Callables run on the host thread
+
+        # Self-pipe used to wake the selector when commands are queued
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+        self._wake_send.setblocking(False)
+        self.selector.register(self._wake_recv, selectors.EVENT_READ, None)
+
+    def start(self):
+        """Start the host thread."""
+        if self.running:
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="EmulatorHost")
+        self.thread.daemon = True  # Thread will exit when program does
+        self.thread.start()
+
+    def stop(self):
+        """Stop the host thread; attached emulators stop ticking."""
+        if not self.running:
+            return
+        self._call(self._shutdown)
+        if threading.current_thread() is not self.thread:
+            self.thread.join(timeout=1.0)
+
+    def run_for(self, duration):
+        """Run the attached emulators on the calling thread, then return.
+
+        Use instead of start() for scripted runs, typically with a
+        VirtualClock so that hours of emulated driving take seconds.
+        Emulators stay attached, so run_for() can be called repeatedly.
+
+        Args:
+            duration (float): Emulated seconds to run for
+        """
+        if self.running:
+            raise RuntimeError("EmulatorHost is already running")
+
+        self.running = True
+        self.thread = threading.current_thread()
+        while self.commands:  # Attach emulators added since the last run
+            self.commands.popleft()()
+        try:
+            self._run(until=self.clock.monotonic() + duration)
+        finally:
+            self.running = False
+            self.thread = None
+
+    def add(self, emulator):
+        """Attach an emulator and schedule its first tick immediately.
+
+        The emulator's bus must already be started.
+
+        Args:
+            emulator (DataEmulatorBase): The emulator to run
+        """
+        self._call(lambda: self._add(emulator))
+
+    def get_stats(self):
+        """Get scheduling statistics of every attached emulator.
+
+        Returns:
+            list: One TickStats.as_dict() per emulator, with its class name
+            under "emulator"
+        """
+        stats = []
+        for emulator in list(self.emulators):
+            entry = {"emulator": type(emulator).__name__}
+            entry.update(emulator.tick_stats.as_dict())
+            stats.append(entry)
+        return stats
+
+    def remove(self, emulator):
+        """Detach an emulator, waiting until it will not tick again.
+
+        Args:
+            emulator (DataEmulatorBase): The emulator to stop running
+        """
+        done = threading.Event()
+
+        def remove_emulator():
+            self._remove(emulator)
+            done.set()
+
+        if threading.current_thread() is self.thread or not self.running:
+            remove_emulator()
+            return
+        self._call(remove_emulator)
+        done.wait(timeout=1.0)
+
+    def watch_writable(self, sock, handler):
+        """Call `handler` whenever a socket becomes writable (host thread only).
+
+        Args:
+            sock (socket.socket): The socket to watch
+            handler (callable): Called with no arguments
+        """
+        try:
+            self.selector.register(sock, selectors.EVENT_WRITE, handler)
+        except KeyError:
+            self.selector.modify(sock, selectors.EVENT_WRITE, handler)
+
+    def unwatch(self, sock):
+        """Stop watching a socket registered with watch_writable().
+
+        Args:
+            sock (socket.socket): The socket to forget
+        """
+        try:
+            self.selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+
+    def _call(self, command):
+        """Queue a command for the host thread and wake it up."""
+        self.commands.append(command)
+        try:
+            self._wake_send.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass  # Wake byte already pending or host shutting down
+
+    def _run(self, until=None):
+        """Host thread: run due ticks, then wait for sockets or the next deadline.
+
+        Args:
+            until (float): Clock time at which to return; None runs until
+                stopped
+        """
+        while self.running:
+            self._run_due_ticks()
+
+            deadline = self.ticks[0][0] if self.ticks else None
+            if until is not None:
+                if self.clock.monotonic() >= until:
+                    break
+                deadline = until if deadline is None else min(deadline, until)
+
+            timeout = None
+            if deadline is not None:
+                timeout = self.clock.wait_time(deadline)
+                if timeout < self.spin_threshold:
+                    timeout = 0.0
+
+            for key, mask in self.selector.select(timeout):
+                if key.data is None:
+                    self._drain_wakeups()
+                else:
+                    key.data()  # Handler registered with the socket
+
+            while self.commands:
+                self.commands.popleft()()
+
+    def _run_due_ticks(self):
+        """Tick every emulator whose deadline had passed on entry.
+
+        Deadlines falling due while ticking wait for the next round, so
+        very short intervals cannot starve socket handling.
+        """
+        clock = self.clock
+        now = clock.monotonic()
+        while self.ticks and self.ticks[0][0] <= now:
+            deadline, sequence, emulator = heapq.heappop(self.ticks)
+            if self.emulators.get(emulator) != sequence:
+                continue  # Removed (or re-added) while queued
+
+            stats = emulator.tick_stats
+            stats.record(deadline, clock.monotonic())
+            emulator._tick()
+
+            interval = emulator.update_interval
+            finished = clock.monotonic()
+            if interval <= 0:
+                next_deadline = finished
+            else:
+                next_deadline = deadline + interval
+                lag = finished - next_deadline
+                if lag > self.max_lag:
+                    missed = int(lag / interval) + 1
+                    stats.skipped += missed
+                    next_deadline += missed * interval
+            self._schedule(emulator, next_deadline)
+
+    def _schedule(self, emulator, deadline):
+        """Queue the next tick of an emulator."""
+        sequence = next(self.sequence)
+        self.emulators[emulator] = sequence
+        heapq.heappush(self.ticks, (deadline, sequence, emulator))
+
+    def _drain_wakeups(self):
+        """Empty the wake-up socket."""
+        try:
+            while self._wake_recv.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _add(self, emulator):
+        """Attach an emulator (host thread)."""
+        if emulator in self.emulators:
+            return
+        emulator.tick_stats = TickStats(emulator.update_interval)
+
+        bus = emulator.bus
+        if bus is not None:  # None when publishing to a signal board only
+            if bus not in self.buses:
+                self.buses[bus] = 0
+                self.selector.register(bus.socket, selectors.EVENT_READ, bus.accept_client)
+                bus.emulator_host = self
+            self.buses[bus] += 1
+
+        self._schedule(emulator, self.clock.monotonic())
+
+    def _remove(self, emulator):
+        """Detach an emulator (host thread); its queued tick is skipped."""
+        if emulator not in self.emulators:
+            return
+        del self.emulators[emulator]
+
+        bus = emulator.bus
+        if bus is None:
+            return
+        self.buses[bus] -= 1
+        if not self.buses[bus]:
+            del self.buses[bus]
+            self.selector.unregister(bus.socket)
+            with bus.lock:
+                for client in bus.clients:
+                    self.unwatch(client.socket)
+                bus.emulator_host = None
+
+    def _shutdown(self):
+        """Detach every emulator and leave the loop (host thread)."""
+        for emulator in list(self.emulators):
+            self._remove(emulator)
+        self.ticks.clear()
+        self.running = False
@@ -0,0 +1,220 @@
+import struct
+from .data_emulator_base import DataEmulatorBase
+from components.platform.signals import FLEET_SIGNAL
+from core.constants import *
+
+try:
+    import numpy as np
+except ImportError:  # Optional: only fleet mode needs NumPy
+    np = None
+
+# Fleet sample layout after the signal id: vehicle count, then one column
+# of speeds (0.1 km/h units) and one column of RPM values, all big-endian.
+FLEET_HEADER = struct.Struct('>I')
+
+# Vehicle states, as in SpeedEmulator
+STOPPED, ACCELERATING, CRUISING, DECELERATING, BRAKING = range(5)
+
+# Engine states, as in RPMEmulator
+IDLE, ENGINE_ACCELERATING, ENGINE_CRUISING, ENGINE_DECELERATING = range(4)
+
+
+class FleetEmulator(DataEmulatorBase):
+    """Emulator for the speed and RPM of a whole fleet of vehicles.
+
+    Runs the SpeedEmulator and RPMEmulator state machines for thousands of
+    independent vehicles at once, keeping every vehicle's state in NumPy
+    arrays and advancing them all with a few vectorized operations per
+    tick. Meant for load-testing data consumers; requires NumPy.
+
+    Each tick publishes one FLEET_SIGNAL sample with all vehicles; see
+    decode_fleet().
+    """
+    signal = FLEET_SIGNAL
+
+    def __init__(self, port=FLEET_PORT, update_interval=0.1, vehicles=10000, **kwargs):
+        """Initialize the fleet emulator.
+
+        Args:
+            port (int): Port number for the socket connection
+            update_interval (float): Time between data updates in seconds
+            vehicles (int): Number of vehicles to emulate
+            **kwargs: Further DataEmulatorBase options (e.g. bus, host)
+        """
+        if np is None:
+            raise ImportError("FleetEmulator requires NumPy (pip install numpy)")
+        super().__init__(port, update_interval, **kwargs)
+        self.vehicles = vehicles
+
+        # Derived from the emulator's seeded generator so seeded runs repeat
+        self.rng = np.random.default_rng(self.random.getrandbits(64))
+
+        # Vehicle model, as in SpeedEmulator
+        self.max_speed = 220
+        self.acceleration_rate = 3
+        self.deceleration_rate = 2
+        self.brake_rate = 5
+        self.speed = np.zeros(vehicles)
+        self.target_speed = np.zeros(vehicles)
+        self.vehicle_state = np.full(vehicles, STOPPED, dtype=np.int8)
+        self.vehicle_state_duration = np.zeros(vehicles, dtype=np.int32)
+
+        # Engine model, as in RPMEmulator
+        self.min_rpm = 800
+        self.max_rpm = 8000
+        self.rpm = np.full(vehicles, self.min_rpm, dtype=np.int32)
+        self.engine_state = np.full(vehicles, IDLE, dtype=np.int8)
+        self.engine_state_duration = np.zeros(vehicles, dtype=np.int32)
+
+        # RPM change per tick by engine state: inclusive (low, high) bounds,
+        # as in RPMEmulator
+        self._rpm_step_low = np.array((-30, 50, -50, -150), dtype=np.int32)
+        self._rpm_step_high = np.array((30, 200, 50, -50), dtype=np.int32)
+
+        self.max_state_duration = 100
+
+        # Output columns, reused every tick
+        self._columns = np.empty(2 * vehicles, dtype='>u2')
+
+    def _update_vehicle_states(self):
+        """Advance every vehicle's state machine (see SpeedEmulator)."""
+        n = self.vehicles
+        state = self.vehicle_state
+        speed = self.speed
+        target = self.target_speed
+        draws = self.rng.random((4, n))
+
+        self.vehicle_state_duration += 1
+        change = (self.vehicle_state_duration > self.max_state_duration) | (draws[0] < 0.03)
+        self.vehicle_state_duration[change] = 0
+
+        # Masks use the states before this tick's transitions
+        stopped = change & (state == STOPPED)
+        accelerating = change & (state == ACCELERATING)
+        cruising = change & (state == CRUISING)
+        decelerating = change & (state == DECELERATING)
+        braking = change & (state == BRAKING)
+        close = np.abs(speed - target) < 5
+        r = draws[1]
+
+        # Randomized targets, drawn for all vehicles and used where needed
+        new_target = 30 + np.floor(draws[2] * (self.max_speed - 29))
+        retarget = np.floor(speed) + np.floor(draws[2] * (self.max_speed - np.floor(speed) + 1))
+        speed_up = np.minimum(speed + 10 + np.floor(draws[2] * 41), self.max_speed)
+        slow_down = np.maximum(0, speed - 10 - np.floor(draws[2] * 21))
+        brake_span = np.maximum(30, np.floor(speed)) - 29
+        brake_to = np.maximum(0, speed - 30 - np.floor(draws[3] * brake_span))
+
+        mask = stopped & (r < 0.7)
+        state[mask] = ACCELERATING
+        target[mask] = new_target[mask]
+
+        state[accelerating & close] = CRUISING
+        mask = accelerating & ~close & (r < 0.1)
+        target[mask] = retarget[mask]
+
+        mask = cruising & (r < 0.2)
+        state[mask] = ACCELERATING
+        target[mask] = speed_up[mask]
+        mask = cruising & (r >= 0.2) & (r < 0.4)
+        state[mask] = DECELERATING
+        target[mask] = slow_down[mask]
+        mask = cruising & (r >= 0.4) & (r < 0.45)
+        state[mask] = BRAKING
+        target[mask] = brake_to[mask]
+
+        state[decelerating & close & (target < 5)] = STOPPED
+        state[decelerating & close & (target >= 5)] = CRUISING
+        mask = decelerating & ~close & (r < 0.1)
+        state[mask] = BRAKING
+        target[mask] = brake_to[mask]
+
+        mask = braking & (speed < 5)
+        state[mask] = STOPPED
+        speed[mask] = 0
+        state[braking & (speed >= 5) & close] = CRUISING
+
+    def _update_speeds(self):
+        """Move every vehicle's speed according to its state."""
+        state = self.vehicle_state
+        speed = self.speed
+        target = self.target_speed
+        jitter = 0.8 + 0.4 * self.rng.random(self.vehicles)
+
+        speed[state == STOPPED] = 0
+
+        mask = state == ACCELERATING
+        speed[mask] = np.minimum(speed[mask] + self.acceleration_rate * jitter[mask], target[mask])
+
+        mask = state == CRUISING
+        speed[mask] += self.rng.uniform(-1.0, 1.0, np.count_nonzero(mask))
+
+        mask = state == DECELERATING
+        speed[mask] = np.maximum(speed[mask] - self.deceleration_rate * jitter[mask], target[mask])
+
+        mask = state == BRAKING
+        speed[mask] = np.maximum(speed[mask] - self.brake_rate * jitter[mask], target[mask])
+
+        np.clip(speed, 0, self.max_speed, out=speed)
+
+    def _update_engines(self):
+        """Advance every engine's state machine and RPM (see RPMEmulator)."""
+        n = self.vehicles
+        state = self.engine_state
+        rpm = self.rpm
+        draws = self.rng.random((4, n))
+
+        self.engine_state_duration += 1
+        change = (self.engine_state_duration > self.max_state_duration) | (draws[0] < 0.05)
+        self.engine_state_duration[change] = 0
+
+        idle = change & (state == IDLE)
+        accelerating = change & (state == ENGINE_ACCELERATING)
+        cruising = change & (state == ENGINE_CRUISING)
+        decelerating = change & (state == ENGINE_DECELERATING)
+        r = draws[1]
+
+        state[idle & (r < 0.7)] = ENGINE_ACCELERATING
+        mask = accelerating & (rpm > 3000)
+        state[mask] = np.where(r[mask] < 0.5, ENGINE_CRUISING, ENGINE_DECELERATING)
+        state[cruising] = np.where(r[cruising] < 0.5, ENGINE_ACCELERATING, ENGINE_DECELERATING)
+        state[decelerating & (rpm < 1200)] = IDLE
+        mask = decelerating & (rpm >= 1200)
+        state[mask] = np.choose((r[mask] * 3).astype(np.int8),
+                                (IDLE, ENGINE_ACCELERATING, ENGINE_CRUISING))
+
+        low = self._rpm_step_low[state]
+        high = self._rpm_step_high[state]
+        step = low + np.floor(draws[2] * (high - low + 1)).astype(np.int32)
+        rpm += np.where(draws[3] < 0.8, step, 0)
+        np.clip(rpm, self.min_rpm, self.max_rpm, out=rpm)
+
+    def _generate_data(self):
+        """Advance the whole fleet by one tick.
+
+        Returns:
+            bytes: Vehicle count followed by the speed and RPM columns
+        """
+        self._update_vehicle_states()
+        self._update_speeds()
+        self._update_engines()
+
+        columns = self._columns
+        n = self.vehicles
+        columns[:n] = np.rint(self.speed * 10)
+        columns[n:] = self.rpm
+        return FLEET_HEADER.pack(n) + columns.tobytes()
+
+
+def decode_fleet(value):
+    """Unpack a FLEET_SIGNAL value into NumPy arrays.
+
+    Args:
+        value (bytes): The decoded FLEET_SIGNAL value
+
+    Returns:
+        tuple: (speeds in km/h, RPM values), one entry per vehicle
+    """
+    (n,) = FLEET_HEADER.unpack_from(value, 0)
+    columns = np.frombuffer(value, dtype='>u2', count=2 * n, offset=FLEET_HEADER.size)
+    return columns[:n] / 10, columns[n:].astype(np.int32)
@@ -1,5 +1,5 @@
-import random
 from .data_emulator_base import DataEmulatorBase
+from components.platform.signals import FUEL_SIGNAL
 from core.constants import *
 
 class FuelEmulator(DataEmulatorBase):
@@ -8,14 +8,17 @@ class FuelEmulator(DataEmulatorBase):
     Generates realistic fuel level values that decrease over time
     with occasional refill events.
     """
-    def __init__(self, port=FUEL_GAUGE_PORT, update_interval=1.0):
+    signal = FUEL_SIGNAL
+    
+    def __init__(self, port=FUEL_GAUGE_PORT, update_interval=1.0, **kwargs):
         """Initialize the fuel data emulator.
         
         Args:
             port (int): Port number for the socket connection
             update_interval (float): Time between data updates in seconds
+            **kwargs: Further DataEmulatorBase options (e.g. bus, host)
         """
-        super().__init__(port, update_interval)
+        super().__init__(port, update_interval, **kwargs)
         self.fuel_level = 100.0  # Start with full tank (percentage)
         self.max_fuel = 100.0
         self.tank_capacity = 60.0  # Liters
@@ -48,7 +51,7 @@ class FuelEmulator(DataEmulatorBase):
             float: Amount of fuel to consume in this update
         """
         # Base consumption with random variance
-        consumption = self.base_consumption_rate + random.uniform(
+        consumption = self.base_consumption_rate + self.random.uniform(
             -self.consumption_variance, self.consumption_variance)
         
         # In the future, correlate with speed
@@ -73,12 +76,12 @@ class FuelEmulator(DataEmulatorBase):
         # Random chance to switch to refill state if low
         if (self.fuel_state == 'consuming' and 
             self.fuel_level < 15.0 and 
-            random.random() < self.refill_probability * 10):
+            self.random.random() < self.refill_probability * 10):
             self.fuel_state = 'refilling'
         
         # Random chance to switch to refill state normally
         elif (self.fuel_state == 'consuming' and 
-              random.random() < self.refill_probability):
+              self.random.random() < self.refill_probability):
             self.fuel_state = 'refilling'
         
         # Update fuel level based on state
@@ -1,23 +1,27 @@
-import random
-import json
-import time
 from .data_emulator_base import DataEmulatorBase
+from components.platform.patch import PatchedDocument
+from components.platform.signals import MEDIA_SIGNAL
 from core.constants import *
 
 class MediaEmulator(DataEmulatorBase):
     """Emulator for media player data.
     
     Generates simulated music player information including track info,
-    playback status, and progress.
+    playback status, and progress. The player state is published as a
+    patched document, so a tick only sends the fields that changed
+    (usually just the position and progress).
     """
-    def __init__(self, port=MEDIA_PORT, update_interval=0.5):
+    signal = MEDIA_SIGNAL
+    
+    def __init__(self, port=MEDIA_PORT, update_interval=0.5, **kwargs):
         """Initialize the media data emulator.
         
         Args:
             port (int): Port number for the socket connection
             update_interval (float): Time between data updates in seconds
+            **kwargs: Further DataEmulatorBase options (e.g. bus, host)
         """
-        super().__init__(port, update_interval)
+        super().__init__(port, update_interval, **kwargs)
         
         # Sample tracks for simulation
         self.tracks = [
@@ -34,47 +38,50 @@ class MediaEmulator(DataEmulatorBase):
         ]
         
         # Initial state
-        self.current_track_index = random.randint(0, len(self.tracks) - 1)
+        self.current_track_index = self.random.randint(0, len(self.tracks) - 1)
         self.playing = False
         self.current_position = 0
         self.repeat_mode = "off"  # "off", "single", "all"
         self.shuffle_mode = False
         self.volume = 75
-        self.start_time = time.time()
+        self.start_time = self.clock.time()
+        
+        # Published player state
+        self.document = PatchedDocument()
     
     def play(self):
         """Start playback."""
         self.playing = True
-        self.start_time = time.time() - self.current_position
+        self.start_time = self.clock.time() - self.current_position
     
     def pause(self):
         """Pause playback."""
         self.playing = False
-        self.current_position = time.time() - self.start_time
+        self.current_position = self.clock.time() - self.start_time
     
     def next_track(self):
         """Move to the next track."""
         if self.shuffle_mode:
-            self.current_track_index = random.randint(0, len(self.tracks) - 1)
+            self.current_track_index = self.random.randint(0, len(self.tracks) - 1)
         else:
             self.current_track_index = (self.current_track_index + 1) % len(self.tracks)
         self.current_position = 0
-        self.start_time = time.time()
+        self.start_time = self.clock.time()
     
     def prev_track(self):
         """Move to the previous track."""
         if self.current_position > 3:
             # If more than 3 seconds into track, restart it
             self.current_position = 0
-            self.start_time = time.time()
+            self.start_time = self.clock.time()
         else:
             # Otherwise go to previous track
             if self.shuffle_mode:
-                self.current_track_index = random.randint(0, len(self.tracks) - 1)
+                self.current_track_index = self.random.randint(0, len(self.tracks) - 1)
             else:
                 self.current_track_index = (self.current_track_index - 1) % len(self.tracks)
             self.current_position = 0
-            self.start_time = time.time()
+            self.start_time = self.clock.time()
     
     def toggle_shuffle(self):
         """Toggle shuffle mode."""
@@ -98,7 +105,7 @@ class MediaEmulator(DataEmulatorBase):
         """Update the current position based on playing state."""
         if self.playing:
             # Update position based on elapsed time
-            self.current_position = time.time() - self.start_time
+            self.current_position = self.clock.time() - self.start_time
             current_track = self.tracks[self.current_track_index]
             
             # Handle track completion
@@ -106,7 +113,7 @@ class MediaEmulator(DataEmulatorBase):
                 if self.repeat_mode == "single":
                     # Restart the same track
                     self.current_position = 0
-                    self.start_time = time.time()
+                    self.start_time = self.clock.time()
                 elif self.repeat_mode == "all" or self.shuffle_mode:
                     # Move to next track
                     self.next_track()
@@ -122,7 +129,7 @@ class MediaEmulator(DataEmulatorBase):
         """Generate media player data.
         
         Returns:
-            str: JSON string with media information
+            PatchedDocument: Media information
         """
         # Update position
         self._update_position()
@@ -136,8 +143,8 @@ class MediaEmulator(DataEmulatorBase):
         else:
             progress = 0
         
-        # Create media data
-        data = {
+        # Update media data
+        self.document.update({
             "title": current_track["title"],
             "artist": current_track["artist"],
             "album": current_track["album"],
@@ -148,11 +155,11 @@ class MediaEmulator(DataEmulatorBase):
             "repeat_mode": self.repeat_mode,
             "shuffle_mode": self.shuffle_mode,
             "volume": self.volume
-        }
+        })
         
         # Randomly change state
-        if random.random() < 0.01:  # 1% chance per update
-            action = random.choice(["play", "pause", "next", "prev", "shuffle", "repeat", "none"])
+        if self.random.random() < 0.01:  # 1% chance per update
+            action = self.random.choice(["play", "pause", "next", "prev", "shuffle", "repeat", "none"])
             if action == "play" and not self.playing:
                 self.play()
             elif action == "pause" and self.playing:
@@ -167,5 +174,4 @@ class MediaEmulator(DataEmulatorBase):
                 self.cycle_repeat_mode()
             # "none" does nothing
         
-        # Return as JSON string
-        return json.dumps(data)
\ No newline at end of file
+        return self.document
\ No newline at end of file
@@ -1,7 +1,7 @@
-import random
-import json
-import time
+import heapq
 from .data_emulator_base import DataEmulatorBase
+from components.platform.patch import PatchedDocument
+from components.platform.signals import MESSAGES_SIGNAL
 from core.constants import *
 
 class MessagesEmulator(DataEmulatorBase):
@@ -9,15 +9,29 @@ class MessagesEmulator(DataEmulatorBase):
     
     Generates simulated notification messages with varying priority levels
     and auto-dismissal behavior.
+    
+    Active messages are indexed by id, pending auto-dismissals are kept in
+    a min-heap ordered by dismissal time and per-category counts are
+    maintained as messages come and go, so each tick only touches the
+    messages that change even with thousands active. The same goes for
+    publishing: messages are kept in a patched document keyed by id, and
+    a tick only sends the messages added, changed or removed.
     """
-    def __init__(self, port=MESSAGES_PORT, update_interval=1.0):
+    signal = MESSAGES_SIGNAL
+    
+    def __init__(self, port=MESSAGES_PORT, update_interval=1.0, max_active_messages=5,
+                 **kwargs):
         """Initialize the messages data emulator.
         
         Args:
             port (int): Port number for the socket connection
             update_interval (float): Time between data updates in seconds
+            max_active_messages (int): No new messages are generated while
+                this many are active
+            **kwargs: Further DataEmulatorBase options (e.g. bus, host)
         """
-        super().__init__(port, update_interval)
+        super().__init__(port, update_interval, **kwargs)
+        self.max_active_messages = max_active_messages
         
         # Message templates by category
         self.messages = {
@@ -64,9 +78,24 @@ class MessagesEmulator(DataEmulatorBase):
         self.weather_conditions = ["Rain", "Snow", "Fog", "High winds", "Hail", "Icy conditions"]
         self.wheels = ["Front left", "Front right", "Rear left", "Rear right"]
         
-        # Active messages
-        self.active_messages = []
+        # Active messages by id, oldest first
+        self.messages_by_id = {}
         self.message_id_counter = 0
+        self.category_counts = {"info": 0, "warning": 0, "critical": 0}
+        
+        # (auto-dismiss time, message id) of messages that will time out;
+        # entries of messages already gone are skipped when popped
+        self.expiry_heap = []
+        
+        # Ids of dismissed messages, removed on the next update
+        self.dismissed_ids = []
+        
+        # Published state; holds the same message objects as messages_by_id
+        self.document = PatchedDocument({
+            "messages": {},
+            "count": {"total": 0, "info": 0, "warning": 0, "critical": 0},
+            "timestamp": self.clock.time()
+        }, volatile=self.volatile_fields)
         
         # Probabilities for new messages
         self.message_probabilities = {
@@ -85,24 +114,24 @@ class MessagesEmulator(DataEmulatorBase):
             dict: Message data
         """
         # Select random template
-        template = random.choice(self.messages[category])
+        template = self.random.choice(self.messages[category])
         
         # Fill in template variables
         content = template
         if "{name}" in content:
-            content = content.replace("{name}", random.choice(self.names))
+            content = content.replace("{name}", self.random.choice(self.names))
         if "{time}" in content:
-            hours = random.randint(0, 1)
-            minutes = random.randint(5, 59)
+            hours = self.random.randint(0, 1)
+            minutes = self.random.randint(5, 59)
             content = content.replace("{time}", f"{hours}h {minutes}min")
         if "{condition}" in content:
-            content = content.replace("{condition}", random.choice(self.weather_conditions))
+            content = content.replace("{condition}", self.random.choice(self.weather_conditions))
         if "{wheel}" in content:
-            content = content.replace("{wheel}", random.choice(self.wheels))
+            content = content.replace("{wheel}", self.random.choice(self.wheels))
         if "{fuel_level}" in content:
-            content = content.replace("{fuel_level}", str(random.randint(5, 15)))
+            content = content.replace("{fuel_level}", str(self.random.randint(5, 15)))
         if "{distance}" in content:
-            content = content.replace("{distance}", str(random.randint(500, 5000)))
+            content = content.replace("{distance}", str(self.random.randint(500, 5000)))
         
         # Create message object
         self.message_id_counter += 1
@@ -110,16 +139,16 @@ class MessagesEmulator(DataEmulatorBase):
             "id": self.message_id_counter,
             "category": category,
             "content": content,
-            "timestamp": time.time(),
+            "timestamp": self.clock.time(),
             "dismissed": False,
             "acknowledged": False
         }
         
         # Set auto-dismiss time based on category
         if category == "info":
-            message["auto_dismiss"] = time.time() + random.randint(5, 15)  # 5-15 seconds
+            message["auto_dismiss"] = self.clock.time() + self.random.randint(5, 15)  # 5-15 seconds
         elif category == "warning":
-            message["auto_dismiss"] = time.time() + random.randint(20, 40)  # 20-40 seconds
+            message["auto_dismiss"] = self.clock.time() + self.random.randint(20, 40)  # 20-40 seconds
         else:  # critical
             message["auto_dismiss"] = None  # Never auto-dismiss critical messages
             
@@ -137,20 +166,40 @@ class MessagesEmulator(DataEmulatorBase):
             "id": self.message_id_counter,
             "category": category,
             "content": content,
-            "timestamp": time.time(),
+            "timestamp": self.clock.time(),
             "dismissed": False,
             "acknowledged": False
         }
         
         # Set auto-dismiss time based on category
         if category == "info":
-            message["auto_dismiss"] = time.time() + 10
+            message["auto_dismiss"] = self.clock.time() + 10
         elif category == "warning":
-            message["auto_dismiss"] = time.time() + 30
+            message["auto_dismiss"] = self.clock.time() + 30
         else:  # critical
             message["auto_dismiss"] = None
             
-        self.active_messages.append(message)
+        self._add_message(message)
+    
+    @property
+    def active_messages(self):
+        """List the active messages, oldest first."""
+        return list(self.messages_by_id.values())
+    
+    def _add_message(self, message):
+        """Index a new message and schedule its auto-dismissal."""
+        self.messages_by_id[message["id"]] = message
+        self.category_counts[message["category"]] += 1
+        self.document.add(f"/messages/{message['id']}", message)
+        if message["auto_dismiss"] is not None:
+            heapq.heappush(self.expiry_heap, (message["auto_dismiss"], message["id"]))
+    
+    def _remove_message(self, message_id):
+        """Drop a message from the index."""
+        message = self.messages_by_id.pop(message_id, None)
+        if message is not None:
+            self.category_counts[message["category"]] -= 1
+            self.document.remove(f"/messages/{message_id}")
     
     def dismiss_message(self, message_id):
         """Dismiss a message by ID.
@@ -158,10 +207,10 @@ class MessagesEmulator(DataEmulatorBase):
         Args:
             message_id (int): The message ID to dismiss
         """
-        for message in self.active_messages:
-            if message["id"] == message_id:
-                message["dismissed"] = True
-                break
+        message = self.messages_by_id.get(message_id)
+        if message is not None and not message["dismissed"]:
+            self.document.replace(f"/messages/{message_id}/dismissed", True)
+            self.dismissed_ids.append(message_id)
     
     def acknowledge_message(self, message_id):
         """Acknowledge a message by ID.
@@ -169,50 +218,52 @@ class MessagesEmulator(DataEmulatorBase):
         Args:
             message_id (int): The message ID to acknowledge
         """
-        for message in self.active_messages:
-            if message["id"] == message_id:
-                message["acknowledged"] = True
-                break
+        message = self.messages_by_id.get(message_id)
+        if message is not None:
+            self.document.replace(f"/messages/{message_id}/acknowledged", True)
     
     def _update_messages(self):
         """Update message states (auto-dismiss, etc.)."""
-        now = time.time()
+        now = self.clock.time()
         
         # Remove dismissed messages
-        self.active_messages = [m for m in self.active_messages if not m["dismissed"]]
+        for message_id in self.dismissed_ids:
+            self._remove_message(message_id)
+        self.dismissed_ids = []
         
-        # Check auto-dismiss times
-        for message in self.active_messages:
-            if message["auto_dismiss"] and now >= message["auto_dismiss"]:
-                message["dismissed"] = True
+        # Dismiss messages whose time is up
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now:
+            _, message_id = heapq.heappop(heap)
+            message = self.messages_by_id.get(message_id)
+            if message is not None and not message["dismissed"]:
+                self.document.replace(f"/messages/{message_id}/dismissed", True)
+                self.dismissed_ids.append(message_id)
         
         # Generate new messages
         for category, probability in self.message_probabilities.items():
-            if random.random() < probability:
+            if self.random.random() < probability:
                 # Don't add too many messages
-                if len(self.active_messages) < 5:
-                    self.active_messages.append(self._create_message(category))
+                if len(self.messages_by_id) < self.max_active_messages:
+                    self._add_message(self._create_message(category))
     
     def _generate_data(self):
         """Generate message notification data.
         
         Returns:
-            str: JSON string with message information
+            PatchedDocument: Active messages (by id) and counts
         """
         # Update message states
         self._update_messages()
         
-        # Create active messages data
-        data = {
-            "messages": self.active_messages,
-            "count": {
-                "total": len(self.active_messages),
-                "info": sum(1 for m in self.active_messages if m["category"] == "info"),
-                "warning": sum(1 for m in self.active_messages if m["category"] == "warning"),
-                "critical": sum(1 for m in self.active_messages if m["category"] == "critical")
-            },
-            "timestamp": time.time()
-        }
+        # Update active messages data
+        counts = self.category_counts
+        self.document.update({
+            "total": len(self.messages_by_id),
+            "info": counts["info"],
+            "warning": counts["warning"],
+            "critical": counts["critical"]
+        }, "/count")
+        self.document.replace("/timestamp", self.clock.time())
         
-        # Return as JSON string
-        return json.dumps(data)
\ No newline at end of file
+        return self.document
\ No newline at end of file
@@ -1,5 +1,5 @@
-import random
 from .data_emulator_base import DataEmulatorBase
+from components.platform.signals import RPM_SIGNAL
 from core.constants import *
 
 class RPMEmulator(DataEmulatorBase):
@@ -8,14 +8,18 @@ class RPMEmulator(DataEmulatorBase):
     Generates realistic RPM values that mimic engine behavior, including
     acceleration, deceleration, and idle patterns.
     """
-    def __init__(self, port=RPM_PORT, update_interval=0.05):
+    signal = RPM_SIGNAL
+    default_deadbands = {"rpm": 10}  # Below what the needle can show
+    
+    def __init__(self, port=RPM_PORT, update_interval=0.05, **kwargs):
         """Initialize the RPM data emulator.
         
         Args:
             port (int): Port number for the socket connection
             update_interval (float): Time between data updates in seconds
+            **kwargs: Further DataEmulatorBase options (e.g. bus, host)
         """
-        super().__init__(port, update_interval)
+        super().__init__(port, update_interval, **kwargs)
         self.rpm = 800  # Start at idle RPM
         self.max_rpm = 8000
         self.min_rpm = 800
@@ -36,26 +40,26 @@ class RPMEmulator(DataEmulatorBase):
         self.state_duration += 1
         
         # Consider state change after some duration
-        if self.state_duration > self.max_state_duration or random.random() < 0.05:
+        if self.state_duration > self.max_state_duration or self.random.random() < 0.05:
             # Transition probabilities depend on current state and RPM
             if self.engine_state == 'idle':
                 # More likely to accelerate from idle
-                if random.random() < 0.7:
+                if self.random.random() < 0.7:
                     self.engine_state = 'accelerating'
             elif self.engine_state == 'accelerating':
                 if self.rpm > 3000:
                     # More likely to cruise or decelerate at higher RPMs
-                    self.engine_state = random.choice(['cruising', 'decelerating'])
+                    self.engine_state = self.random.choice(['cruising', 'decelerating'])
             elif self.engine_state == 'cruising':
                 # Equal chance of acceleration or deceleration
-                self.engine_state = random.choice(['accelerating', 'decelerating'])
+                self.engine_state = self.random.choice(['accelerating', 'decelerating'])
             elif self.engine_state == 'decelerating':
                 if self.rpm < 1200:
                     # Return to idle when RPM is low
                     self.engine_state = 'idle'
                 else:
                     # May start accelerating again
-                    self.engine_state = random.choice(['idle', 'accelerating', 'cruising'])
+                    self.engine_state = self.random.choice(['idle', 'accelerating', 'cruising'])
             
             # Reset duration counter
             self.state_duration = 0
@@ -70,19 +74,19 @@ class RPMEmulator(DataEmulatorBase):
         self._update_engine_state()
         
         # Modify RPM based on current state
-        if random.random() < self.rpm_change_probability:
+        if self.random.random() < self.rpm_change_probability:
             if self.engine_state == 'idle':
                 # Small fluctuations around idle
-                self.rpm += random.randint(-30, 30)
+                self.rpm += self.random.randint(-30, 30)
             elif self.engine_state == 'accelerating':
                 # Larger increases
-                self.rpm += random.randint(*self.acceleration_factor)
+                self.rpm += self.random.randint(*self.acceleration_factor)
             elif self.engine_state == 'cruising':
                 # Small fluctuations
-                self.rpm += random.randint(-50, 50)
+                self.rpm += self.random.randint(-50, 50)
             elif self.engine_state == 'decelerating':
                 # Decreases
-                self.rpm -= random.randint(*self.deceleration_factor)
+                self.rpm -= self.random.randint(*self.deceleration_factor)
         
         # Ensure RPM stays within bounds
         self.rpm = max(self.min_rpm, min(self.rpm, self.max_rpm))
@@ -0,0 +1,401 @@
+import collections
+import threading
+import socket
+from components.platform.framing import FRAME_HEADER
+from components.platform.signals import SIGNALS, STAMP_SIGNAL
+from core.constants import *
+
+# What to do with a client whose outbound queue is full. Patches are never
+# dropped on their own: when only patches are queued, every queued frame of
+# one patched signal is replaced by a fresh snapshot of it (a resync).
+DROP_OLDEST = "drop-oldest"   # Discard the oldest queued frame
+KEEP_LATEST = "keep-latest"   # Conflate: a newer sample replaces a queued one of the same signal in
+                              # place (patched signals, or signals with nothing queued, as DROP_OLDEST)
+DISCONNECT = "disconnect"     # Close the connection; the client reconnects and resyncs
+SLOW_CONSUMER_POLICIES = (DROP_OLDEST, KEEP_LATEST, DISCONNECT)
+
+
+class BusClient:
+    """One subscriber connection and its bounded outbound frame queue."""
+    def __init__(self, sock, addr):
+        """Initialize the client state.
+
+        Args:
+            sock (socket.socket): The accepted, non-blocking client socket
+            addr (tuple): The peer address
+        """
+        self.socket = sock
+        self.addr = addr
+        self.pending = collections.deque()  # (signal id, frame) not yet sent; a
+                                            # queued sample carries its stamp frame
+        self.offset = 0  # Bytes of the first pending frame already sent
+        self.sent = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.resynced = 0
+
+
+class SignalBus:
+    """Socket server that carries framed samples for one or more signals.
+
+    Every sample payload starts with its signal id, so any number of
+    emulators can publish into the same bus and a single DataSource
+    connection on the other side can demultiplex them. A standalone
+    emulator owns a private bus on its own port; main.py shares one bus on
+    BUS_PORT between all emulators.
+
+    Any number of clients (the cluster, a logger, a test probe, ...) can
+    subscribe at once. Each sample is encoded once by its emulator and the
+    same frame buffer is fanned out to every client.
+
+    Sends never block the emulators: frames a client cannot take right
+    away wait in a bounded per-client queue that is flushed when the
+    socket becomes writable. When the queue is full the slow-consumer
+    policy decides what gives (see SLOW_CONSUMER_POLICIES). Queued samples
+    carry the generation stamp (STAMP_SIGNAL) of their batch with them, so
+    dropping or conflating queued samples never leaves a sample timed by
+    another batch's stamp.
+
+    Publishers of patched signals register a snapshot source, so that a
+    client connecting mid-stream first receives the current state of
+    every patched document and can apply the patches that follow.
+
+    The bus does not run a thread of its own: the EmulatorHost running its
+    emulators watches the sockets and calls back into the bus.
+    """
+    def __init__(self, port=BUS_PORT, host='localhost', backlog=16,
+                 max_pending=64, slow_consumer_policy=KEEP_LATEST):
+        """Initialize the signal bus.
+
+        Args:
+            port (int): The port number to listen on
+            host (str): The interface to bind to
+            backlog (int): Pending connections queued by the listening socket
+            max_pending (int): Frames queued per client before the
+                slow-consumer policy applies
+            slow_consumer_policy (str): One of SLOW_CONSUMER_POLICIES
+        """
+        if slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {slow_consumer_policy}")
+
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.max_pending = max_pending
+        self.slow_consumer_policy = slow_consumer_policy
+        self.running = False
+        self.socket = None
+        self.clients = []
+        self.emulator_host = None  # Set while an EmulatorHost watches this bus
+        self.lock = threading.Lock()  # Serializes frames from publishers
+        self.snapshot_sources = []  # Callables returning frames for new clients
+
+        # Totals over all clients, including disconnected ones
+        self.stats = {"dropped": 0, "conflated": 0, "resynced": 0, "disconnected": 0}
+
+    def start(self):
+        """Open the server socket."""
+        if self.running:
+            return
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((self.host, self.port))
+        self.socket.listen(self.backlog)
+        self.socket.setblocking(False)  # Accepted when the host sees it readable
+        self.running = True
+
+        print(f"Signal bus listening on port {self.port}")
+
+    def stop(self):
+        """Stop accepting clients and close all sockets."""
+        self.running = False
+        with self.lock:
+            for client in list(self.clients):
+                self._drop_client(client)
+        if self.socket:
+            self.socket.close()
+
+    def get_stats(self):
+        """Get slow-consumer counters.
+
+        Returns:
+            dict: Bus totals plus a per-client breakdown under "clients"
+        """
+        with self.lock:
+            stats = dict(self.stats)
+            stats["clients"] = [
+                {"addr": c.addr, "pending": len(c.pending), "sent": c.sent,
+                 "dropped": c.dropped, "conflated": c.conflated,
+                 "resynced": c.resynced}
+                for c in self.clients
+            ]
+        return stats
+
+    def add_snapshot_source(self, source):
+        """Send the frames returned by `source` to every new client first.
+
+        Sources are called on the thread accepting clients (the host
+        thread), between emulator ticks.
+
+        Args:
+            source (callable): Takes no arguments and returns a list of
+                frames describing the current state
+        """
+        self.snapshot_sources.append(source)
+
+    def remove_snapshot_source(self, source):
+        """Forget a source registered with add_snapshot_source().
+
+        Args:
+            source (callable): The source to remove
+        """
+        if source in self.snapshot_sources:
+            self.snapshot_sources.remove(source)
+
+    def accept_client(self):
+        """Accept a pending connection and add it to the subscribers."""
+        try:
+            sock, addr = self.socket.accept()
+        except (BlockingIOError, OSError):
+            return
+
+        print(f"Client connected from {addr}")
+        sock.setblocking(False)
+        frames = []
+        for source in list(self.snapshot_sources):
+            frames.extend(source())
+        client = BusClient(sock, addr)
+        with self.lock:
+            self.clients.append(client)
+            if frames:
+                self._send(client, frames, b''.join(frames))
+
+    def publish(self, frame):
+        """Send one framed sample to every connected client.
+
+        Args:
+            frame (bytes): A frame produced by encode_frame()
+        """
+        self.publish_batch((frame,))
+
+    def publish_batch(self, frames):
+        """Send several framed samples to every client in a single write.
+
+        Args:
+            frames (sequence): Frames produced by encode_frame()
+        """
+        data = frames[0] if len(frames) == 1 else b''.join(frames)
+        with self.lock:
+            for client in list(self.clients):
+                self._send(client, frames, data)
+
+    def _send(self, client, frames, data):
+        """Send frames to one client, queueing what does not fit.
+
+        Called with the lock held.
+
+        Args:
+            client (BusClient): The receiving client
+            frames (sequence): The frames to send
+            data (bytes): The frames joined together
+        """
+        header_size = FRAME_HEADER.size
+        if client.pending:
+            stamp = None
+            for frame in frames:
+                signal_id = frame[header_size]
+                if signal_id == STAMP_SIGNAL.id:
+                    stamp = frame
+                self._enqueue(client, signal_id, frame, stamp)
+            return
+
+        # Nothing queued: hand the frames straight to the kernel
+        try:
+            sent = client.socket.send(data)
+        except BlockingIOError:
+            sent = 0
+        except OSError as e:
+            print(f"Socket error: {e}, client disconnected")
+            self._drop_client(client)
+            return
+
+        if sent == len(data):
+            client.sent += len(frames)
+            return
+
+        # Queue what the kernel did not take; the first queued frame may
+        # be partly sent
+        stamp = None
+        for frame in frames:
+            signal_id = frame[header_size]
+            if signal_id == STAMP_SIGNAL.id:
+                stamp = frame
+            if client.pending:
+                self._enqueue(client, signal_id, frame, stamp)
+            elif sent >= len(frame):
+                sent -= len(frame)
+                client.sent += 1
+            else:
+                client.offset = sent
+                client.pending.append((signal_id, frame))
+        self._watch(client)
+
+    def _enqueue(self, client, signal_id, frame, stamp=None):
+        """Queue a frame behind others, applying the slow-consumer policy.
+
+        Called with the lock held. The first pending frame may be partly
+        sent already; it is never replaced or dropped.
+
+        Args:
+            client (BusClient): The receiving client
+            signal_id (int): Signal id of the frame
+            frame (bytes): The frame to queue
+            stamp (bytes): STAMP_SIGNAL frame of the frame's batch, or None
+        """
+        if signal_id == STAMP_SIGNAL.id:
+            return  # Queued in front of each sample of its batch instead
+        if stamp is not None:
+            frame = stamp + frame
+
+        pending = client.pending
+        first = 1 if client.offset else 0
+        if len(pending) >= self.max_pending:
+            if self.slow_consumer_policy == DISCONNECT:
+                print(f"Client {client.addr} too slow, disconnecting")
+                self._drop_client(client)
+                return
+            signal = SIGNALS.get(signal_id)
+            if self.slow_consumer_policy == KEEP_LATEST and not (signal and signal.patched):
+                # The newest queued sample of the signal, so samples of a
+                # signal still arrive in order
+                for index in range(len(pending) - 1, first - 1, -1):
+                    if pending[index][0] == signal_id:
+                        pending[index] = (signal_id, frame)
+                        client.conflated += 1
+                        self.stats["conflated"] += 1
+                        return
+            resynced = self._make_room(client, first)
+            if resynced is False:
+                print(f"Client {client.addr} too slow to resync, disconnecting")
+                self._count_dropped(client, len(pending))
+                self._drop_client(client)
+                return
+            if resynced == signal_id:
+                self._count_dropped(client, 1)
+                return  # The snapshot already holds this patch
+
+        pending.append((signal_id, frame))
+
+    def _make_room(self, client, first):
+        """Free a slot in a full client queue.
+
+        Called with the lock held. Drops the oldest queued frame that is
+        not a patch; when only patches are queued, resyncs the patched
+        signal with the most queued frames instead.
+
+        Args:
+            client (BusClient): The client whose queue is full
+            first (int): Index of the first frame that may be removed
+
+        Returns:
+            int: Id of the resynced signal, None if a frame was dropped,
+            or False if no room can be made
+        """
+        pending = client.pending
+        counts = collections.Counter()
+        for index in range(first, len(pending)):
+            queued_id = pending[index][0]
+            signal = SIGNALS.get(queued_id)
+            if not (signal and signal.patched):
+                del pending[index]
+                self._count_dropped(client, 1)
+                return None
+            counts[queued_id] += 1
+        if not counts:
+            return None  # Only the partly sent frame is queued
+        signal_id, count = counts.most_common(1)[0]
+        if count < 2:
+            return False  # A resync would not free a slot
+        self._resync(client, signal_id, first)
+        return signal_id
+
+    def _resync(self, client, signal_id, first):
+        """Replace the queued frames of a patched signal with a snapshot.
+
+        Called with the lock held.
+
+        Args:
+            client (BusClient): The client to resync
+            signal_id (int): Id of the patched signal
+            first (int): Index of the first frame that may be removed
+        """
+        pending = client.pending
+        kept = [entry for index, entry in enumerate(pending)
+                if index < first or entry[0] != signal_id]
+        self._count_dropped(client, len(pending) - len(kept))
+        pending.clear()
+        pending.extend(kept)
+        header_size = FRAME_HEADER.size
+        for source in list(self.snapshot_sources):
+            for frame in source():
+                if frame[header_size] == signal_id:
+                    pending.append((signal_id, frame))
+        client.resynced += 1
+        self.stats["resynced"] += 1
+
+    def _count_dropped(self, client, count):
+        """Add frames discarded for a client to the dropped counters."""
+        client.dropped += count
+        self.stats["dropped"] += count
+
+    def flush_client(self, client):
+        """Send as much queued data as the client socket accepts.
+
+        Called by the EmulatorHost when the client socket is writable.
+
+        Args:
+            client (BusClient): The client to flush
+        """
+        with self.lock:
+            if client not in self.clients:
+                return
+            pending = client.pending
+            try:
+                while pending:
+                    frame = pending[0][1]
+                    client.offset += client.socket.send(memoryview(frame)[client.offset:])
+                    if client.offset < len(frame):
+                        return  # Socket buffer full again
+                    pending.popleft()
+                    client.offset = 0
+                    client.sent += 1
+            except BlockingIOError:
+                return
+            except OSError as e:
+                print(f"Socket error: {e}, client disconnected")
+                self._drop_client(client)
+                return
+            self._unwatch(client)
+
+    def _watch(self, client):
+        """Ask the host to report when the client socket becomes writable."""
+        if self.emulator_host:
+            self.emulator_host.watch_writable(client.socket,
+                                              lambda: self.flush_client(client))
+
+    def _unwatch(self, client):
+        """Stop watching the client socket for writability."""
+        if self.emulator_host:
+            self.emulator_host.unwatch(client.socket)
+
+    def _drop_client(self, client):
+        """Remove and close a client (caller holds the lock)."""
+        if client in self.clients:
+            self.clients.remove(client)
+            self.stats["disconnected"] += 1
+        self._unwatch(client)
+        try:
+            client.socket.close()
+        except OSError:
+            pass
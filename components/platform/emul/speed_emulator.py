@@ -1,5 +1,5 @@
-import random
 from .data_emulator_base import DataEmulatorBase
+from components.platform.signals import SPEED_SIGNAL
 from core.constants import *
 
 class SpeedEmulator(DataEmulatorBase):
@@ -8,14 +8,17 @@ class SpeedEmulator(DataEmulatorBase):
     Generates realistic speed values that mimic vehicle behavior, including
     acceleration, deceleration, cruising, and stop patterns.
     """
-    def __init__(self, port=SPEED_GAUGE_PORT, update_interval=0.1):
+    signal = SPEED_SIGNAL
+    
+    def __init__(self, port=SPEED_GAUGE_PORT, update_interval=0.1, **kwargs):
         """Initialize the speed data emulator.
         
         Args:
             port (int): Port number for the socket connection
             update_interval (float): Time between data updates in seconds
+            **kwargs: Further DataEmulatorBase options (e.g. bus, host)
         """
-        super().__init__(port, update_interval)
+        super().__init__(port, update_interval, **kwargs)
         self.speed = 0  # Start at 0 km/h
         self.max_speed = 220
         
@@ -35,30 +38,30 @@ class SpeedEmulator(DataEmulatorBase):
         self.state_duration += 1
         
         # Consider state change after some duration or randomly
-        if self.state_duration > self.max_state_duration or random.random() < 0.03:
+        if self.state_duration > self.max_state_duration or self.random.random() < 0.03:
             # Transition probabilities depend on current state and speed
             if self.vehicle_state == 'stopped':
-                if random.random() < 0.7:  # 70% chance to start moving
+                if self.random.random() < 0.7:  # 70% chance to start moving
                     self.vehicle_state = 'accelerating'
-                    self.target_speed = random.randint(30, self.max_speed)
+                    self.target_speed = self.random.randint(30, self.max_speed)
                     
             elif self.vehicle_state == 'accelerating':
                 if abs(self.speed - self.target_speed) < 5:  # Close to target
                     self.vehicle_state = 'cruising'
-                elif random.random() < 0.1:  # 10% chance to change target
-                    self.target_speed = random.randint(int(self.speed), self.max_speed)
+                elif self.random.random() < 0.1:  # 10% chance to change target
+                    self.target_speed = self.random.randint(int(self.speed), self.max_speed)
                     
             elif self.vehicle_state == 'cruising':
-                r = random.random()
+                r = self.random.random()
                 if r < 0.2:  # 20% chance to accelerate
                     self.vehicle_state = 'accelerating'
-                    self.target_speed = min(self.speed + random.randint(10, 50), self.max_speed)
+                    self.target_speed = min(self.speed + self.random.randint(10, 50), self.max_speed)
                 elif r < 0.4:  # 20% chance to decelerate
                     self.vehicle_state = 'decelerating'
-                    self.target_speed = max(0, self.speed - random.randint(10, 30))
+                    self.target_speed = max(0, self.speed - self.random.randint(10, 30))
                 elif r < 0.45:  # 5% chance to brake
                     self.vehicle_state = 'braking'
-                    self.target_speed = max(0, self.speed - random.randint(30, self.speed))
+                    self.target_speed = max(0, self.speed - self.random.randint(30, max(30, int(self.speed))))
                     
             elif self.vehicle_state == 'decelerating':
                 if abs(self.speed - self.target_speed) < 5:  # Close to target
@@ -66,9 +69,9 @@ class SpeedEmulator(DataEmulatorBase):
                         self.vehicle_state = 'stopped'
                     else:
                         self.vehicle_state = 'cruising'
-                elif random.random() < 0.1:  # 10% chance to brake suddenly
+                elif self.random.random() < 0.1:  # 10% chance to brake suddenly
                     self.vehicle_state = 'braking'
-                    self.target_speed = max(0, self.speed - random.randint(30, self.speed))
+                    self.target_speed = max(0, self.speed - self.random.randint(30, max(30, int(self.speed))))
                     
             elif self.vehicle_state == 'braking':
                 if self.speed < 5:  # Almost stopped
@@ -94,20 +97,20 @@ class SpeedEmulator(DataEmulatorBase):
             self.speed = 0
         elif self.vehicle_state == 'accelerating':
             # Add some randomness to acceleration
-            self.speed += self.acceleration_rate * (0.8 + 0.4 * random.random())
+            self.speed += self.acceleration_rate * (0.8 + 0.4 * self.random.random())
             if self.speed > self.target_speed:
                 self.speed = self.target_speed
         elif self.vehicle_state == 'cruising':
             # Small fluctuations during cruising
-            self.speed += random.uniform(-1.0, 1.0)
+            self.speed += self.random.uniform(-1.0, 1.0)
         elif self.vehicle_state == 'decelerating':
             # Gradual deceleration
-            self.speed -= self.deceleration_rate * (0.8 + 0.4 * random.random())
+            self.speed -= self.deceleration_rate * (0.8 + 0.4 * self.random.random())
             if self.speed < self.target_speed:
                 self.speed = self.target_speed
         elif self.vehicle_state == 'braking':
             # Faster deceleration for braking
-            self.speed -= self.brake_rate * (0.8 + 0.4 * random.random())
+            self.speed -= self.brake_rate * (0.8 + 0.4 * self.random.random())
             if self.speed < self.target_speed:
                 self.speed = self.target_speed
         
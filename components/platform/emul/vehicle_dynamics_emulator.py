@@ -0,0 +1,181 @@
+import math
+from .data_emulator_base import DataEmulatorBase
+from components.platform.signals import SPEED_SIGNAL, RPM_SIGNAL, FUEL_SIGNAL
+from core.constants import *
+
+class VehicleDynamicsEmulator(DataEmulatorBase):
+    """Emulator for speed, engine RPM and fuel level from one vehicle model.
+
+    Instead of three independent random walks, a simple driver picks
+    target speeds and a longitudinal drivetrain model works out the rest:
+    acceleration from the driving state, engine RPM from the road speed
+    through the gearbox and final drive (with automatic shifting), and
+    fuel use from the power needed at the wheels. All three signals come
+    from the same tick and are published together, so they always agree
+    with each other.
+    """
+    signal = None  # Publishes SPEED_SIGNAL, RPM_SIGNAL and FUEL_SIGNAL
+    default_deadbands = {"rpm": 10}  # Below what the needle can show
+
+    def __init__(self, port=VEHICLE_PORT, update_interval=0.05, **kwargs):
+        """Initialize the vehicle dynamics emulator.
+
+        Args:
+            port (int): Port number for the socket connection
+            update_interval (float): Time between data updates in seconds
+            **kwargs: Further DataEmulatorBase options (e.g. bus, host)
+        """
+        super().__init__(port, update_interval, **kwargs)
+
+        # Vehicle
+        self.mass = 1400.0           # kg
+        self.drag_area = 0.66        # Drag coefficient * frontal area, m^2
+        self.rolling_resistance = 0.012
+        self.wheel_radius = 0.31     # m
+        self.max_speed = 220.0       # km/h
+
+        # Drivetrain
+        self.gear_ratios = (3.6, 2.1, 1.4, 1.0, 0.8, 0.65)
+        self.final_drive = 3.9
+        self.idle_rpm = 800
+        self.max_rpm = 8000
+        self.upshift_rpm = 2600      # Relaxed driving
+        self.sport_upshift_rpm = 4500  # Hard acceleration
+        self.downshift_rpm = 1300
+
+        # Fuel: litres per hour at idle, plus litres per kWh at the wheels
+        self.tank_capacity = 60.0    # Litres
+        self.idle_consumption = 0.8
+        self.specific_consumption = 0.27
+        self.refuel_level = 10.0     # Percent; refuel at the next stop below this
+
+        # Driving: accelerations in m/s^2
+        self.max_acceleration = 3.0
+        self.coast_deceleration = 0.8
+        self.brake_deceleration = 4.0
+
+        # State
+        self.speed = 0.0             # km/h
+        self.target_speed = 0.0
+        self.gear = 1
+        self.rpm = float(self.idle_rpm)
+        self.fuel_level = 100.0      # Percent
+        self.acceleration = 0.0
+
+        # Driver state: 'stopped', 'accelerating', 'cruising', 'decelerating', 'braking'
+        self.driving_state = 'stopped'
+        self.state_time = 0.0
+
+    def _update_driver(self, dt):
+        """Pick the driving state and target speed, like SpeedEmulator does."""
+        self.state_time += dt
+        close = abs(self.speed - self.target_speed) < 3
+
+        if self.driving_state == 'stopped':
+            if self.state_time > 2.0 and self.random.random() < 0.3 * dt:
+                self.driving_state = 'accelerating'
+                self.target_speed = self.random.uniform(30, self.max_speed * 0.6)
+                self.state_time = 0.0
+        elif self.driving_state in ('accelerating', 'decelerating', 'braking'):
+            if close:
+                if self.target_speed < 3:
+                    self.driving_state = 'stopped'
+                    self.speed = 0.0
+                    self.target_speed = 0.0
+                else:
+                    self.driving_state = 'cruising'
+                self.state_time = 0.0
+        elif self.driving_state == 'cruising':
+            if self.state_time > 5.0 and self.random.random() < 0.1 * dt:
+                r = self.random.random()
+                if r < 0.4:
+                    self.driving_state = 'accelerating'
+                    self.target_speed = min(self.speed + self.random.uniform(10, 50), self.max_speed)
+                elif r < 0.8:
+                    self.driving_state = 'decelerating'
+                    self.target_speed = max(0.0, self.speed - self.random.uniform(10, 40))
+                else:
+                    self.driving_state = 'braking'
+                    self.target_speed = 0.0 if r < 0.9 else self.speed / 2
+                self.state_time = 0.0
+
+    def _update_motion(self, dt):
+        """Integrate the vehicle speed over one tick."""
+        ratio = self.gear_ratios[self.gear - 1]
+        if self.driving_state == 'accelerating':
+            # Lower gears pull harder
+            acceleration = self.max_acceleration * (0.4 + 0.6 * ratio / self.gear_ratios[0])
+            acceleration *= 0.8 + 0.4 * self.random.random()
+        elif self.driving_state == 'cruising':
+            # Hold the target with small corrections
+            acceleration = 0.3 * (self.target_speed - self.speed) / 3.6 + self.random.uniform(-0.2, 0.2)
+        elif self.driving_state == 'decelerating':
+            acceleration = -self.coast_deceleration
+        elif self.driving_state == 'braking':
+            acceleration = -self.brake_deceleration
+        else:
+            acceleration = 0.0
+
+        speed = self.speed + acceleration * dt * 3.6
+        if self.driving_state == 'accelerating':
+            speed = min(speed, self.target_speed)
+        elif self.driving_state in ('decelerating', 'braking'):
+            speed = max(speed, self.target_speed)
+        self.speed = max(0.0, min(speed, self.max_speed))
+        self.acceleration = acceleration
+
+    def _wheel_rpm(self):
+        """Get the wheel rotation speed in revolutions per minute."""
+        return self.speed / 3.6 / (2 * math.pi * self.wheel_radius) * 60
+
+    def _update_drivetrain(self):
+        """Shift gears and derive the engine RPM from the road speed."""
+        wheel_rpm = self._wheel_rpm() * self.final_drive
+        upshift = self.sport_upshift_rpm if self.acceleration > 1.5 else self.upshift_rpm
+
+        # Shift at most one gear per tick
+        rpm = wheel_rpm * self.gear_ratios[self.gear - 1]
+        if rpm > upshift and self.gear < len(self.gear_ratios):
+            self.gear += 1
+        elif rpm < self.downshift_rpm and self.gear > 1:
+            self.gear -= 1
+        if self.speed == 0:
+            self.gear = 1
+
+        rpm = wheel_rpm * self.gear_ratios[self.gear - 1]
+        # The clutch slips below idle speed in first gear
+        rpm = max(rpm, self.idle_rpm) + self.random.uniform(-15, 15)
+        self.rpm = min(rpm, self.max_rpm)
+
+    def _update_fuel(self, dt):
+        """Burn fuel for the power delivered at the wheels, refuelling at stops."""
+        if self.driving_state == 'stopped' and self.fuel_level < self.refuel_level:
+            self.fuel_level = 100.0
+            return
+
+        v = self.speed / 3.6
+        force = (self.mass * self.acceleration
+                 + 0.5 * 1.2 * self.drag_area * v * v
+                 + self.rolling_resistance * self.mass * 9.81)
+        power_kw = max(0.0, force * v) / 1000
+        litres_per_hour = self.idle_consumption + self.specific_consumption * power_kw
+        litres = litres_per_hour * dt / 3600
+        self.fuel_level = max(0.0, self.fuel_level - litres / self.tank_capacity * 100)
+
+    def _generate_samples(self):
+        """Advance the vehicle by one tick.
+
+        Returns:
+            list: Speed (km/h), RPM and fuel level (%) samples
+        """
+        dt = self.update_interval
+        self._update_driver(dt)
+        self._update_motion(dt)
+        self._update_drivetrain()
+        self._update_fuel(dt)
+
+        return [
+            (SPEED_SIGNAL, round(self.speed, 1)),
+            (RPM_SIGNAL, int(self.rpm)),
+            (FUEL_SIGNAL, round(self.fuel_level, 1)),
+        ]
@@ -0,0 +1,86 @@
+import struct
+
+# Every frame on the wire is a 4-byte big-endian payload length followed by
+# the payload itself.
+FRAME_HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+class FramingError(Exception):
+    """Raised when the incoming byte stream is not a valid frame sequence."""
+
+
+def encode_frame(payload):
+    """Wrap a payload in a length-prefixed frame.
+
+    Args:
+        payload (bytes): The payload to send
+
+    Returns:
+        bytes: Header and payload, ready for sendall()
+    """
+    if len(payload) > MAX_FRAME_SIZE:
+        raise FramingError(f"Frame payload too large: {len(payload)} bytes")
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+class FrameDecoder:
+    """Incremental decoder for length-prefixed frames.
+
+    Bytes are fed in as they arrive from the socket, in whatever chunks
+    recv() returns, and complete payloads are handed back in order. A
+    single internal buffer is reused for the lifetime of the decoder so
+    partial frames do not cause per-read allocations.
+    """
+    def __init__(self, max_frame_size=MAX_FRAME_SIZE):
+        """Initialize the frame decoder.
+
+        Args:
+            max_frame_size (int): Largest payload accepted before the stream
+                is considered corrupt
+        """
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray()
+        self._start = 0
+
+    def feed(self, data):
+        """Feed received bytes into the decoder.
+
+        Args:
+            data (bytes-like): Bytes read from the stream
+
+        Returns:
+            list: Complete frame payloads (bytes), oldest first
+        """
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        start = self._start
+        end = len(buffer)
+        header_size = FRAME_HEADER.size
+
+        while end - start >= header_size:
+            (length,) = FRAME_HEADER.unpack_from(buffer, start)
+            if length > self.max_frame_size:
+                self.reset()
+                raise FramingError(f"Frame length {length} exceeds limit")
+            frame_end = start + header_size + length
+            if frame_end > end:
+                break
+            frames.append(bytes(buffer[start + header_size:frame_end]))
+            start = frame_end
+
+        # Compact the consumed prefix only once it dominates the buffer
+        if start == end:
+            del buffer[:]
+            start = 0
+        elif start > 4096 and start > end // 2:
+            del buffer[:start]
+            start = 0
+        self._start = start
+        return frames
+
+    def reset(self):
+        """Discard any buffered partial frame (e.g. after a reconnect)."""
+        del self._buffer[:]
+        self._start = 0
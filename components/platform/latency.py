@@ -0,0 +1,172 @@
+import math
+import threading
+import time
+
+# Histogram buckets grow by this factor, bounding percentile error to 4 %
+BUCKET_GROWTH = 1.04
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+
+
+class LatencyHistogram:
+    """Log-scale histogram of latencies in microseconds.
+
+    Latencies are counted in buckets whose width grows geometrically, so
+    memory stays constant however many samples are recorded while
+    percentiles stay within a few percent of the exact value.
+    """
+    def __init__(self, budget=None):
+        """Initialize an empty histogram.
+
+        Args:
+            budget (int): Latency budget in microseconds; samples above it
+                are counted in `over_budget`
+        """
+        self.budget = budget
+        self.buckets = {}  # bucket index -> samples
+        self.count = 0
+        self.max = 0
+        self.over_budget = 0
+
+    def record(self, latency):
+        """Count one sample.
+
+        Args:
+            latency (int): Latency in microseconds; negative values (clock
+                differences between hosts) count as 0
+        """
+        latency = max(0, latency)
+        bucket = int(math.log(latency) / _LOG_GROWTH) if latency > 1 else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        if latency > self.max:
+            self.max = latency
+        if self.budget is not None and latency > self.budget:
+            self.over_budget += 1
+
+    def percentile(self, percent):
+        """Get a latency percentile.
+
+        Args:
+            percent (float): Percentile to get, e.g. 99
+
+        Returns:
+            float: Upper bound of the bucket holding the percentile, in
+            microseconds (0 if empty)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(float(self.max), BUCKET_GROWTH ** (bucket + 1))
+        return float(self.max)
+
+
+class LatencyTracker:
+    """Measures how old samples are when the frame showing them is flipped.
+
+    Emulators stamp every sample with its generation time (STAMP_SIGNAL);
+    the data source reports the stamp of each received sample through
+    received(). A component takes the stamps of its signals with take()
+    right before it applies its mailbox, and keeps those of the signals
+    actually applied; the render loop passes them to frame_presented()
+    right after the display update that shows them, giving one latency
+    sample per applied signal. A sample arriving between take() and the
+    mailbox being applied is counted with the previous stamp, so
+    latencies err on the high side.
+    """
+    def __init__(self, budget=None):
+        """Initialize the tracker.
+
+        Args:
+            budget (float): Latency budget in seconds, reported per signal
+        """
+        self.budget = None if budget is None else int(budget * 1000000)
+        self.lock = threading.Lock()
+        self.received_stamps = {}  # signal id -> newest stamp not yet taken
+        self.signal_names = {}  # signal id -> signal name
+        self.histograms = {}  # signal name -> LatencyHistogram
+
+    def received(self, signal, stamp):
+        """Note the generation time of a received sample (any thread).
+
+        Args:
+            signal (Signal): The signal of the sample
+            stamp (int): Generation time in microseconds since the epoch
+        """
+        with self.lock:
+            self.received_stamps[signal.id] = stamp
+            self.signal_names[signal.id] = signal.name
+
+    def take(self, signal_ids):
+        """Take the newest stamps of signals about to be applied.
+
+        Args:
+            signal_ids (iterable): Ids of the signals of a component
+
+        Returns:
+            dict: Signal id -> stamp, for the signals received since their
+            stamps were last taken
+        """
+        stamps = {}
+        with self.lock:
+            received = self.received_stamps
+            for signal_id in signal_ids:
+                stamp = received.pop(signal_id, None)
+                if stamp is not None:
+                    stamps[signal_id] = stamp
+        return stamps
+
+    def frame_presented(self, stamps):
+        """Record the latency of the samples shown by the display update.
+
+        Args:
+            stamps (dict): Signal id -> stamp of every sample applied by
+                the components just drawn
+        """
+        if not stamps:
+            return
+        now = time.time_ns() // 1000
+        histograms = self.histograms
+        for signal_id, stamp in stamps.items():
+            name = self.signal_names[signal_id]
+            histogram = histograms.get(name)
+            if histogram is None:
+                histogram = histograms[name] = LatencyHistogram(self.budget)
+            histogram.record(now - stamp)
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        self.histograms = {}
+
+    def get_report(self):
+        """Summarize the latency of every signal.
+
+        Returns:
+            dict: Signal name -> sample count, p50, p99 and max latency in
+            milliseconds, and samples over budget
+        """
+        report = {}
+        for name, histogram in sorted(self.histograms.items()):
+            report[name] = {
+                "samples": histogram.count,
+                "p50": histogram.percentile(50) / 1000,
+                "p99": histogram.percentile(99) / 1000,
+                "max": histogram.max / 1000,
+                "over_budget": histogram.over_budget,
+            }
+        return report
+
+    def format_report(self):
+        """Get get_report() as a printable table."""
+        lines = [f"{'signal':<10} {'samples':>8} {'p50 ms':>8} {'p99 ms':>8} "
+                 f"{'max ms':>8} {'over':>6}"]
+        for name, entry in self.get_report().items():
+            lines.append(f"{name:<10} {entry['samples']:>8} {entry['p50']:>8.1f} "
+                         f"{entry['p99']:>8.1f} {entry['max']:>8.1f} "
+                         f"{entry['over_budget']:>6}")
+        if self.budget is not None:
+            lines.append(f"Budget: {self.budget / 1000:g} ms")
+        return "\n".join(lines)
@@ -0,0 +1,184 @@
+# Patched documents: structured signals (see Signal.patched) are sent as a
+# full snapshot of a JSON document followed by JSON-patch style changes.
+#   snapshot: {"revision": r, "state": {...}}
+#   patch:    {"revision": r, "patch": [op, ...]}, applying to revision r - 1
+# Ops follow RFC 6902 for the subset needed here: {"op": "add" | "replace" |
+# "remove", "path": JSON pointer, "value": ...}. Objects are the only
+# containers; collections that change element by element (e.g. messages)
+# are objects keyed by id rather than arrays.
+
+SNAPSHOT = "snapshot"
+PATCH = "patch"
+
+
+def is_snapshot(message):
+    """Check whether a decoded message is a snapshot rather than a patch."""
+    return isinstance(message, dict) and "state" in message
+
+
+def escape_key(key):
+    """Escape one key for use in a JSON pointer."""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def split_path(path):
+    """Split a JSON pointer into its unescaped keys.
+
+    Args:
+        path (str): A JSON pointer, e.g. "/messages/12/acknowledged"; ""
+            points at the whole document
+
+    Returns:
+        list: The keys, e.g. ["messages", "12", "acknowledged"]
+    """
+    if not path:
+        return []
+    if path[0] != '/':
+        raise ValueError(f"Invalid JSON pointer: {path!r}")
+    return [key.replace('~1', '/').replace('~0', '~') for key in path[1:].split('/')]
+
+
+class PatchedDocument:
+    """A JSON document that records the changes made to it as patch ops.
+
+    The publisher changes the document only through add(), replace(),
+    remove() and update(); take_patch() then hands out what changed since
+    the last call and moves the document to its next revision. Values are
+    stored as given, not copied, so a publisher can keep its own
+    references to nested objects as long as it changes them through the
+    document.
+
+    Volatile keys (e.g. the time the document was last refreshed) change
+    without counting as a change: they are only sent along with other
+    changes and in snapshots.
+    """
+    def __init__(self, state=None, volatile=()):
+        """Initialize the document.
+
+        Args:
+            state (dict): Initial contents; defaults to an empty document
+            volatile (iterable): Top-level keys whose changes alone do not
+                make a patch
+        """
+        self.state = {} if state is None else state
+        self.volatile = frozenset(volatile)
+        self.revision = 0
+        self.ops = []  # Changes not yet taken
+        self._volatile_changed = set()
+
+    def _parent(self, path):
+        """Get the object holding the target of a path, and the target key."""
+        keys = split_path(path)
+        if not keys:
+            raise ValueError("Cannot change the whole document; use update()")
+        parent = self.state
+        for key in keys[:-1]:
+            parent = parent[key]
+        return parent, keys[-1], len(keys) == 1
+
+    def add(self, path, value):
+        """Add (or overwrite) a member.
+
+        Args:
+            path (str): JSON pointer of the new member
+            value: Its value
+        """
+        parent, key, _ = self._parent(path)
+        parent[key] = value
+        self.ops.append({"op": "add", "path": path, "value": value})
+
+    def replace(self, path, value):
+        """Change a member; nothing is recorded if the value is unchanged.
+
+        Args:
+            path (str): JSON pointer of the member
+            value: The new value
+        """
+        parent, key, top_level = self._parent(path)
+        if key in parent and parent[key] == value:
+            return
+        parent[key] = value
+        if top_level and key in self.volatile:
+            self._volatile_changed.add(key)
+        else:
+            self.ops.append({"op": "replace", "path": path, "value": value})
+
+    def remove(self, path):
+        """Remove a member if it exists.
+
+        Args:
+            path (str): JSON pointer of the member
+        """
+        parent, key, _ = self._parent(path)
+        if key in parent:
+            del parent[key]
+            self.ops.append({"op": "remove", "path": path})
+
+    def update(self, fields, path=""):
+        """Replace the members of an object that differ from `fields`.
+
+        Args:
+            fields (dict): New member values; members not listed are kept
+            path (str): JSON pointer of the object; "" is the document
+        """
+        for key, value in fields.items():
+            self.replace(f"{path}/{escape_key(key)}", value)
+
+    def take_patch(self):
+        """Take the changes made since the last call.
+
+        Returns:
+            list: Patch ops for the new revision, or an empty list (and the
+            same revision) if nothing changed
+        """
+        if not self.ops:
+            return []
+        ops = self.ops
+        for key in self._volatile_changed:
+            ops.append({"op": "replace", "path": "/" + escape_key(key),
+                        "value": self.state[key]})
+        self._volatile_changed.clear()
+        self.ops = []
+        self.revision += 1
+        return ops
+
+    def snapshot_message(self):
+        """Get a snapshot of the current revision, ready to encode."""
+        return {"revision": self.revision, "state": self.state}
+
+    def patch_message(self, ops):
+        """Wrap ops returned by take_patch(), ready to encode."""
+        return {"revision": self.revision, "patch": ops}
+
+
+class PatchReceiver:
+    """Receive side of a patched document: keeps snapshots and patches in order.
+
+    A patch only applies to the revision right before it. Patches that do
+    not (after a lost frame, a trace seek or a publisher restart) are
+    skipped until the next snapshot brings the receiver back in sync.
+    """
+    def __init__(self):
+        """Initialize a receiver that waits for its first snapshot."""
+        self.revision = None
+        self.skipped = 0
+
+    def accept(self, message):
+        """Check where a received message fits.
+
+        Args:
+            message (dict): A decoded snapshot or patch message
+
+        Returns:
+            str: SNAPSHOT to replace the whole state with message["state"],
+            PATCH to apply message["patch"], or None to ignore the message
+        """
+        revision = message.get("revision")
+        if "state" in message:
+            self.revision = revision
+            return SNAPSHOT
+        if self.revision is not None and revision == self.revision + 1:
+            self.revision = revision
+            return PATCH
+        self.skipped += 1
+        return None
@@ -0,0 +1,199 @@
+import struct
+from multiprocessing import shared_memory
+from components.platform.signals import SIGNALS, SignalError
+from core.constants import *
+
+# Board layout: header, slot table, then one slot per signal.
+#   header:     magic, version, slot count
+#   slot table: signal id, slot offset, payload capacity (per slot)
+#   slot:       sequence, payload length, generation time (microseconds
+#               since the epoch, 0 if unknown), payload bytes
+BOARD_HEADER = struct.Struct('<4sHH')
+SLOT_ENTRY = struct.Struct('<BxxxII')
+SLOT_HEADER = struct.Struct('<IIQ')
+SEQUENCE = struct.Struct('<I')
+BOARD_MAGIC = b'HMIB'
+BOARD_VERSION = 2
+
+# Payload capacity of variable-size (JSON and bytes) signal slots
+DEFAULT_JSON_SLOT_SIZE = 64 * 1024
+
+# Boards created by this process (see _attach)
+_created_names = set()
+
+
+class SignalBoard:
+    """Latest-value board for all signals in a shared memory block.
+
+    Emulators on the same host write encoded samples straight into a fixed
+    slot per signal and data sources read them back without sockets,
+    syscalls or framing. Each slot is guarded by a sequence counter used
+    as a seqlock: the writer makes it odd while updating and even when
+    done, and a reader retries if the counter was odd or changed while it
+    was reading. There must be a single writer per signal.
+    """
+    def __init__(self, name=SIGNAL_BOARD_NAME, create=False,
+                 json_slot_size=DEFAULT_JSON_SLOT_SIZE):
+        """Create or attach to a signal board.
+
+        Args:
+            name (str): Name of the shared memory block
+            create (bool): True to create the block (writer side), False
+                to attach to an existing one (reader side)
+            json_slot_size (int): Payload capacity of JSON and bytes signal
+                slots, only used when creating
+        """
+        self.name = name
+        self.created = create
+        self.slots = {}  # signal id -> (slot offset, payload capacity)
+        self.overflows = 0
+
+        if create:
+            layout = self._layout(json_slot_size)
+            size = layout[-1][1] + SLOT_HEADER.size + layout[-1][2]
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            _created_names.add(name)
+            self._write_layout(layout)
+        else:
+            self.shm = _attach(name)
+            self._read_layout()
+        self.buffer = self.shm.buf
+
+    def _layout(self, json_slot_size):
+        """Compute (signal id, offset, capacity) for every registered signal."""
+        offset = BOARD_HEADER.size + SLOT_ENTRY.size * len(SIGNALS)
+        layout = []
+        for signal_id in sorted(SIGNALS):
+            signal = SIGNALS[signal_id]
+            capacity = json_slot_size if signal.struct is None else signal.struct.size
+            layout.append((signal_id, offset, capacity))
+            # Keep slot headers 8-byte aligned
+            offset += (SLOT_HEADER.size + capacity + 7) & ~7
+        return layout
+
+    def _write_layout(self, layout):
+        """Write the header and slot table of a newly created board."""
+        buffer = self.shm.buf
+        BOARD_HEADER.pack_into(buffer, 0, BOARD_MAGIC, BOARD_VERSION, len(layout))
+        for index, (signal_id, offset, capacity) in enumerate(layout):
+            SLOT_ENTRY.pack_into(buffer, BOARD_HEADER.size + index * SLOT_ENTRY.size,
+                                 signal_id, offset, capacity)
+            SLOT_HEADER.pack_into(buffer, offset, 0, 0, 0)
+            self.slots[signal_id] = (offset, capacity)
+
+    def _read_layout(self):
+        """Read the slot table of an existing board."""
+        buffer = self.shm.buf
+        magic, version, count = BOARD_HEADER.unpack_from(buffer, 0)
+        if magic != BOARD_MAGIC or version != BOARD_VERSION:
+            self.shm.close()
+            raise SignalError(f"{self.name} is not a version {BOARD_VERSION} signal board")
+        for index in range(count):
+            signal_id, offset, capacity = SLOT_ENTRY.unpack_from(
+                buffer, BOARD_HEADER.size + index * SLOT_ENTRY.size)
+            self.slots[signal_id] = (offset, capacity)
+
+    def write(self, signal_id, payload, stamp=0):
+        """Publish an encoded sample into its slot.
+
+        Args:
+            signal_id (int): The signal the payload belongs to
+            payload (bytes): Sample payload as produced by Signal.encode()
+            stamp (int): When the sample was generated, in microseconds
+                since the epoch (see STAMP_SIGNAL); 0 if unknown
+
+        Returns:
+            bool: False if the board has no slot for the signal or the
+            payload does not fit
+        """
+        slot = self.slots.get(signal_id)
+        if slot is None:
+            return False
+        offset, capacity = slot
+        length = len(payload)
+        if length > capacity:
+            self.overflows += 1
+            return False
+
+        buffer = self.buffer
+        sequence = SEQUENCE.unpack_from(buffer, offset)[0]
+        SEQUENCE.pack_into(buffer, offset, (sequence + 1) & 0xFFFFFFFF)  # Odd: writing
+        data_start = offset + SLOT_HEADER.size
+        buffer[data_start:data_start + length] = payload
+        SLOT_HEADER.pack_into(buffer, offset, (sequence + 2) & 0xFFFFFFFF, length, stamp)
+        return True
+
+    def sequence(self, signal_id):
+        """Get the current sequence number of a slot.
+
+        A reader can compare this against the sequence of its last read to
+        find out cheaply whether the signal changed.
+
+        Args:
+            signal_id (int): The signal to check
+
+        Returns:
+            int: The slot sequence; 0 means never written
+        """
+        return SEQUENCE.unpack_from(self.buffer, self.slots[signal_id][0])[0]
+
+    def read(self, signal, retries=100):
+        """Read a consistent snapshot of a signal's latest value.
+
+        Args:
+            signal (Signal): The signal to read
+            retries (int): Attempts before giving up on a busy slot
+
+        Returns:
+            tuple: (sequence, value, generation stamp), or (sequence, None, 0)
+            if the slot has never been written or stayed busy
+        """
+        offset, capacity = self.slots[signal.id]
+        buffer = self.buffer
+        data_start = offset + SLOT_HEADER.size
+        for _ in range(retries):
+            sequence, length, stamp = SLOT_HEADER.unpack_from(buffer, offset)
+            if sequence == 0:
+                return 0, None, 0
+            if sequence & 1:
+                continue  # Writer in progress
+            try:
+                value = signal.decode_from(buffer, data_start, length)
+            except (SignalError, ValueError):
+                value = None  # Torn payload; the sequence check below retries
+            if SEQUENCE.unpack_from(buffer, offset)[0] == sequence:
+                return sequence, value, stamp
+        return sequence, None, 0
+
+    def close(self):
+        """Detach from the board, removing it if this side created it."""
+        self.buffer = None
+        self.shm.close()
+        if self.created:
+            _created_names.discard(self.name)
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _attach(name):
+    """Attach to an existing shared memory block without taking ownership.
+
+    Before Python 3.13 attaching registers the block with the resource
+    tracker, which would unlink it when the reader process exits. The
+    registration is undone unless this process created the block, in which
+    case it is the creator's own registration.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        if name in _created_names:
+            return shm
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
@@ -0,0 +1,188 @@
+import json
+import struct
+
+# Every sample payload starts with the id of the signal it carries.
+SAMPLE_HEADER = struct.Struct('>B')
+
+
+class SignalError(ValueError):
+    """Raised for unknown signals or payloads that do not match the schema."""
+
+
+class Signal:
+    """Schema entry describing one signal carried between emulators and widgets.
+
+    Scalar signals ("int" and "float") are sent as a fixed-size binary record
+    packed with a precompiled Struct; the value is stored as an integer
+    count of `scale` units and clamped to [minimum, maximum]. Structured
+    signals ("json") carry a UTF-8 JSON document and "bytes" signals an
+    opaque binary block whose layout is defined by the producer.
+
+    Patched JSON signals carry a document as a snapshot followed by
+    changes (see patch.py). Each patch depends on everything before it, so
+    their samples must be delivered in order and never conflated to the
+    latest one.
+    """
+    def __init__(self, signal_id, name, kind, fmt=None, scale=1,
+                 minimum=None, maximum=None, patched=False):
+        """Initialize a signal definition.
+
+        Args:
+            signal_id (int): Wire id of the signal (0-255)
+            name (str): Human readable signal name
+            kind (str): "int", "float", "json" or "bytes"
+            fmt (str): struct format character of the raw value (scalars only)
+            scale (float): Engineering units per raw count (scalars only)
+            minimum (float): Lowest value that can be sent (scalars only)
+            maximum (float): Highest value that can be sent (scalars only)
+            patched (bool): Samples are snapshot and patch messages of a
+                document rather than standalone values (JSON only)
+        """
+        if kind not in ("int", "float", "json", "bytes"):
+            raise SignalError(f"Unknown signal kind: {kind}")
+        if kind in ("int", "float") and fmt is None:
+            raise SignalError(f"Scalar signal {name} needs a struct format")
+        if patched and kind != "json":
+            raise SignalError(f"Only JSON signals can be patched: {name}")
+
+        self.id = signal_id
+        self.name = name
+        self.kind = kind
+        self.scale = scale
+        self.minimum = minimum
+        self.maximum = maximum
+        self.patched = patched
+        self.struct = struct.Struct('>B' + fmt) if fmt else None
+
+        # Decimal scales (0.1, 0.01, ...) divide by an exact integer so that
+        # decoded values come out as the nearest float, e.g. 123.4 not
+        # 123.40000000000001
+        counts_per_unit = 1 / scale
+        if counts_per_unit == round(counts_per_unit):
+            self._counts_per_unit = int(round(counts_per_unit))
+        else:
+            self._counts_per_unit = None
+
+    def __repr__(self):
+        return f"Signal({self.id}, {self.name!r}, {self.kind!r})"
+
+    def encode(self, value):
+        """Encode a value of this signal into a sample payload.
+
+        Args:
+            value: The engineering value (number, dict/JSON string, or
+                bytes-like block)
+
+        Returns:
+            bytes: Signal id followed by the encoded value
+        """
+        if self.kind == "bytes":
+            return SAMPLE_HEADER.pack(self.id) + bytes(value)
+        if self.kind == "json":
+            if not isinstance(value, str):
+                value = json.dumps(value, separators=(',', ':'))
+            return SAMPLE_HEADER.pack(self.id) + value.encode()
+
+        if self.minimum is not None and value < self.minimum:
+            value = self.minimum
+        elif self.maximum is not None and value > self.maximum:
+            value = self.maximum
+        if self._counts_per_unit is not None:
+            return self.struct.pack(self.id, int(round(value * self._counts_per_unit)))
+        return self.struct.pack(self.id, int(round(value / self.scale)))
+
+    def decode(self, payload):
+        """Decode a sample payload of this signal.
+
+        Args:
+            payload (bytes): Payload including the signal id byte
+
+        Returns:
+            The engineering value (int, float, dict or bytes)
+        """
+        return self.decode_from(payload, 0, len(payload))
+
+    def decode_from(self, buffer, offset, length):
+        """Decode a sample payload stored inside a larger buffer.
+
+        Scalars are unpacked in place, without copying the payload out.
+
+        Args:
+            buffer (bytes-like): Buffer holding the payload
+            offset (int): Start of the payload (its signal id byte)
+            length (int): Payload length in bytes
+
+        Returns:
+            The engineering value (int, float, dict or bytes)
+        """
+        if self.kind == "json":
+            start = offset + SAMPLE_HEADER.size
+            return json.loads(bytes(buffer[start:offset + length]))
+        if self.kind == "bytes":
+            return bytes(buffer[offset + SAMPLE_HEADER.size:offset + length])
+
+        if length != self.struct.size:
+            raise SignalError(f"Bad {self.name} sample: {length} bytes")
+        try:
+            raw = self.struct.unpack_from(buffer, offset)[1]
+        except struct.error as e:
+            raise SignalError(f"Bad {self.name} sample: {e}") from e
+        if self.kind == "int":
+            return raw if self._counts_per_unit == 1 else raw * self.scale
+        if self._counts_per_unit is not None:
+            return raw / self._counts_per_unit
+        return raw * self.scale
+
+
+# Signal registry, indexed by wire id and by name
+SIGNALS = {}
+SIGNALS_BY_NAME = {}
+
+
+def register_signal(signal):
+    """Add a signal to the registry.
+
+    Args:
+        signal (Signal): The signal definition
+
+    Returns:
+        Signal: The registered signal, for use as a module constant
+    """
+    if signal.id in SIGNALS or signal.name in SIGNALS_BY_NAME:
+        raise SignalError(f"Signal already registered: {signal!r}")
+    SIGNALS[signal.id] = signal
+    SIGNALS_BY_NAME[signal.name] = signal
+    return signal
+
+
+def decode_sample(payload):
+    """Decode a sample payload using the signal registry.
+
+    Args:
+        payload (bytes): Payload of one received frame
+
+    Returns:
+        tuple: (Signal, value)
+    """
+    if not payload:
+        raise SignalError("Empty sample payload")
+    signal = SIGNALS.get(payload[0])
+    if signal is None:
+        raise SignalError(f"Unknown signal id: {payload[0]}")
+    return signal, signal.decode(payload)
+
+
+RPM_SIGNAL = register_signal(
+    Signal(1, "rpm", "int", 'H', minimum=0, maximum=65535))
+SPEED_SIGNAL = register_signal(
+    Signal(2, "speed", "float", 'H', scale=0.1, minimum=0, maximum=400))
+FUEL_SIGNAL = register_signal(
+    Signal(3, "fuel", "float", 'H', scale=0.1, minimum=0, maximum=100))
+CLOCK_SIGNAL = register_signal(Signal(4, "clock", "json"))
+MEDIA_SIGNAL = register_signal(Signal(5, "media", "json", patched=True))
+MESSAGES_SIGNAL = register_signal(Signal(6, "messages", "json", patched=True))
+FLEET_SIGNAL = register_signal(Signal(7, "fleet", "bytes"))
+
+# Generation time, in microseconds since the epoch, of the samples that
+# follow it in the same batch (see DataEmulatorBase and LatencyTracker)
+STAMP_SIGNAL = register_signal(Signal(8, "stamp", "int", 'Q', minimum=0))
@@ -0,0 +1,394 @@
+import bisect
+import mmap
+import struct
+import threading
+import time
+from components.platform.patch import is_snapshot
+from components.platform.signals import SIGNALS, SAMPLE_HEADER, SignalError, decode_sample
+
+# Trace file layout: a file header followed by self-contained blocks.
+#   file header:  magic, version, reserved
+#   block header: magic, records length, record count, first and last
+#                 timestamp (microseconds since the epoch)
+#   record:       varint timestamp delta (from the previous record, or from
+#                 the block's first timestamp), signal id, value
+# Scalar values are stored as zigzag varints of the difference from the
+# previous raw count of the same signal in the block; JSON and bytes values
+# as a varint length and the raw payload. Delta state restarts with every
+# block, so any block can be decoded on its own.
+TRACE_HEADER = struct.Struct('<4sHH')
+BLOCK_HEADER = struct.Struct('<4sIIQQ')
+TRACE_MAGIC = b'HMIT'
+BLOCK_MAGIC = b'TBLK'
+TRACE_VERSION = 1
+
+
+class TraceError(Exception):
+    """Raised when a trace file is not a valid trace."""
+
+
+def _write_varint(out, value):
+    """Append an unsigned LEB128 varint to a bytearray."""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buffer, pos):
+    """Read an unsigned LEB128 varint.
+
+    Returns:
+        tuple: (value, position after the varint)
+    """
+    result = 0
+    shift = 0
+    while True:
+        byte = buffer[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def encode_block(records):
+    """Encode a batch of samples into one trace block.
+
+    Args:
+        records (list): (timestamp in microseconds, sample payload) tuples,
+            oldest first
+
+    Returns:
+        bytes: Block header and records; samples of unknown signals are
+        left out
+    """
+    out = bytearray()
+    written = 0
+    previous_time = records[0][0]
+    previous_counts = {}  # signal id -> raw count of its previous sample
+
+    for timestamp, payload in records:
+        signal = SIGNALS.get(payload[0]) if payload else None
+        if signal is None or (signal.struct is not None and len(payload) != signal.struct.size):
+            continue  # Not decodable on replay
+
+        _write_varint(out, max(0, timestamp - previous_time))
+        previous_time = max(previous_time, timestamp)
+        written += 1
+
+        signal_id = signal.id
+        out.append(signal_id)
+        if signal.struct is not None:
+            count = signal.struct.unpack(payload)[1]
+            delta = count - previous_counts.get(signal_id, 0)
+            previous_counts[signal_id] = count
+            _write_varint(out, (delta << 1) ^ (delta >> 63))  # Zigzag
+        else:
+            value = payload[SAMPLE_HEADER.size:]
+            _write_varint(out, len(value))
+            out += value
+
+    header = BLOCK_HEADER.pack(BLOCK_MAGIC, len(out), written,
+                               records[0][0], previous_time)
+    return header + out
+
+
+def decode_block(buffer, offset):
+    """Decode the records of the block starting at `offset`.
+
+    Args:
+        buffer (bytes-like): Trace file contents (e.g. a memory map)
+        offset (int): Position of the block header
+
+    Returns:
+        list: (timestamp in microseconds, sample payload) tuples
+    """
+    magic, length, count, first_time, last_time = BLOCK_HEADER.unpack_from(buffer, offset)
+    if magic != BLOCK_MAGIC:
+        raise TraceError(f"No trace block at offset {offset}")
+
+    pos = offset + BLOCK_HEADER.size
+    end = pos + length
+    timestamp = first_time
+    previous_counts = {}
+    records = []
+    while pos < end:
+        delta, pos = _read_varint(buffer, pos)
+        timestamp += delta
+        signal_id = buffer[pos]
+        pos += 1
+        signal = SIGNALS.get(signal_id)
+        if signal is None:
+            raise SignalError(f"Unknown signal id in trace: {signal_id}")
+
+        if signal.struct is not None:
+            zigzag, pos = _read_varint(buffer, pos)
+            count = previous_counts.get(signal_id, 0) + ((zigzag >> 1) ^ -(zigzag & 1))
+            previous_counts[signal_id] = count
+            payload = signal.struct.pack(signal_id, count)
+        else:
+            size, pos = _read_varint(buffer, pos)
+            payload = SAMPLE_HEADER.pack(signal_id) + bytes(buffer[pos:pos + size])
+            pos += size
+        records.append((timestamp, payload))
+    return records
+
+
+class TraceRecorder:
+    """Appends received samples to a binary trace file.
+
+    record() only timestamps the sample and queues it; a background thread
+    encodes queued samples into compressed blocks and writes them out in
+    batches, so recording costs the receiving thread next to nothing. An
+    existing trace file is appended to.
+    """
+    def __init__(self, path, flush_interval=0.5, max_block_records=4096,
+                 max_pending=100000):
+        """Initialize the recorder; call start() to open the file.
+
+        Args:
+            path (str): The trace file to write
+            flush_interval (float): Longest time in seconds samples wait
+                before being written
+            max_block_records (int): Samples per block before an early flush
+            max_pending (int): Samples queued before new ones are dropped
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_block_records = max_block_records
+        self.max_pending = max_pending
+        self.running = False
+        self.thread = None
+        self.file = None
+        self.pending = []  # (timestamp, payload) not yet written
+        self.lock = threading.Lock()
+        self._flush_event = threading.Event()
+
+        self.stats = {"records": 0, "blocks": 0, "bytes": 0, "dropped": 0}
+
+    def start(self):
+        """Open the trace file and start the writer thread."""
+        if self.running:
+            return
+
+        self.file = open(self.path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, 0))
+        else:
+            with open(self.path, 'rb') as existing:
+                _check_header(existing.read(TRACE_HEADER.size), self.path)
+
+        self.running = True
+        self.thread = threading.Thread(target=self._write_loop, name="TraceRecorder")
+        self.thread.daemon = True
+        self.thread.start()
+        print(f"Recording trace to {self.path}")
+
+    def stop(self):
+        """Write out everything queued and close the file."""
+        if not self.running:
+            return
+
+        self.running = False
+        self._flush_event.set()
+        self.thread.join(timeout=5.0)
+        self.file.close()
+        print(f"Trace {self.path} closed: {self.stats['records']} samples, "
+              f"{self.stats['bytes']} bytes")
+
+    def record(self, payload):
+        """Queue one sample payload for writing (safe from any thread).
+
+        Args:
+            payload (bytes): The sample payload, signal id first
+        """
+        if not self.running:
+            return
+        timestamp = time.time_ns() // 1000
+        with self.lock:
+            pending = self.pending
+            if len(pending) >= self.max_pending:
+                self.stats["dropped"] += 1
+                return
+            pending.append((timestamp, payload))
+            full = len(pending) >= self.max_block_records
+        if full:
+            self._flush_event.set()
+
+    def _write_loop(self):
+        """Writer thread: write queued samples every flush interval."""
+        while self.running:
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            self._write_pending()
+        self._write_pending()
+
+    def _write_pending(self):
+        """Encode and write whatever is queued."""
+        with self.lock:
+            batch = self.pending
+            self.pending = []
+        if not batch:
+            return
+
+        try:
+            for start in range(0, len(batch), self.max_block_records):
+                block = encode_block(batch[start:start + self.max_block_records])
+                self.file.write(block)
+                self.stats["blocks"] += 1
+                self.stats["bytes"] += len(block)
+            self.file.flush()
+        except (OSError, ValueError) as e:
+            print(f"Trace write error: {e}")
+            return
+        self.stats["records"] += len(batch)
+
+
+class TraceReader:
+    """Random-access reader for trace files.
+
+    The file is memory-mapped rather than read, so traces of any size can
+    be replayed; only the blocks actually decoded are paged in. Opening
+    the trace hops from block header to block header to build a sparse
+    index (one entry per block), which lets seek() find the block holding
+    any timestamp with a binary search.
+
+    Patched signals (see Signal.patched) only make sense from a snapshot
+    on, so document_records() finds what a receiver needs to pick them up
+    at any point of the trace.
+    """
+    def __init__(self, path):
+        """Open and index a trace file.
+
+        Args:
+            path (str): The trace file to read
+        """
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            _check_header(self.file.read(TRACE_HEADER.size), path)
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (TraceError, ValueError):
+            self.file.close()
+            raise
+
+        self.block_offsets = []
+        self.block_first_times = []
+        self.block_last_times = []
+        self._block_documents = {}  # block index -> ids of patched signals in it
+        self._index()
+
+    def _index(self):
+        """Collect the offset and time range of every complete block."""
+        buffer = self.map
+        size = len(buffer)
+        offset = TRACE_HEADER.size
+        while offset + BLOCK_HEADER.size <= size:
+            magic, length, count, first_time, last_time = BLOCK_HEADER.unpack_from(buffer, offset)
+            end = offset + BLOCK_HEADER.size + length
+            if magic != BLOCK_MAGIC or end > size:
+                print(f"Trace {self.path} truncated at offset {offset}")
+                break
+            if count:
+                self.block_offsets.append(offset)
+                self.block_first_times.append(first_time)
+                # Appended sessions may start before the previous one ended
+                if self.block_last_times and last_time < self.block_last_times[-1]:
+                    last_time = self.block_last_times[-1]
+                self.block_last_times.append(last_time)
+            offset = end
+
+    @property
+    def start_time(self):
+        """Timestamp of the first sample in microseconds (None if empty)."""
+        return self.block_first_times[0] if self.block_offsets else None
+
+    @property
+    def end_time(self):
+        """Timestamp of the last sample in microseconds (None if empty)."""
+        return self.block_last_times[-1] if self.block_offsets else None
+
+    def records(self, from_time=None):
+        """Iterate over the samples of the trace, decoding block by block.
+
+        Args:
+            from_time (int): Skip samples before this timestamp
+                (microseconds); None starts at the beginning
+
+        Yields:
+            tuple: (timestamp in microseconds, sample payload)
+        """
+        first_block = 0
+        if from_time is not None:
+            first_block = bisect.bisect_left(self.block_last_times, from_time)
+
+        for index in range(first_block, len(self.block_offsets)):
+            for timestamp, payload in decode_block(self.map, self.block_offsets[index]):
+                if from_time is None or timestamp >= from_time:
+                    yield timestamp, payload
+
+    def document_records(self, before_time):
+        """Get the samples that bring patched signals up to a point of the trace.
+
+        For every patched signal, these are its last snapshot before
+        `before_time` and the patches recorded after that snapshot, so a
+        receiver seeking to `before_time` can apply the patches that
+        follow. Signals without a snapshot before that point are left out.
+
+        Args:
+            before_time (int): Timestamp in microseconds
+
+        Returns:
+            list: (timestamp in microseconds, sample payload) tuples in
+            recording order
+        """
+        patched = {signal_id for signal_id, signal in SIGNALS.items() if signal.patched}
+        if not self.block_offsets or not patched:
+            return []
+        last_block = min(bisect.bisect_left(self.block_last_times, before_time),
+                         len(self.block_offsets) - 1)
+
+        # Walk back from the block holding `before_time` until every
+        # patched signal has reached a snapshot
+        chains = {}  # signal id -> records, newest first
+        complete = set()
+        for index in range(last_block, -1, -1):
+            if index != last_block and not (self._documents_in_block(index) - complete):
+                continue
+            for timestamp, payload in reversed(decode_block(self.map, self.block_offsets[index])):
+                signal_id = payload[0]
+                if timestamp >= before_time or signal_id not in patched or signal_id in complete:
+                    continue
+                chains.setdefault(signal_id, []).append((timestamp, payload))
+                if is_snapshot(decode_sample(payload)[1]):
+                    complete.add(signal_id)
+            if complete == patched:
+                break
+
+        records = [record for signal_id in complete for record in reversed(chains[signal_id])]
+        records.sort(key=lambda record: record[0])
+        return records
+
+    def _documents_in_block(self, index):
+        """Get the ids of the patched signals recorded in a block (cached)."""
+        documents = self._block_documents.get(index)
+        if documents is None:
+            documents = {payload[0] for _, payload in decode_block(self.map, self.block_offsets[index])
+                         if SIGNALS[payload[0]].patched}
+            self._block_documents[index] = documents
+        return documents
+
+    def close(self):
+        """Unmap and close the file."""
+        self.map.close()
+        self.file.close()
+
+
+def _check_header(header, path):
+    """Validate a trace file header."""
+    if len(header) < TRACE_HEADER.size:
+        raise TraceError(f"{path} is not a trace file")
+    magic, version, _ = TRACE_HEADER.unpack(header)
+    if magic != TRACE_MAGIC or version != TRACE_VERSION:
+        raise TraceError(f"{path} is not a version {TRACE_VERSION} trace file")
@@ -2,9 +2,19 @@ import pygame
 import threading
 import socket
 from core.constants import *
+from core.fonts import get_font
+from core.text_cache import render_text
+from core.mailbox import Mailbox
 
 # Base Component class
 class Component:
+    # Refresh rates in Hz (see next_refresh_time()): new data is applied at
+    # most max_refresh_rate times per second (None: as often as frames are
+    # drawn), and the component is redrawn at least min_refresh_rate times
+    # per second even when nothing arrives (None: only when it changes)
+    min_refresh_rate = None
+    max_refresh_rate = None
+    
     def __init__(self, region, name):
         self.region = region
         self.name = name
@@ -19,6 +29,32 @@ class Component:
         self.socket_thread = None
         self.data_lock = threading.Lock()
         
+        # Data source set up by subclasses; a shared one (e.g. a bus
+        # connection) is started and stopped by its owner, not here
+        self.data_source = None
+        self.owns_data_source = True
+        
+        # Samples from the data source wait here until the render loop
+        # applies the latest one per signal in update()
+        self.mailbox = Mailbox(self.data_lock)
+        self.data_handlers = {}  # signal id -> handler
+        
+        # Static layer rendered once by draw_face(), see get_face()
+        self._face = None
+        self.patched_signals = set()  # Ids whose every sample is applied
+        
+        # State version, bumped by mark_dirty() whenever what draw() shows
+        # may have changed; the render loop only redraws components whose
+        # version moved on since they were last drawn
+        self.version = 0
+        self.drawn_version = None
+        self.last_refresh = None  # Render loop time of the last refresh()
+        
+        # Generation stamps of the samples applied since the component was
+        # last drawn, for the latency tracker (see set_latency_tracker())
+        self.latency = None
+        self.latency_stamps = {}
+        
     def draw_component_background(self, surface):
         # Draw component background with border
         pygame.draw.rect(surface, (30, 30, 40), 
@@ -27,13 +63,186 @@ class Component:
                         (0, 0, self.width, self.height), 2)
         
         # Draw component title
-        font = pygame.font.SysFont('Arial', 18)
-        title = font.render(self.name, True, (180, 180, 200))
+        font = get_font(18)
+        title = render_text(font, self.name, (180, 180, 200))
         title_rect = title.get_rect(midtop=(self.center_x, 10))
         surface.blit(title, title_rect)
     
+    def draw_face(self, surface):
+        """Draw the parts of the component that never change.
+        
+        Rendered once into the cached face layer (see get_face());
+        subclasses with a static face extend this and draw only what
+        changes in draw().
+        
+        Args:
+            surface (pygame.Surface): The face surface to draw on
+        """
+        self.draw_component_background(surface)
+    
+    def get_face(self, size):
+        """Get the static face layer, rendering it when needed.
+        
+        The face is rendered with draw_face() on first use and again only
+        when the component is drawn at a different size. It is converted
+        to the display's pixel format, so blitting it is a plain copy.
+        
+        Args:
+            size (tuple): (width, height) of the surface the component is
+                drawn on
+            
+        Returns:
+            pygame.Surface: The face layer
+        """
+        face = self._face
+        if face is None or face.get_size() != size:
+            face = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                face = face.convert()
+            self.draw_face(face)
+            self._face = face
+        return face
+    
+    def invalidate_face(self):
+        """Render the face layer again on the next draw."""
+        self._face = None
+        self.mark_dirty()
+    
+    def mark_dirty(self):
+        """Note that the component has to be drawn again.
+        
+        Called for every sample applied; subclasses call it whenever they
+        change what draw() shows by other means (e.g. a key press).
+        """
+        self.version += 1
+    
+    def needs_redraw(self):
+        """Check whether the component changed since it was last drawn.
+        
+        Returns:
+            bool: True if draw() would show something new
+        """
+        return self.version != self.drawn_version
+    
+    def mark_drawn(self):
+        """Note that the current state is on screen."""
+        self.drawn_version = self.version
+    
+    def connect(self):
+        """Connect to the data source and start receiving data."""
+        if self.data_source and self.owns_data_source:
+            self.data_source.start()
+    
+    def disconnect(self):
+        """Disconnect from the data source."""
+        if self.data_source and self.owns_data_source:
+            self.data_source.stop()
+    
+    def set_latency_tracker(self, tracker):
+        """Keep the generation stamps of the samples the component applies.
+        
+        Args:
+            tracker (LatencyTracker): The tracker fed by the component's
+                data source, or None to stop
+        """
+        self.latency = tracker
+        self.latency_stamps = {}
+    
+    def take_latency_stamps(self):
+        """Take the stamps of the samples applied since the last call.
+        
+        Called by the render loop once the component was drawn.
+        
+        Returns:
+            dict: Signal id -> generation stamp
+        """
+        stamps = self.latency_stamps
+        self.latency_stamps = {}
+        return stamps
+    
+    def subscribe(self, signal, handler, restart=None):
+        """Receive a signal from the component's data source.
+        
+        Samples are posted to the mailbox on the receive thread; `handler`
+        runs on the render thread from update(), at most once per frame,
+        with the latest value. Samples of patched signals are not skipped:
+        the handler is called for each, in order, starting from the latest
+        sample for which `restart` is true (see Mailbox.append()).
+        
+        Args:
+            signal (Signal): The signal to receive
+            handler (callable): Function that takes the decoded value
+            restart (callable): For patched signals, takes a sample and
+                returns True if it is a snapshot
+        """
+        self.data_handlers[signal.id] = handler
+        if signal.patched:
+            self.patched_signals.add(signal.id)
+            append = self.mailbox.append
+            post = lambda key, value: append(key, value, restart=restart)
+        else:
+            post = self.mailbox.post
+        self.data_source.subscribe(
+            signal, lambda value, key=signal.id: post(key, value))
+    
+    def next_refresh_time(self):
+        """Get when the render loop should next call refresh().
+        
+        Components with animations extend this with the time of their next
+        animation frame.
+        
+        Returns:
+            float: time.monotonic() time, or None to sleep until new data
+            or input arrives
+        """
+        last = self.last_refresh
+        if last is None:
+            return 0.0
+        if self.mailbox.pending():
+            return last + 1 / self.max_refresh_rate if self.max_refresh_rate else last
+        if self.min_refresh_rate:
+            return last + 1 / self.min_refresh_rate
+        return None
+    
+    def refresh(self, now):
+        """Update the component when next_refresh_time() is due.
+        
+        Args:
+            now (float): time.monotonic() time of the frame
+        """
+        self.last_refresh = now
+        self.update()
+        if self.min_refresh_rate:
+            self.mark_dirty()
+    
     def update(self):
-        pass
+        """Update the component state (called when a refresh is due)."""
+        self.apply_pending_data()
+    
+    def apply_pending_data(self):
+        """Apply the latest sample of every signal received since last frame.
+        
+        Returns:
+            bool: True if any sample was applied
+        """
+        # Stamps are taken first: a sample posted in between is applied
+        # now but timed by the previous stamp, erring on the high side
+        stamps = self.latency.take(self.data_handlers) if self.latency else None
+        pending = self.mailbox.collect()
+        if stamps:
+            for signal_id in pending:
+                if signal_id in stamps:
+                    self.latency_stamps[signal_id] = stamps[signal_id]
+        for signal_id, value in pending.items():
+            handler = self.data_handlers[signal_id]
+            if signal_id in self.patched_signals:
+                for patch in value:
+                    handler(patch)
+            else:
+                handler(value)
+        if pending:
+            self.mark_dirty()
+        return bool(pending)
     
     def draw(self, surface):
         self.draw_component_background(surface)
@@ -51,9 +51,42 @@ regions = {
     "messages": (2*SCREEN_WIDTH//3, SCREEN_HEIGHT//2, SCREEN_WIDTH//3, SCREEN_HEIGHT//2)
 }
 
+# How emulator data reaches the cluster: "tcp" for the signal bus socket,
+# "shm" for the same-host shared memory signal board
+DATA_TRANSPORT = "tcp"
+SIGNAL_BOARD_NAME = "hmi_signal_board"
+
+# Emulation speed (emulated seconds per real second) and random seed; a
+# seed makes the emulated drive repeat exactly, None varies it every run
+SIMULATION_SPEED = 1.0
+SIMULATION_SEED = None
+
+# Binary trace file to record every received sample to (see
+# components/platform/trace.py); None disables recording
+TRACE_FILE = None
+
+# Trace file to play back instead of running the emulators; None runs them
+REPLAY_FILE = None
+
+# Longest acceptable time in seconds from sample generation to the frame
+# showing it; the latency report (L key) counts samples over budget
+LATENCY_BUDGET = 0.05
+
+# Most frames per second the render loop draws; it sleeps when nothing is due
+MAX_FRAME_RATE = 60
+
+# Seconds between input checks while the render loop sleeps
+INPUT_POLL_INTERVAL = 0.02
+
+# Shared signal bus carrying all signals (see components/platform/emul/signal_bus.py)
+BUS_PORT = 5000
+
+# Per-signal ports used by standalone emulators
 RPM_PORT = 5001
 SPEED_GAUGE_PORT = 5002
 FUEL_GAUGE_PORT = 5003
 CLOCK_PORT = 5004
 MEDIA_PORT = 5005
 MESSAGES_PORT = 5006
+FLEET_PORT = 5007
+VEHICLE_PORT = 5008
@@ -0,0 +1,101 @@
+import pygame
+
+DEFAULT_FAMILY = 'Arial'
+
+# (size, bold) of the fonts the cluster components use, loaded by warm_up()
+STANDARD_FONTS = (
+    (12, False),
+    (14, False),
+    (16, False),
+    (18, False),
+    (22, True),
+    (24, True),
+    (26, True),
+)
+
+# Rendered once with every warmed-up font so its glyphs are cached too
+WARM_UP_TEXT = ''.join(chr(code) for code in range(32, 127))
+
+
+class FontManager:
+    """Process-wide registry of loaded fonts.
+
+    pygame.font.SysFont() searches the system fonts for the family and
+    loads the font file on every call. The manager does that once per
+    (family, size, bold, italic) and hands out the same Font afterwards.
+    warm_up() loads the fonts the components use, and renders every
+    printable character with them, before the first frame so that no
+    frame pays for loading.
+
+    Fonts are only used from the render thread.
+    """
+    _default = None
+
+    @classmethod
+    def default(cls):
+        """Get the process-wide font manager.
+
+        Returns:
+            FontManager: The shared manager
+        """
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.fonts = {}  # (family, size, bold, italic) -> pygame.font.Font
+        self.stats = {"hits": 0, "loads": 0}
+
+    def get(self, size, bold=False, italic=False, family=DEFAULT_FAMILY):
+        """Get a font, loading it on first use.
+
+        Args:
+            size (int): Font size in points
+            bold (bool): Bold style
+            italic (bool): Italic style
+            family (str): Font family name
+
+        Returns:
+            pygame.font.Font: The loaded font
+        """
+        key = (family, size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.SysFont(family, size, bold=bold, italic=italic)
+            self.fonts[key] = font
+            self.stats["loads"] += 1
+        else:
+            self.stats["hits"] += 1
+        return font
+
+    def warm_up(self, fonts=STANDARD_FONTS, family=DEFAULT_FAMILY):
+        """Load fonts and cache their glyphs ahead of the first frame.
+
+        Args:
+            fonts (iterable): (size, bold) pairs to load
+            family (str): Font family name
+        """
+        for size, bold in fonts:
+            self.get(size, bold, family=family).render(WARM_UP_TEXT, True, (255, 255, 255))
+
+    def clear(self):
+        """Drop every loaded font (e.g. after pygame.font.quit())."""
+        self.fonts.clear()
+
+
+def get_font(size, bold=False, italic=False, family=DEFAULT_FAMILY):
+    """Get a font from the process-wide FontManager.
+
+    Args:
+        size (int): Font size in points
+        bold (bool): Bold style
+        italic (bool): Italic style
+        family (str): Font family name
+
+    Returns:
+        pygame.font.Font: The loaded font
+    """
+    return FontManager.default().get(size, bold, italic, family)
@@ -0,0 +1,95 @@
+import threading
+
+class Mailbox:
+    """Latest-value slots shared between a receive thread and the render loop.
+
+    The receive side posts every sample and simply overwrites the previous
+    value of the same key, so the render loop collects at most one value
+    per key per frame and never sees a value that is being modified.
+    Values that build on each other (patches) are appended to a per-key
+    list instead, and collected in order. Such a list is never shortened
+    by dropping single values: it restarts at a value that replaces
+    everything before it (a snapshot), and one that grows past its limit
+    is discarded as a whole and counted in `overflows`.
+    """
+    def __init__(self, lock=None, notify=None):
+        """Initialize the mailbox.
+
+        Args:
+            lock (threading.Lock): Lock guarding the slots; a new one is
+                created when omitted
+            notify (callable): Called without arguments, on the posting
+                thread, after every post (e.g. to wake the render loop)
+        """
+        self.lock = lock if lock is not None else threading.Lock()
+        self.notify = notify
+        self.slots = {}
+        self.posted = 0  # Samples posted, including overwritten ones
+        self.overflows = 0  # Appended lists discarded for growing past their limit
+        self.resyncing = set()  # Keys discarding values until one restarts them
+
+    def post(self, key, value):
+        """Store the latest value for a key, replacing any uncollected one.
+
+        Args:
+            key: Slot key (e.g. a signal id)
+            value: The value to store
+        """
+        with self.lock:
+            self.slots[key] = value
+            self.posted += 1
+        if self.notify is not None:
+            self.notify()
+
+    def append(self, key, value, limit=256, restart=None):
+        """Queue a value behind the uncollected values of a key.
+
+        Args:
+            key: Slot key (e.g. a signal id)
+            value: The value to queue
+            limit (int): Most values kept per key; beyond it all uncollected
+                values of the key are discarded
+            restart (callable): Takes a value and returns True if it
+                replaces every value before it (e.g. a snapshot); after an
+                overflow, values are discarded until such a one arrives
+        """
+        restarts = restart is not None and restart(value)
+        with self.lock:
+            if restarts:
+                self.resyncing.discard(key)
+                self.slots[key] = [value]
+            elif key in self.resyncing:
+                return
+            else:
+                values = self.slots.get(key)
+                if values is None:
+                    self.slots[key] = [value]
+                else:
+                    values.append(value)
+                    if len(values) > limit:
+                        del self.slots[key]
+                        self.overflows += 1
+                        if restart is not None:
+                            self.resyncing.add(key)
+            self.posted += 1
+        if self.notify is not None:
+            self.notify()
+
+    def pending(self):
+        """Check whether anything was posted since the last collect."""
+        with self.lock:
+            return bool(self.slots)
+
+    def collect(self):
+        """Take every value posted since the last collect.
+
+        Returns:
+            dict: key -> latest value (list of values for appended keys);
+            empty if nothing was posted
+        """
+        with self.lock:
+            if not self.slots:
+                return {}
+            slots = self.slots
+            self.slots = {}
+        return slots
@@ -0,0 +1,118 @@
+import threading
+import time
+import pygame
+from core.constants import MAX_FRAME_RATE, INPUT_POLL_INTERVAL
+
+
+class RenderScheduler:
+    """Decides when the render loop wakes up and which components it refreshes.
+
+    Instead of drawing a fixed number of frames per second, the loop
+    sleeps in wait() until input arrives, a component receives data (its
+    mailbox calls wake()), or the earliest next_refresh_time() of the
+    components comes up: a rate-limited component with data waiting, a
+    minimum refresh rate or an animation frame. Frames are never drawn
+    closer together than 1 / max_frame_rate, except in response to input.
+    With the car stopped and no data arriving nothing is drawn except
+    for the components' minimum refresh rates.
+
+    Input is polled every input_poll_interval while waiting rather than
+    waited for with pygame.event.wait(), which polls every millisecond on
+    video drivers that cannot be woken from another thread (e.g. kmsdrm).
+    """
+    def __init__(self, max_frame_rate=MAX_FRAME_RATE, input_poll_interval=INPUT_POLL_INTERVAL):
+        """Initialize the scheduler.
+
+        Args:
+            max_frame_rate (float): Most frames drawn per second
+            input_poll_interval (float): Seconds between input checks while
+                waiting
+        """
+        self.frame_interval = 1 / max_frame_rate
+        self.input_poll_interval = input_poll_interval
+        self.components = []
+        self.woken = threading.Event()
+        self.last_frame = None  # time.monotonic() time of the last frame drawn
+        self.stats = {"wakeups": 0, "frames": 0}
+
+    def add(self, component):
+        """Schedule a component and wake the loop when it receives data.
+
+        Args:
+            component (Component): The component
+        """
+        self.components.append(component)
+        component.mailbox.notify = self.wake
+
+    def wake(self):
+        """Wake the render loop from wait() (any thread)."""
+        self.woken.set()
+
+    def next_deadline(self):
+        """Get when the next frame is due.
+
+        Returns:
+            float: time.monotonic() time, or None if nothing is scheduled
+        """
+        deadlines = [deadline for deadline in
+                     (component.next_refresh_time() for component in self.components)
+                     if deadline is not None]
+        if any(component.needs_redraw() for component in self.components):
+            deadlines.append(0.0)
+        if not deadlines:
+            return None
+        deadline = min(deadlines)
+        if self.last_frame is not None:
+            deadline = max(deadline, self.last_frame + self.frame_interval)
+        return deadline
+
+    def wait(self):
+        """Sleep until input, new data or the next deadline.
+
+        Returns:
+            list: The pygame events received
+        """
+        # Cleared before the mailboxes are looked at, so data posted from
+        # here on wakes the loop again
+        self.woken.clear()
+        deadline = self.next_deadline()
+        self.stats["wakeups"] += 1
+        while True:
+            events = pygame.event.get()
+            if events:
+                return events
+            timeout = self.input_poll_interval
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    return events
+            if self.woken.wait(timeout):
+                # New data: keep sleeping until it is due, which is never
+                # sooner than the frame rate limit allows
+                self.woken.clear()
+                deadline = self.next_deadline()
+
+    def due_components(self, now):
+        """Get the components whose refresh is due.
+
+        Args:
+            now (float): time.monotonic() time of the frame
+
+        Returns:
+            list: Components to refresh() in this frame
+        """
+        due = []
+        for component in self.components:
+            deadline = component.next_refresh_time()
+            if deadline is not None and deadline <= now:
+                due.append(component)
+        return due
+
+    def frame_drawn(self, now):
+        """Note that a frame was drawn, for the frame rate limit.
+
+        Args:
+            now (float): time.monotonic() time of the frame
+        """
+        self.last_frame = now
+        self.stats["frames"] += 1
@@ -0,0 +1,91 @@
+import collections
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces.
+
+    Most text on the cluster is the same from one frame to the next
+    (captions, units, a reading that holds), so components render text
+    through the cache and only strings not seen recently are rendered.
+    The least recently used surfaces are evicted once `capacity` is
+    reached. Returned surfaces are shared and must not be drawn on.
+
+    Text is only rendered from the render thread.
+    """
+    _default = None
+
+    @classmethod
+    def default(cls):
+        """Get the process-wide text cache.
+
+        Returns:
+            TextCache: The shared cache
+        """
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def __init__(self, capacity=512):
+        """Initialize an empty cache.
+
+        Args:
+            capacity (int): Most surfaces kept
+        """
+        self.capacity = capacity
+        self.surfaces = collections.OrderedDict()  # key -> surface, oldest first
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def render(self, font, text, color, antialias=True):
+        """Get a rendered text surface, rendering it on a miss.
+
+        Args:
+            font (pygame.font.Font): The font to render with (see
+                core/fonts.py; fonts must outlive their cache entries)
+            text (str): The text to render
+            color (tuple): RGB text color
+            antialias (bool): Smooth the glyph edges
+
+        Returns:
+            pygame.Surface: The rendered text
+        """
+        if not isinstance(color, tuple):
+            color = tuple(color)  # pygame.Color is not hashable
+        key = (font, text, color, antialias)
+        surfaces = self.surfaces
+        surface = surfaces.get(key)
+        if surface is not None:
+            surfaces.move_to_end(key)
+            self.stats["hits"] += 1
+            return surface
+
+        self.stats["misses"] += 1
+        surface = font.render(text, antialias, color)
+        surfaces[key] = surface
+        if len(surfaces) > self.capacity:
+            surfaces.popitem(last=False)
+            self.stats["evictions"] += 1
+        return surface
+
+    def hit_rate(self):
+        """Get the share of renders served from the cache (0 to 1)."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def clear(self):
+        """Drop every cached surface."""
+        self.surfaces.clear()
+
+
+def render_text(font, text, color, antialias=True):
+    """Render text through the process-wide TextCache.
+
+    Args:
+        font (pygame.font.Font): The font to render with
+        text (str): The text to render
+        color (tuple): RGB text color
+        antialias (bool): Smooth the glyph edges
+
+    Returns:
+        pygame.Surface: The rendered text; do not draw on it
+    """
+    return TextCache.default().render(font, text, color, antialias)
@@ -2,20 +2,28 @@ import pygame
 import sys
 import time
 from core.constants import *
+from core.fonts import FontManager
+from core.render_scheduler import RenderScheduler
+from core.text_cache import TextCache
 from components.gauges.rpm_gauge import RPMGauge
 from components.gauges.speed_gauge import SpeedGauge
 from components.gauges.fuel_gauge import FuelGauge
 from components.info.clock_widget import ClockWidget
 from components.info.media_widget import MediaInfoWidget
 from components.info.messages_widget import MessagesWidget
+from components.platform.data_source import DataSource, BoardDataSource, ReplayDataSource
+from components.platform.latency import LatencyTracker
+from components.platform.signal_board import SignalBoard
+from components.platform.trace import TraceRecorder
 
 # Import emulators
-from components.platform.emul.rpm_emulator import RPMEmulator
-from components.platform.emul.speed_emulator import SpeedEmulator
-from components.platform.emul.fuel_emulator import FuelEmulator
+from components.platform.emul.vehicle_dynamics_emulator import VehicleDynamicsEmulator
 from components.platform.emul.clock_emulator import ClockEmulator
 from components.platform.emul.media_emulator import MediaEmulator
 from components.platform.emul.messages_emulator import MessagesEmulator
+from components.platform.emul.signal_bus import SignalBus
+from components.platform.emul.emulator_host import EmulatorHost
+from components.platform.emul.emulator_clock import ScaledClock
 
 # Initialize pygame
 pygame.init()
@@ -23,44 +31,109 @@ pygame.init()
 # Screen setup
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Car Digital Cluster Simulator")
-clock = pygame.time.Clock()
+
+# Load every font the components use before the first frame
+FontManager.default().warm_up()
+
+SCROLL_KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_PAGEUP, pygame.K_PAGEDOWN,
+               pygame.K_HOME, pygame.K_END)
+REPLAY_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_LEFTBRACKET, pygame.K_RIGHTBRACKET)
+
+def draw_background(surface):
+    """Clear the screen and draw the grid lines between components.
+    
+    Args:
+        surface (pygame.Surface): The display surface
+    """
+    surface.fill(BG_COLOR)
+    for x in range(0, SCREEN_WIDTH, SCREEN_WIDTH // 3):
+        pygame.draw.line(surface, CHARCOAL_2, (x, 0), (x, SCREEN_HEIGHT), 2)
+    for y in range(0, SCREEN_HEIGHT, SCREEN_HEIGHT // 2):
+        pygame.draw.line(surface, CHARCOAL_2, (0, y), (SCREEN_WIDTH, y), 2)
 
 def main():
-    # Start data emulators (each on a different port)
-    emulators = {
-        "rpm": RPMEmulator(port=RPM_PORT),
-        "speed": SpeedEmulator(port=SPEED_GAUGE_PORT),
-        "fuel": FuelEmulator(port=FUEL_GAUGE_PORT),
-        "time": ClockEmulator(port=CLOCK_PORT),
-        "media": MediaEmulator(port=MEDIA_PORT),
-        "messages": MessagesEmulator(port=MESSAGES_PORT)
+    # Start data emulators, all running on one emulator host thread and
+    # publishing on one shared signal bus or the shared memory signal board.
+    # A replayed trace needs no emulators.
+    host = EmulatorHost(clock=ScaledClock(SIMULATION_SPEED) if SIMULATION_SPEED != 1.0 else None)
+    bus = None
+    board = None
+    if REPLAY_FILE:
+        pass
+    elif DATA_TRANSPORT == "shm":
+        board = SignalBoard(create=True)
+    else:
+        bus = SignalBus(port=BUS_PORT)
+    emulator_classes = {
+        "vehicle": VehicleDynamicsEmulator,  # Speed, RPM and fuel
+        "time": ClockEmulator,
+        "media": MediaEmulator,
+        "messages": MessagesEmulator
     }
+    emulators = {}
+    if not REPLAY_FILE:
+        for name, emulator_class in emulator_classes.items():
+            # Each emulator gets its own stream derived from the run's seed
+            seed = None if SIMULATION_SEED is None else f"{SIMULATION_SEED}:{name}"
+            emulators[name] = emulator_class(bus=bus, host=host, board=board, seed=seed)
     
-    # Start all emulators
+    # Start the bus, the host and all emulators
+    if bus:
+        bus.start()
+    host.start()
     for emulator in emulators.values():
         emulator.start()
     
-    # Create components
+    # Create components, all subscribed to one shared data source
+    if REPLAY_FILE:
+        data_source = ReplayDataSource(REPLAY_FILE)
+    elif DATA_TRANSPORT == "shm":
+        data_source = BoardDataSource()
+    else:
+        data_source = DataSource(port=BUS_PORT)
     components = {
-        "rpm": RPMGauge(regions["rpm"], port=RPM_PORT),
-        "speed": SpeedGauge(regions["speed"], port=SPEED_GAUGE_PORT),
-        "fuel": FuelGauge(regions["fuel"], port=FUEL_GAUGE_PORT),
-        "time": ClockWidget(regions["time"], port=CLOCK_PORT),
-        "media": MediaInfoWidget(regions["media"], port=MEDIA_PORT),
-        "messages": MessagesWidget(regions["messages"], port=MESSAGES_PORT)
+        "rpm": RPMGauge(regions["rpm"], data_source=data_source),
+        "speed": SpeedGauge(regions["speed"], data_source=data_source),
+        "fuel": FuelGauge(regions["fuel"], data_source=data_source),
+        "time": ClockWidget(regions["time"], data_source=data_source),
+        "media": MediaInfoWidget(regions["media"], data_source=data_source),
+        "messages": MessagesWidget(regions["messages"], data_source=data_source)
     }
 
+    # Optionally record everything the cluster receives
+    recorder = None
+    if TRACE_FILE:
+        recorder = TraceRecorder(TRACE_FILE)
+        recorder.start()
+        data_source.set_recorder(recorder)
+    
+    # Measure how old samples are when they reach the screen
+    latency = LatencyTracker(budget=LATENCY_BUDGET)
+    data_source.set_latency_tracker(latency)
+    for component in components.values():
+        component.set_latency_tracker(latency)
+
+    # Draw frames only when input, data or a component's refresh rate calls
+    # for one
+    scheduler = RenderScheduler()
+    for component in components.values():
+        scheduler.add(component)
+    
     # Connect components to data sources
+    data_source.start()
     for component in components.values():
         component.connect()
 
     # Main loop
     running = True
+    full_redraw = True
     while running:
-        # Handle events
-        for event in pygame.event.get():
+        # Sleep until something is due, then handle events
+        for event in scheduler.wait():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                full_redraw = True
             elif event.type == pygame.KEYDOWN:
                 print(f"Received event:{event}, type:{event.type}, key:{event.key}")
                 if event.key == pygame.K_ESCAPE:
@@ -68,38 +141,75 @@ def main():
                 elif event.key == pygame.K_w:
                     for component in components.values():
                         component.send_key(pygame.K_w)
+                elif event.key in SCROLL_KEYS:
+                    components["messages"].send_key(event.key)
+                elif event.key == pygame.K_l:
+                    print(latency.format_report())
+                    text_cache = TextCache.default()
+                    print(f"Text cache: {text_cache.stats} "
+                          f"({text_cache.hit_rate():.1%} hits)")
+                    overflows = {name: component.mailbox.overflows
+                                 for name, component in components.items()
+                                 if component.mailbox.overflows}
+                    if overflows:
+                        print(f"Mailbox overflows: {overflows}")
                 elif event.key == pygame.K_q:
                     running = False
+                elif REPLAY_FILE and event.key in REPLAY_KEYS:
+                    # Replay transport: seek 10 s back/forward, halve/double speed
+                    if event.key == pygame.K_LEFT:
+                        data_source.seek(data_source.position() - 10)
+                    elif event.key == pygame.K_RIGHT:
+                        data_source.seek(data_source.position() + 10)
+                    elif event.key == pygame.K_LEFTBRACKET:
+                        data_source.set_speed(data_source.speed / 2)
+                    else:
+                        data_source.set_speed(data_source.speed * 2)
         
-        # Update components (now only handles UI updates, data comes from emulators)
-        for component in components.values():
-            component.update()
-        
-        # Clear screen
-        screen.fill(BG_COLOR)
-        
-        # Draw grid lines
-        for x in range(0, SCREEN_WIDTH, SCREEN_WIDTH // 3):
-            pygame.draw.line(screen, CHARCOAL_2, (x, 0), (x, SCREEN_HEIGHT), 2)
-        for y in range(0, SCREEN_HEIGHT, SCREEN_HEIGHT // 2):
-            pygame.draw.line(screen, CHARCOAL_2, (0, y), (SCREEN_WIDTH, y), 2)
+        # Update the components whose refresh is due (data comes from emulators)
+        now = time.monotonic()
+        for component in scheduler.due_components(now):
+            component.refresh(now)
         
-        # Draw components using subsurfaces
+        # Redraw only the components that changed and push only their
+        # regions to the display; everything is redrawn on the first frame
+        # and when the window contents were lost
+        if full_redraw:
+            draw_background(screen)
+        dirty_rects = []
+        stamps = {}
         for name, component in components.items():
-            region = regions[name]
-            subsurface = screen.subsurface(pygame.Rect(region))
-            component.draw(subsurface)
+            if full_redraw or component.needs_redraw():
+                rect = pygame.Rect(regions[name])
+                component.draw(screen.subsurface(rect))
+                component.mark_drawn()
+                dirty_rects.append(rect)
+                stamps.update(component.take_latency_stamps())
         
         # Update display
-        pygame.display.flip()
-        clock.tick(60)
+        if full_redraw:
+            pygame.display.flip()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+        if dirty_rects:
+            scheduler.frame_drawn(now)
+        full_redraw = False
+        latency.frame_presented(stamps)
 
     # Clean up: disconnect components and stop emulators
     for component in components.values():
         component.disconnect()
+    data_source.stop()
+    if recorder:
+        recorder.stop()
     
     for emulator in emulators.values():
         emulator.stop()
+    host.stop()
+    if bus:
+        bus.stop()
+    if board:
+        board.close()
     
     # Wait for threads to clean up
     time.sleep(0.5)